@@ -3,35 +3,80 @@ from __future__ import annotations
 
 import logging
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import aiohttp_client
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 
 from .api import RomandeEnergieApiClient
-from .const import DOMAIN
+from .backfill import async_backfill
+from .const import (
+    BACKFILL_CONCURRENCY,
+    BACKFILL_MAX_CONCURRENCY,
+    CONF_GRANULARITY,
+    DOMAIN,
+    GRANULARITY_DAILY,
+    STORAGE_VERSION,
+)
 from .coordinator import RomandeEnergieCoordinator
+from .scheduler import DATA_SCHEDULER, get_scheduler
+from .tracing import request_trace_config
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 SERVICE_UPDATE_NOW = "update_now"
+SERVICE_BACKFILL = "backfill"
+ATTR_START_DATE = "start_date"
+ATTR_CONCURRENCY = "concurrency"
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_CONCURRENCY, default=BACKFILL_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BACKFILL_MAX_CONCURRENCY)
+        ),
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Create coordinator, do first refresh, forward platforms, register service."""
-    session = aiohttp_client.async_get_clientsession(hass)
-    coordinator = RomandeEnergieCoordinator(hass, entry, RomandeEnergieApiClient(session))
+    """Create coordinator, do first refresh, start the keepalive, forward platforms."""
+    # A session of the entry's own (closed when it unloads), so its requests
+    # can be traced phase by phase.
+    session = aiohttp_client.async_create_clientsession(
+        hass, trace_configs=[request_trace_config()]
+    )
+    # Every entry's client paces its requests on the one shared scheduler.
+    client = RomandeEnergieApiClient(session, get_scheduler(hass))
+    coordinator = RomandeEnergieCoordinator(hass, entry, client)
     await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_start_keepalive())
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
     return True
 
 
+async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload when the granularity option changes.
+
+    Every token rotation updates the entry too, and those must not reload it,
+    so compare against what the running coordinator was built with.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    granularity = entry.options.get(CONF_GRANULARITY, GRANULARITY_DAILY)
+    if coordinator is not None and coordinator.granularity != granularity:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 def _register_services(hass: HomeAssistant) -> None:
-    """Register the update_now service once (coordinator polling handles the rest)."""
+    """Register the services once (coordinator polling handles the rest)."""
     if hass.services.has_service(DOMAIN, SERVICE_UPDATE_NOW):
         return
 
@@ -40,7 +85,25 @@ def _register_services(hass: HomeAssistant) -> None:
         for coord in hass.data.get(DOMAIN, {}).values():
             await coord.async_request_refresh()
 
+    async def _backfill(call: ServiceCall) -> None:
+        """Start a history backfill on every loaded coordinator.
+
+        A backfill of several years takes a while, so it runs in the background
+        (cancelled if its entry unloads) instead of holding the service call.
+        """
+        start = call.data[ATTR_START_DATE]
+        concurrency = call.data[ATTR_CONCURRENCY]
+        for coord in hass.data.get(DOMAIN, {}).values():
+            coord.config_entry.async_create_background_task(
+                hass,
+                async_backfill(coord, start, concurrency),
+                f"{DOMAIN} backfill {coord.contract_id}",
+            )
+
     hass.services.async_register(DOMAIN, SERVICE_UPDATE_NOW, _update_now)
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _backfill, schema=BACKFILL_SCHEMA
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -66,5 +129,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinators.pop(entry.entry_id, None)
     if not coordinators:
         hass.data.pop(DOMAIN, None)
-        hass.services.async_remove(DOMAIN, SERVICE_UPDATE_NOW)
+        hass.data.pop(DATA_SCHEDULER, None)
+        for service in (SERVICE_UPDATE_NOW, SERVICE_BACKFILL):
+            if hass.services.has_service(DOMAIN, service):
+                hass.services.async_remove(DOMAIN, service)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the statistics bookkeeping kept on disk for a removed entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{entry.entry_id}").async_remove()
@@ -15,25 +15,54 @@ window to stay logged in without a new OTP.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import binascii
+import hashlib
 import json
 import logging
-from datetime import date, datetime
-from typing import Any, NamedTuple
+import math
+import random
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
 
 import aiohttp
 
 from .const import (
-    CONTRACTS_ENDPOINT,
-    CURVE_ENDPOINT,
+    BASE_URL,
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_THRESHOLD,
+    CONDITIONAL_CACHE_SIZE,
+    CONTRACTS_RETRY_ATTEMPTS,
+    CONTRACTS_PATH,
+    CURVE_PATH,
     CURVE_TYPE_CONSUMPTION,
+    CURVES_RETRY_ATTEMPTS,
+    GRANULARITY_DAILY,
     HTTP_TIMEOUT,
-    LOGIN_ENDPOINT,
-    REFRESH_ENDPOINT,
-    SEND_OTP_ENDPOINT,
-    VALIDATE_OTP_ENDPOINT,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_SAMPLES,
+    LATENCY_TIMEOUT_FACTOR,
+    LOGIN_PATH,
+    MIN_HTTP_TIMEOUT,
+    REFRESH_PATH,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    SEND_OTP_PATH,
+    TZ,
+    VALIDATE_OTP_PATH,
 )
+from .tracing import EndpointTrace, nearest_rank
+
+if TYPE_CHECKING:
+    from .scheduler import RequestScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +96,21 @@ class ApiError(RomandeEnergieError):
     """Unexpected non-200 answer from a data endpoint."""
 
 
+class CircuitOpen(CannotConnect):
+    """A data endpoint kept failing and is not being asked for a while.
+
+    ``retry_in`` is the number of seconds until it is tried again.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"{endpoint} circuit open; retrying in {retry_in:.0f} s")
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(CannotConnect):
+    """The time budget ran out before the request could be made."""
+
+
 # ---------------------------------------------------------------------------
 # JWT helpers (payload only, signature never verified — we only read claims)
 # ---------------------------------------------------------------------------
@@ -94,14 +138,243 @@ def token_expiry(access_token: str) -> int:
     return int(_decode_jwt_payload(access_token).get("exp", 0))
 
 
+# ---------------------------------------------------------------------------
+# Time budgets and adaptive timeouts
+# ---------------------------------------------------------------------------
+class Deadline:
+    """The moment a run of requests must be done by, on the monotonic clock."""
+
+    def __init__(self, seconds: float) -> None:
+        self.at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left; 0.0 once it has passed."""
+        return max(0.0, self.at - time.monotonic())
+
+
+class LatencyTracker:
+    """The recent answer times of one endpoint, to size its timeout."""
+
+    def __init__(self) -> None:
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """The ``fraction`` quantile of the samples (nearest rank), if any."""
+        if not self._samples:
+            return None
+        return nearest_rank(sorted(self._samples), fraction)
+
+    def timeout(self) -> float:
+        """A timeout a healthy answer clears with room to spare.
+
+        A few times the 95th percentile: a portal answering in 2 s is given up
+        on after 10 s (the floor) rather than 30 s, while one that has grown
+        slow gets up to HTTP_TIMEOUT.
+        """
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return float(HTTP_TIMEOUT)
+        p95 = self.percentile(0.95) or 0.0
+        return min(float(HTTP_TIMEOUT), max(MIN_HTTP_TIMEOUT, p95 * LATENCY_TIMEOUT_FACTOR))
+
+
+# ---------------------------------------------------------------------------
+# Retries and circuit breaking for the data endpoints
+# ---------------------------------------------------------------------------
+# Answers that say "not now" rather than "no": worth another attempt.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How one data endpoint retries an answer that may be transient."""
+
+    attempts: int
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def backoff(self, attempt: int) -> float:
+        """The wait after failed attempt ``attempt`` (0-based): full jitter.
+
+        Random rather than fixed, so the clients that failed together do not
+        all come back in the same second.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+ENDPOINT_CURVES = "curves"
+ENDPOINT_CONTRACTS = "contracts"
+ENDPOINT_REFRESH = "refresh"
+RETRY_POLICIES: dict[str, RetryPolicy] = {
+    ENDPOINT_CURVES: RetryPolicy(CURVES_RETRY_ATTEMPTS),
+    ENDPOINT_CONTRACTS: RetryPolicy(CONTRACTS_RETRY_ATTEMPTS),
+}
+
+
+def _retry_after(headers: Any) -> float | None:
+    """Seconds a ``Retry-After`` header asks for (delta or HTTP date), if any.
+
+    Capped at BREAKER_MAX_COOLDOWN, the longest the breaker ever stays open:
+    a portal asking for more (or for ``inf``) does not get to stop the polls
+    for good.
+    """
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        seconds = (when - datetime.now(tz=UTC)).total_seconds()
+    if not math.isfinite(seconds):
+        return None
+    return min(max(0.0, seconds), BREAKER_MAX_COOLDOWN.total_seconds())
+
+
+class CircuitBreaker:
+    """Fails one endpoint's calls fast while the portal keeps failing them.
+
+    Closed until BREAKER_THRESHOLD calls in a row have failed even after their
+    retries; then open for a cooldown, during which calls raise ``CircuitOpen``
+    without a request. The first call after the cooldown goes through as a
+    trial: an answer closes the breaker, another failure opens it again for
+    twice as long, up to BREAKER_MAX_COOLDOWN. A failure the portal sent a
+    Retry-After with opens it at once, for at least that long.
+    """
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.failures = 0
+        self._open_until = 0.0  # time.monotonic()
+        self._cooldown = BREAKER_COOLDOWN.total_seconds()
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until calls go through again; 0.0 when they do now."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def check(self) -> None:
+        """Raise ``CircuitOpen`` while the cooldown runs."""
+        retry_in = self.retry_in
+        if retry_in:
+            raise CircuitOpen(self.endpoint, retry_in)
+
+    def success(self) -> None:
+        self.failures = 0
+        self._open_until = 0.0
+        self._cooldown = BREAKER_COOLDOWN.total_seconds()
+
+    def failure(self, retry_after: float | None = None) -> None:
+        self.failures += 1
+        if self.failures >= BREAKER_THRESHOLD:
+            cooldown = max(self._cooldown, retry_after or 0.0)
+            self._cooldown = min(
+                self._cooldown * 2, BREAKER_MAX_COOLDOWN.total_seconds()
+            )
+        elif retry_after:  # the portal said when to come back
+            cooldown = retry_after
+        else:
+            return
+        self._open_until = time.monotonic() + cooldown
+        _LOGGER.debug(
+            "%s failed %s times in a row; pausing it for %.0f s",
+            self.endpoint,
+            self.failures,
+            cooldown,
+        )
+
+
 # ---------------------------------------------------------------------------
 # Client
 # ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _CachedCurves:
+    """A decoded curves answer plus what it takes to revalidate it."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: str
+    data: list[dict[str, Any]]
+
+    def request_headers(self) -> dict[str, str]:
+        """Conditional-request headers for the validators the server sent."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
 class RomandeEnergieApiClient:
-    """Stateless async wrapper around the portal endpoints."""
+    """Async wrapper around the portal endpoints.
+
+    Holds no session state (tokens belong to the caller); the only thing it
+    remembers is the last answer per curves request, to revalidate it, and
+    how the data endpoints have been answering, to back off (``_get_data``).
+    Given a ``scheduler``, every request waits for one of its slots first.
+    On a session built with ``tracing.request_trace_config()``, the phases
+    of every refresh and data request are filed under ``traces``.
+    ``base_url`` replaces the portal's, to run against a stand-in for it.
+    """
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        scheduler: RequestScheduler | None = None,
+        *,
+        base_url: str = BASE_URL,
+    ) -> None:
         self._session = session
+        self._scheduler = scheduler
+        self._base_url = base_url.rstrip("/")
+        self._breakers = {endpoint: CircuitBreaker(endpoint) for endpoint in RETRY_POLICIES}
+        self.latency = {
+            endpoint: LatencyTracker()
+            for endpoint in (ENDPOINT_REFRESH, ENDPOINT_CURVES, ENDPOINT_CONTRACTS)
+        }
+        self.traces = {endpoint: EndpointTrace() for endpoint in self.latency}
+        # Bytes of answer body each data endpoint has sent so far, and its
+        # answers by "<endpoint> <status>".
+        self._received = dict.fromkeys(RETRY_POLICIES, 0)
+        self._statuses: Counter[str] = Counter()
+        # (contract_id, start_date, end_date, granularity) -> last answer, least
+        # recent first.
+        self._curves_cache: OrderedDict[tuple[str, str, str, str], _CachedCurves] = (
+            OrderedDict()
+        )
+
+    def _slot(self) -> AbstractAsyncContextManager[Any]:
+        """A request slot from the shared scheduler, if there is one."""
+        return self._scheduler.slot() if self._scheduler else nullcontext()
+
+    def _timeout(self, endpoint: str | None, deadline: Deadline | None) -> float:
+        """The timeout of a request about to go out, within budget.
+
+        Data requests are latency-sized: they can be sent again. A refresh is
+        not: the portal rotates, and burns, the token whether or not we are
+        still waiting for the answer, so giving up early on a slow portal costs
+        the session. It keeps HTTP_TIMEOUT.
+
+        Raises ``DeadlineExceeded`` when the budget is already spent.
+        """
+        if endpoint in RETRY_POLICIES:
+            timeout = self.latency[endpoint].timeout()
+        else:
+            timeout = float(HTTP_TIMEOUT)
+        if deadline is None:
+            return timeout
+        remaining = deadline.remaining()
+        if not remaining:
+            raise DeadlineExceeded(f"No time left for the {endpoint} request")
+        return min(timeout, remaining)
 
     async def _post(
         self,
@@ -109,37 +382,163 @@ class RomandeEnergieApiClient:
         *,
         json_body: dict[str, Any] | None = None,
         token: str | None = None,
+        endpoint: str | None = None,
+        deadline: Deadline | None = None,
     ) -> Any:
         headers = {"Accept": "application/json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
-        timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
         try:
-            async with self._session.post(
-                url, json=json_body, headers=headers, timeout=timeout
-            ) as resp:
-                body = await resp.text()
+            async with self._slot():
+                # Timed from the slot on: the wait for it is not the portal's.
+                timeout = aiohttp.ClientTimeout(total=self._timeout(endpoint, deadline))
+                started = time.monotonic()
+                async with self._session.post(
+                    url,
+                    json=json_body,
+                    headers=headers,
+                    timeout=timeout,
+                    trace_request_ctx=self.traces.get(endpoint),
+                ) as resp:
+                    body = await resp.text()
+                if endpoint:
+                    self.latency[endpoint].record(time.monotonic() - started)
                 return resp.status, body
         except (aiohttp.ClientError, TimeoutError) as err:
             raise CannotConnect(f"POST {url} failed: {err}") from err
 
-    async def _get(self, url: str, *, token: str, params: dict[str, Any] | None = None) -> Any:
+    async def _get(
+        self,
+        url: str,
+        *,
+        token: str,
+        params: dict[str, Any] | None = None,
+        extra_headers: dict[str, str] | None = None,
+        endpoint: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> Any:
         headers = {"Accept": "application/json", "Authorization": f"Bearer {token}"}
-        timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        if extra_headers:
+            headers.update(extra_headers)
         try:
-            async with self._session.get(
-                url, params=params, headers=headers, timeout=timeout
-            ) as resp:
-                body = await resp.text()
-                return resp.status, body
+            async with self._slot():
+                timeout = aiohttp.ClientTimeout(total=self._timeout(endpoint, deadline))
+                started = time.monotonic()
+                async with self._session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                    trace_request_ctx=self.traces.get(endpoint),
+                ) as resp:
+                    payload = await resp.read()
+                if endpoint:
+                    self.latency[endpoint].record(time.monotonic() - started)
+                    if endpoint in self._received:
+                        self._received[endpoint] += len(payload)
+                        self._statuses[f"{endpoint} {resp.status}"] += 1
+                return resp.status, payload, resp.headers
         except (aiohttp.ClientError, TimeoutError) as err:
             raise CannotConnect(f"GET {url} failed: {err}") from err
 
+    async def _get_data(
+        self,
+        endpoint: str,
+        url: str,
+        *,
+        token: str,
+        params: dict[str, Any] | None = None,
+        extra_headers: dict[str, str] | None = None,
+        deadline: Deadline | None = None,
+    ) -> Any:
+        """``_get`` for a data endpoint, under its retry policy and breaker.
+
+        A transport failure, 429 or 5xx is retried after a jittered backoff, or
+        after the Retry-After the portal sent when that is longer. A wait over
+        the policy's ``max_delay`` is not sat out: the call gives up at once
+        and the breaker carries the wait instead, from the first such answer.
+        Nor is one that would not leave time before ``deadline`` for another
+        attempt. Any other answer — 401s included — shows the portal is up
+        and is returned as it is. When the attempts run out the last failure
+        is raised (transport) or returned (status) as it would have been
+        without retries.
+        """
+        policy = RETRY_POLICIES[endpoint]
+        breaker = self._breakers[endpoint]
+        breaker.check()
+        for attempt in range(policy.attempts):
+            retry_after: float | None = None
+            try:
+                answer = await self._get(
+                    url,
+                    token=token,
+                    params=params,
+                    extra_headers=extra_headers,
+                    endpoint=endpoint,
+                    deadline=deadline,
+                )
+            except DeadlineExceeded:
+                raise  # says nothing about the portal's health
+            except CannotConnect as err:
+                failure: CannotConnect | None = err
+            else:
+                if answer[0] not in _RETRY_STATUSES:
+                    breaker.success()
+                    return answer
+                failure = None
+                retry_after = _retry_after(answer[2])
+            delay = max(policy.backoff(attempt), retry_after or 0.0)
+            if (
+                attempt == policy.attempts - 1
+                or delay > policy.max_delay
+                or (deadline is not None and delay >= deadline.remaining())
+            ):
+                break
+            _LOGGER.debug(
+                "%s request failed (%s); retrying in %.1f s",
+                endpoint,
+                failure or f"HTTP {answer[0]}",
+                delay,
+            )
+            await asyncio.sleep(delay)
+        breaker.failure(retry_after)
+        if failure is not None:
+            raise failure
+        return answer
+
+    def retry_in(self) -> float:
+        """Seconds until every data endpoint takes requests again (0.0: now)."""
+        return max(breaker.retry_in for breaker in self._breakers.values())
+
+    def received_bytes(self) -> int:
+        """Bytes of answer body the data endpoints have sent so far, all told."""
+        return sum(self._received.values())
+
+    def statuses(self) -> Counter[str]:
+        """The data endpoints' answers so far, by ``"<endpoint> <status>"``."""
+        return self._statuses.copy()
+
+    def breakers(self) -> dict[str, dict[str, Any]]:
+        """Each data endpoint's circuit breaker: failures in a row, time to reopen."""
+        return {
+            endpoint: {
+                "failures": breaker.failures,
+                "retry_in": round(breaker.retry_in, 1),
+            }
+            for endpoint, breaker in self._breakers.items()
+        }
+
+    def request_timings(self) -> dict[str, dict[str, Any]]:
+        """Each endpoint's traced request phases and connection reuse."""
+        return {endpoint: trace.summary() for endpoint, trace in self.traces.items()}
+
     @staticmethod
-    def _json(body: str) -> Any:
+    def _json(body: str | bytes) -> Any:
         try:
             return json.loads(body)
-        except json.JSONDecodeError as err:
+        except ValueError as err:  # not JSON, or bytes that are not even UTF-8
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", "replace")
             raise ApiError(f"Non-JSON response: {body[:200]}") from err
 
     @staticmethod
@@ -153,7 +552,8 @@ class RomandeEnergieApiClient:
     async def login(self, username: str, password: str) -> dict[str, Any]:
         """Step 1: exchange credentials for an otp_pending token."""
         status, body = await self._post(
-            LOGIN_ENDPOINT, json_body={"username": username, "password": password}
+            self._base_url + LOGIN_PATH,
+            json_body={"username": username, "password": password},
         )
         if status in (400, 401, 403):
             raise AuthError("Invalid credentials")
@@ -163,7 +563,9 @@ class RomandeEnergieApiClient:
 
     async def send_otp(self, otp_pending_token: str) -> dict[str, Any]:
         """Step 2: trigger the SMS OTP."""
-        status, body = await self._post(SEND_OTP_ENDPOINT, token=otp_pending_token)
+        status, body = await self._post(
+            self._base_url + SEND_OTP_PATH, token=otp_pending_token
+        )
         if status in (401, 403):
             raise AuthError("otp_pending token rejected by send-otp")
         if status != 200:
@@ -175,7 +577,7 @@ class RomandeEnergieApiClient:
     ) -> dict[str, Any]:
         """Step 3: validate the SMS code -> full_access + refresh tokens."""
         status, body = await self._post(
-            VALIDATE_OTP_ENDPOINT,
+            self._base_url + VALIDATE_OTP_PATH,
             token=otp_pending_token,
             json_body={"otp_id": otp_id, "otp_code": otp_code},
         )
@@ -187,10 +589,15 @@ class RomandeEnergieApiClient:
             self._json(body), "access_token", "refresh_token", ctx="validate-otp"
         )
 
-    async def refresh(self, refresh_token: str) -> dict[str, Any]:
+    async def refresh(
+        self, refresh_token: str, *, deadline: Deadline | None = None
+    ) -> dict[str, Any]:
         """Rotate the session with the refresh token (no OTP)."""
         status, body = await self._post(
-            REFRESH_ENDPOINT, json_body={"refresh": refresh_token}
+            self._base_url + REFRESH_PATH,
+            json_body={"refresh": refresh_token},
+            endpoint=ENDPOINT_REFRESH,
+            deadline=deadline,
         )
         if status in (400, 401, 403):
             raise RefreshError("Refresh token expired/invalid")
@@ -201,9 +608,13 @@ class RomandeEnergieApiClient:
         )
 
     # ---- Data -------------------------------------------------------------
-    async def get_contracts(self, access_token: str, account_id: str) -> list[dict[str, Any]]:
-        url = CONTRACTS_ENDPOINT.format(account_id=account_id)
-        status, body = await self._get(url, token=access_token)
+    async def get_contracts(
+        self, access_token: str, account_id: str, *, deadline: Deadline | None = None
+    ) -> list[dict[str, Any]]:
+        url = self._base_url + CONTRACTS_PATH.format(account_id=account_id)
+        status, body, _headers = await self._get_data(
+            ENDPOINT_CONTRACTS, url, token=access_token, deadline=deadline
+        )
         if status in (401, 403):
             raise AuthError("Access token rejected fetching contracts")
         if status != 200:
@@ -214,23 +625,71 @@ class RomandeEnergieApiClient:
         return data
 
     async def get_curves(
-        self, access_token: str, contract_id: str, start_date: str, end_date: str
+        self,
+        access_token: str,
+        contract_id: str,
+        start_date: str,
+        end_date: str,
+        *,
+        granularity: str = GRANULARITY_DAILY,
+        revalidate: bool = True,
+        deadline: Deadline | None = None,
     ) -> list[dict[str, Any]]:
-        """Return the raw curve list for the given ISO date range (granularity DAILY)."""
-        url = CURVE_ENDPOINT.format(contract_id=contract_id)
+        """Return the raw curve list for the given ISO date range and granularity.
+
+        The portal publishes once a day but is asked far more often, so each
+        answer is kept per (contract, range, granularity) and revalidated: the request
+        carries the ETag / Last-Modified the server sent, and a 304 returns the
+        kept list. A server that sends no validators answers 200 every time, so
+        the body is also hashed and an identical one returns the kept list
+        without decoding it again. Either way the caller gets the very same
+        list object back, which is how it can tell nothing changed.
+
+        ``revalidate=False`` neither sends nor keeps validators, for one-off
+        ranges (the backfill) that would only push the polled ones out.
+        ``deadline`` bounds the request and its retries together.
+        """
+        url = self._base_url + CURVE_PATH.format(contract_id=contract_id)
         params = {
             "start_date": start_date,
             "end_date": end_date,
-            "granularity": "DAILY",
+            "granularity": granularity.upper(),
         }
-        status, body = await self._get(url, token=access_token, params=params)
+        key = (contract_id, start_date, end_date, granularity)
+        cached = self._curves_cache.get(key) if revalidate else None
+        status, body, headers = await self._get_data(
+            ENDPOINT_CURVES,
+            url,
+            token=access_token,
+            params=params,
+            extra_headers=cached.request_headers() if cached else None,
+            deadline=deadline,
+        )
+        if status == 304 and cached is not None:
+            self._curves_cache.move_to_end(key)
+            return cached.data
         if status in (401, 403):
             raise AuthError("Access token rejected fetching curves")
         if status != 200:
             raise ApiError(f"curves fetch failed: HTTP {status}")
-        data = self._json(body)
-        if not isinstance(data, list):
-            raise ApiError("Curves payload is not a list")
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if cached is not None and cached.digest == digest:
+            data = cached.data
+        else:
+            data = self._json(body)
+            if not isinstance(data, list):
+                raise ApiError("Curves payload is not a list")
+        if not revalidate:
+            return data
+        self._curves_cache[key] = _CachedCurves(
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            digest=digest,
+            data=data,
+        )
+        self._curves_cache.move_to_end(key)
+        while len(self._curves_cache) > CONDITIONAL_CACHE_SIZE:
+            self._curves_cache.popitem(last=False)
         return data
 
 
@@ -244,32 +703,67 @@ class DailyPoint(NamedTuple):
     value: float
 
 
+class HourlyPoint(NamedTuple):
+    """One hour's reading; ``start`` is the aware (UTC) start of the hour."""
+
+    start: datetime
+    value: float
+
+
+_K = TypeVar("_K", date, datetime)
+_P = TypeVar("_P", DailyPoint, HourlyPoint)
+
+
 def _first_block(curves_response: list[dict[str, Any]]) -> dict[str, Any] | None:
     return curves_response[0] if curves_response else None
 
 
-def parse_daily_series(
-    curves_response: list[dict[str, Any]], curve_type: str = CURVE_TYPE_CONSUMPTION
-) -> list[DailyPoint]:
-    """Return day-sorted ``DailyPoint``s for ``curve_type``, dropping null days.
+def _decode_timestamps(
+    timestamps: list[str], key: Callable[[datetime], _K]
+) -> list[_K | None]:
+    """Decode every timestamp once into its series key (None if unparseable).
+
+    Decoding is the costly part of a parse, and one timestamp lines up with a
+    value in every curve of every installation — so it is done once per
+    timestamp here, not once per value.
+    """
+    keys: list[_K | None] = []
+    for ts in timestamps:
+        try:
+            keys.append(key(datetime.fromisoformat(ts)))
+        except (ValueError, TypeError):
+            keys.append(None)
+    return keys
+
+
+def _parse_curves(
+    curves_response: list[dict[str, Any]], key: Callable[[datetime], _K]
+) -> tuple[dict[str, dict[_K, float]], dict[str, dict[str, dict[_K, float]]]]:
+    """Sum every curve type's values per key, in one walk of the payload.
 
     ``values[i]`` aligns with ``timestamps[i]``; values are strings, or null for
-    days with no data yet. Values from multiple installations/curves of the same
-    type are summed per day (household total). Parse problems are logged rather
-    than silently swallowed so a portal format change is diagnosable.
+    periods with no data yet. Returns the household totals per curve type and
+    the same per installation id: values are summed per installation first,
+    and the installations per key into the household total. The timestamps are
+    decoded once however many curves line up with them. Parse problems are
+    logged rather than silently swallowed so a portal format change is
+    diagnosable.
     """
     block = _first_block(curves_response)
     if not block:
-        return []
+        return {}, {}
 
     timestamps: list[str] = block.get("timestamps") or []
     installations = block.get("installations") or []
-    dedup: dict[date, float] = {}
-    seen_values = False
-    for installation in installations:
+    keys: list[_K | None] | None = None  # decoded lazily: no curve, no cost
+    by_installation: dict[str, dict[str, dict[_K, float]]] = {}
+    seen_values: set[str] = set()
+    for index, installation in enumerate(installations):
+        # An installation without an id still gets its own series, by position.
+        installation_id = str(installation.get("installation_id") or index)
+        curves = by_installation.setdefault(installation_id, {})
         for curve in installation.get("curves") or []:
-            if curve.get("curve_type") != curve_type:
-                continue
+            curve_type = curve.get("curve_type")
             values = curve.get("values") or []
             if len(values) != len(timestamps):
                 _LOGGER.warning(
@@ -279,32 +773,177 @@ def parse_daily_series(
                     len(timestamps),
                     len(values),
                 )
-            for ts, value in zip(timestamps, values):
+            if keys is None:
+                keys = _decode_timestamps(timestamps, key)
+            dedup = curves.setdefault(curve_type, {})
+            get = dedup.get  # hot loop: skip the attribute lookup per value
+            for ts, period, value in zip(timestamps, keys, values):
                 if value is None:
                     continue
-                seen_values = True
                 try:
-                    day = datetime.fromisoformat(ts).date()
                     parsed = float(value)
                 except (ValueError, TypeError) as err:
-                    _LOGGER.warning(
-                        "Dropping unparseable %s point ts=%r value=%r: %s",
-                        curve_type,
-                        ts,
-                        value,
-                        err,
-                    )
-                    continue
-                dedup[day] = dedup.get(day, 0.0) + parsed
-
-    if seen_values and not dedup:
-        # Non-null values were present but none parsed -> likely a format change.
-        _LOGGER.warning(
-            "No %s values could be parsed although the payload contained data; "
-            "the portal response format may have changed",
-            curve_type,
-        )
-    return [DailyPoint(day, value) for day, value in sorted(dedup.items())]
+                    problem: object = err
+                else:
+                    if period is not None:
+                        dedup[period] = get(period, 0.0) + parsed
+                        continue
+                    problem = "unparseable timestamp"
+                _LOGGER.warning(
+                    "Dropping unparseable %s point ts=%r value=%r: %s",
+                    curve_type,
+                    ts,
+                    value,
+                    problem,
+                )
+            if not dedup and any(value is not None for value in values):
+                seen_values.add(curve_type)
+
+    totals = _household_totals(by_installation)
+    # Only collected while a type has parsed nothing, so the hot loop stays lean.
+    for curve_type in seen_values:
+        if not totals[curve_type]:
+            # Non-null values were present but none parsed -> likely a format change.
+            _LOGGER.warning(
+                "No %s values could be parsed although the payload contained data; "
+                "the portal response format may have changed",
+                curve_type,
+            )
+    return totals, by_installation
+
+
+def _household_totals(
+    by_installation: dict[str, dict[str, dict[_K, float]]],
+) -> dict[str, dict[_K, float]]:
+    """Sum the installations' values per curve type and key.
+
+    A curve type only one installation carries — every single-meter
+    household — shares that installation's dict rather than copying it.
+    """
+    totals: dict[str, dict[_K, float]] = {}
+    merged: set[str] = set()  # types whose total is a dict of its own
+    for curves in by_installation.values():
+        for curve_type, dedup in curves.items():
+            total = totals.get(curve_type)
+            if total is None:
+                totals[curve_type] = dedup
+                continue
+            if curve_type not in merged:
+                totals[curve_type] = total = dict(total)
+                merged.add(curve_type)
+            get = total.get
+            for period, value in dedup.items():
+                total[period] = get(period, 0.0) + value
+    return totals
+
+
+class CurveBreakdown(NamedTuple, Generic[_P]):
+    """A payload's points per curve type, for the household and per installation.
+
+    ``installations`` is keyed on installation id. It is left empty when the
+    payload holds a single installation, whose series would only repeat
+    ``total``.
+    """
+
+    total: dict[str, list[_P]]
+    installations: dict[str, dict[str, list[_P]]]
+
+
+def _breakdown(
+    parsed: tuple[dict[str, dict[_K, float]], dict[str, dict[str, dict[_K, float]]]],
+    point: Callable[[_K, float], _P],
+) -> CurveBreakdown[_P]:
+    """Turn ``_parse_curves``' sums into sorted points of type ``point``."""
+    totals, by_installation = parsed
+
+    def points(curves: dict[str, dict[_K, float]]) -> dict[str, list[_P]]:
+        return {
+            curve_type: [point(key, value) for key, value in sorted(dedup.items())]
+            for curve_type, dedup in curves.items()
+        }
+
+    installations: dict[str, dict[str, list[_P]]] = {}
+    if len(by_installation) > 1:
+        installations = {
+            installation_id: points(curves)
+            for installation_id, curves in by_installation.items()
+        }
+    return CurveBreakdown(points(totals), installations)
+
+
+def parse_daily_curves(
+    curves_response: list[dict[str, Any]],
+) -> dict[str, list[DailyPoint]]:
+    """Return day-sorted ``DailyPoint``s per curve type, dropping null days.
+
+    Every curve type comes out of the same walk, keyed on the same days, so
+    callers wanting consumption and surplus parse the payload once. Hourly
+    payloads are summed into days too: the day is the wall-clock date of each
+    timestamp, never converted to UTC.
+    """
+    totals, _installations = _parse_curves(curves_response, datetime.date)
+    return {
+        curve_type: [DailyPoint(day, value) for day, value in sorted(dedup.items())]
+        for curve_type, dedup in totals.items()
+    }
+
+
+def parse_daily_breakdown(
+    curves_response: list[dict[str, Any]],
+) -> CurveBreakdown[DailyPoint]:
+    """``parse_daily_curves`` plus each installation's own points, from one walk."""
+    return _breakdown(_parse_curves(curves_response, datetime.date), DailyPoint)
+
+
+def parse_daily_series(
+    curves_response: list[dict[str, Any]], curve_type: str = CURVE_TYPE_CONSUMPTION
+) -> list[DailyPoint]:
+    """Return day-sorted ``DailyPoint``s for ``curve_type``, dropping null days.
+
+    One curve type out of ``parse_daily_curves``; prefer that when more than one
+    is needed.
+    """
+    return parse_daily_curves(curves_response).get(curve_type, [])
+
+
+def _hour_start(moment: datetime) -> datetime:
+    """The UTC start of the hour holding ``moment``.
+
+    UTC keeps the repeated 02:00 of the autumn DST change two distinct hours
+    (and the skipped one in spring simply absent) — the portal's offsets say
+    which is which. A timestamp without an offset is read as local time.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=TZ)
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def parse_hourly_curves(
+    curves_response: list[dict[str, Any]],
+) -> dict[str, list[HourlyPoint]]:
+    """Return hour-sorted ``HourlyPoint``s per curve type, dropping null hours.
+
+    Sub-hour periods (15-minute curves) are summed into their hour.
+    """
+    totals, _installations = _parse_curves(curves_response, _hour_start)
+    return {
+        curve_type: [HourlyPoint(start, value) for start, value in sorted(dedup.items())]
+        for curve_type, dedup in totals.items()
+    }
+
+
+def parse_hourly_breakdown(
+    curves_response: list[dict[str, Any]],
+) -> CurveBreakdown[HourlyPoint]:
+    """``parse_hourly_curves`` plus each installation's own points, from one walk."""
+    return _breakdown(_parse_curves(curves_response, _hour_start), HourlyPoint)
+
+
+def parse_hourly_series(
+    curves_response: list[dict[str, Any]], curve_type: str = CURVE_TYPE_CONSUMPTION
+) -> list[HourlyPoint]:
+    """Return hour-sorted ``HourlyPoint``s for ``curve_type``, dropping null hours."""
+    return parse_hourly_curves(curves_response).get(curve_type, [])
 
 
 def latest_value(series: list[DailyPoint]) -> DailyPoint | None:
@@ -0,0 +1,278 @@
+"""Long-range history backfill for the Romande Énergie statistics.
+
+The regular poll only ever keeps a month in view, so the recorder holds that
+month plus whatever accumulated since install. The backfill walks from a start
+date up to today in month-sized chunks. It fetches a few chunks ahead with
+bounded concurrency but writes them strictly in order, so every chunk's
+cumulative sum continues from the one before it and only the chunks in flight
+are ever held in memory, however many years are asked for.
+
+It runs all the way to today rather than stopping at an end date: rows written
+before the install shift the baseline of every later row, and only rewriting
+those too keeps the stored sums monotonic.
+
+Progress is checkpointed after each chunk, so an interrupted run (a restart, a
+reload) picks up where it stopped when the service is called again with the
+same start date.
+
+An entry covering several contracts backfills them one after the other, each
+with its own checkpoint. An hourly entry is backfilled hour by hour, into the
+hourly statistics its polls write.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from . import api
+from .api import AuthError, RomandeEnergieError
+from .const import (
+    CURVE_TYPE_CONSUMPTION,
+    CURVE_TYPE_SURPLUS,
+    DOMAIN,
+    GRANULARITY_DAILY,
+    STORAGE_VERSION,
+    TZ,
+)
+from .coordinator import (
+    ContractState,
+    RomandeEnergieCoordinator,
+    _day_start,
+    _fill_hour_gaps,
+)
+from .series import DailySeries
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _month_chunks(start: date, end: date) -> Iterator[tuple[date, date]]:
+    """Yield ``[first, stop)`` ranges covering ``[start, end)``, split at month starts."""
+    first = start
+    while first < end:
+        if first.month == 12:
+            stop = date(first.year + 1, 1, 1)
+        else:
+            stop = date(first.year, first.month + 1, 1)
+        stop = min(stop, end)
+        yield first, stop
+        first = stop
+
+
+def _store_key(coordinator: RomandeEnergieCoordinator, contract_id: str) -> str:
+    """The checkpoint store of one contract's backfill.
+
+    The entry's own contract keeps the key it had before an entry could cover
+    several, so a run interrupted across the upgrade still resumes.
+    """
+    key = f"{DOMAIN}.backfill.{coordinator.config_entry.entry_id}"
+    if contract_id == coordinator.contract_id:
+        return key
+    return f"{key}.{slugify(contract_id)}"
+
+
+class _Backfill:
+    """One backfill run for one contract of a coordinator."""
+
+    def __init__(
+        self,
+        coordinator: RomandeEnergieCoordinator,
+        contract: ContractState,
+        start: date,
+        concurrency: int,
+    ) -> None:
+        self.coordinator = coordinator
+        self.contract_id = contract.contract_id
+        self.start = start
+        self.concurrency = concurrency
+        self.store: Store[dict[str, Any]] = Store(
+            coordinator.hass,
+            STORAGE_VERSION,
+            _store_key(coordinator, contract.contract_id),
+        )
+        self.hourly = coordinator.granularity != GRANULARITY_DAILY
+        if self.hourly:
+            consumption = contract.stat_id_consumption_hourly
+            surplus = contract.stat_id_surplus_hourly
+        else:
+            consumption = contract.stat_id_consumption
+            surplus = contract.stat_id_surplus
+        self.targets = tuple(
+            (
+                curve_type,
+                stat_id,
+                coordinator._stat_name(name, contract.contract_id, hourly=self.hourly),
+            )
+            for curve_type, stat_id, name in (
+                (CURVE_TYPE_CONSUMPTION, consumption, "Consumption"),
+                (CURVE_TYPE_SURPLUS, surplus, "Surplus"),
+            )
+        )
+        # Running sum per statistic id at the end of the last written chunk. A
+        # statistic is absent until the first chunk carrying a value for it.
+        self.sums: dict[str, float] = {}
+        # Statistics whose baseline could not be read; never written this run.
+        self.skipped: set[str] = set()
+
+    async def run(self) -> None:
+        """Fetch and write every chunk from the checkpoint (or start) to today."""
+        today = datetime.now(tz=TZ).date()
+        resume = await self._load_checkpoint()
+        pending: deque[tuple[date, date, asyncio.Task[list[dict[str, Any]]]]] = deque()
+        chunks = _month_chunks(resume, today + timedelta(days=1))
+        try:
+            while True:
+                # Top up the in-flight fetches, then write the oldest one.
+                for first, stop in chunks:
+                    pending.append((first, stop, await self._fetch(first, stop)))
+                    if len(pending) >= self.concurrency:
+                        break
+                if not pending:
+                    break
+                first, stop, task = pending.popleft()
+                await self._write_chunk(await task, first, stop, final=stop > today)
+                await self.store.async_save(
+                    {
+                        "start": self.start.isoformat(),
+                        "next": stop.isoformat(),
+                        "sums": self.sums,
+                        "skipped": sorted(self.skipped),
+                    }
+                )
+        finally:
+            for _first, _stop, task in pending:
+                task.cancel()
+        await self.store.async_remove()
+
+    async def _load_checkpoint(self) -> date:
+        """Restore the progress of an earlier run from the same start date."""
+        checkpoint = await self.store.async_load()
+        if not checkpoint or checkpoint.get("start") != self.start.isoformat():
+            return self.start
+        self.sums = {k: float(v) for k, v in checkpoint.get("sums", {}).items()}
+        self.skipped = set(checkpoint.get("skipped", []))
+        resume = date.fromisoformat(checkpoint["next"])
+        _LOGGER.info(
+            "Resuming the %s backfill for %s at %s",
+            DOMAIN,
+            self.contract_id,
+            resume,
+        )
+        return resume
+
+    async def _fetch(
+        self, first: date, stop: date
+    ) -> asyncio.Task[list[dict[str, Any]]]:
+        """Start fetching one chunk, with a token good for the request."""
+        coordinator = self.coordinator
+        # Awaited here, one chunk at a time, so a rotation is never raced by a
+        # sibling fetch; the portal burns a refresh token that is used twice.
+        await coordinator._ensure_token()
+        return asyncio.create_task(
+            coordinator.client.get_curves(
+                coordinator._access_token,
+                self.contract_id,
+                first.isoformat(),
+                stop.isoformat(),
+                granularity=coordinator.granularity,
+                revalidate=False,
+            )
+        )
+
+    async def _write_chunk(
+        self, raw: list[dict[str, Any]], first: date, stop: date, *, final: bool
+    ) -> None:
+        """Write one chunk's rows, continuing each statistic's running sum."""
+        # The chunk's first and last row, as statistic timestamps.
+        chunk = (_day_start(first), _day_start(stop) - timedelta(hours=1))
+        # Both curve types come out of one walk of the payload.
+        curves: dict[str, list[Any]]
+        if self.hourly:
+            # A month of hours is too much to decode on the event loop.
+            curves = await self.coordinator.hass.async_add_executor_job(
+                api.parse_hourly_curves, raw
+            )
+        else:
+            chunk = (chunk[0], _day_start(stop - timedelta(days=1)))
+            curves = api.parse_daily_curves(raw)
+        for curve_type, stat_id, name_suffix in self.targets:
+            if stat_id in self.skipped:
+                continue
+            if self.hourly:
+                hours = [
+                    point
+                    for point in curves.get(curve_type, [])
+                    if chunk[0] <= point.start <= chunk[1]
+                ]
+                ends = (hours[0].start, hours[-1].start) if hours else None
+            else:
+                series = DailySeries.from_points(curves.get(curve_type, [])).slice(
+                    first, stop - timedelta(days=1)
+                )
+                ends = (
+                    (_day_start(series.first_day), _day_start(series.last_day))
+                    if series
+                    else None
+                )
+            running = self.sums.get(stat_id)
+            fill_first, fill_last = chunk
+            if running is None:
+                if ends is None:
+                    continue  # no history for this statistic yet
+                fill_first = ends[0]
+                running = await self.coordinator._sum_before(stat_id, fill_first)
+                if running is None:
+                    self.skipped.add(stat_id)  # already logged
+                    continue
+            # The last chunk stops at the newest published day (or hour), like
+            # a poll does; earlier ones are filled to their end so they meet the
+            # next.
+            if final:
+                if ends is None:
+                    continue
+                fill_last = ends[1]
+            if self.hourly:
+                points: Any = _fill_hour_gaps(hours, fill_first, fill_last)
+            else:
+                points = series.filled(fill_first.date(), fill_last.date())
+            self.sums[stat_id] = self.coordinator._write_statistics(
+                stat_id, name_suffix, points, running
+            )
+
+
+async def async_backfill(
+    coordinator: RomandeEnergieCoordinator, start: date, concurrency: int
+) -> None:
+    """Backfill the statistics of every contract of ``coordinator`` from ``start``.
+
+    Runs as a background task, so failures are logged rather than raised. The
+    checkpoints survive a failure, so calling the service again resumes; the
+    contracts already done start over, which only rewrites the same rows.
+    """
+    for contract in list(coordinator.contracts.values()):
+        contract_id = contract.contract_id
+        _LOGGER.info(
+            "Backfilling %s statistics for %s from %s", DOMAIN, contract_id, start
+        )
+        try:
+            await _Backfill(coordinator, contract, start, concurrency).run()
+        except (ConfigEntryAuthFailed, AuthError) as err:
+            _LOGGER.error("Backfill for %s stopped, reauth needed: %s", contract_id, err)
+            return
+        except RomandeEnergieError as err:
+            _LOGGER.error(
+                "Backfill for %s stopped (%s); call the service again to resume",
+                contract_id,
+                err,
+            )
+            return
+        _LOGGER.info("Backfill for %s complete", contract_id)
+    coordinator._forget_statistics()
+    await coordinator.async_request_refresh()
@@ -8,8 +8,14 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers import aiohttp_client
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
 from .api import (
     ApiError,
@@ -19,7 +25,16 @@ from .api import (
     RomandeEnergieApiClient,
     account_id_from_token,
 )
-from .const import CONF_ACCOUNT_ID, CONF_CONTRACT_ID, CONF_REFRESH_TOKEN, DOMAIN
+from .const import (
+    CONF_ACCOUNT_ID,
+    CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
+    CONF_GRANULARITY,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    GRANULARITIES,
+    GRANULARITY_DAILY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +54,14 @@ class RomandeEnergieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._otp_id: str | None = None
         self._mobile: str | None = None  # masked, for the OTP step description
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> RomandeEnergieOptionsFlow:
+        """Options: the curve granularity."""
+        return RomandeEnergieOptionsFlow()
+
     # ---- Step 1: credentials --------------------------------------------
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -105,7 +128,11 @@ class RomandeEnergieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_USERNAME: self._username,
                         CONF_PASSWORD: self._password,
                         CONF_ACCOUNT_ID: self._account_id,
-                        CONF_CONTRACT_ID: contract_id,
+                        CONF_CONTRACT_ID: str(contract_id),
+                        # One entry covers every contract on the account.
+                        CONF_CONTRACT_IDS: [
+                            str(c["id"]) for c in contracts if c.get("id")
+                        ],
                         CONF_REFRESH_TOKEN: refresh_token,
                     }
                     if self._reauth_entry:
@@ -199,3 +226,34 @@ class RomandeEnergieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     @staticmethod
     def _otp_schema() -> vol.Schema:
         return vol.Schema({vol.Required("otp_code"): cv.string})
+
+
+class RomandeEnergieOptionsFlow(config_entries.OptionsFlow):
+    """Pick the curve granularity (the entry reloads when it changes)."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Single form: daily or hourly curves."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+        # Looked up by id rather than self.config_entry, which older HA leaves unset.
+        entry = self.hass.config_entries.async_get_entry(self.handler)
+        options = entry.options if entry else {}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_GRANULARITY,
+                        default=options.get(CONF_GRANULARITY, GRANULARITY_DAILY),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=GRANULARITIES,
+                            mode=SelectSelectorMode.LIST,
+                            translation_key=CONF_GRANULARITY,
+                        )
+                    )
+                }
+            ),
+        )
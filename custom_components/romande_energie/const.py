@@ -12,46 +12,131 @@ DOMAIN = "romande_energie"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_ACCOUNT_ID = "account_id"
-CONF_CONTRACT_ID = "contract_id"
+CONF_CONTRACT_ID = "contract_id"           # The first contract (names the entry).
+CONF_CONTRACT_IDS = "contract_ids"         # Every contract-account on the account.
 CONF_REFRESH_TOKEN = "refresh_token"
+CONF_GRANULARITY = "granularity"             # Options-flow key.
 
 # ---------------------------------------------------------------------------
 # API endpoints (verified against the live customer portal 2026-07-24)
 # Base + every path uses a trailing slash.
 # ---------------------------------------------------------------------------
 BASE_URL = "https://api.espace-client.romande-energie.ch/v2"
-LOGIN_ENDPOINT = f"{BASE_URL}/login/"
-SEND_OTP_ENDPOINT = f"{BASE_URL}/login/send-otp/"
-VALIDATE_OTP_ENDPOINT = f"{BASE_URL}/login/validate-otp/"
+# The client joins these paths to its base URL, BASE_URL unless it is given
+# another (a local stand-in for the portal, in the load tests).
+LOGIN_PATH = "/login/"
+SEND_OTP_PATH = "/login/send-otp/"
+VALIDATE_OTP_PATH = "/login/validate-otp/"
 # NOTE: bare /refresh/, NOT /login/refresh/ (the latter is 404 for the customer portal).
-REFRESH_ENDPOINT = f"{BASE_URL}/refresh/"
-ACCOUNT_ENDPOINT = f"{BASE_URL}/accounts/{{account_id}}/"
-CONTRACTS_ENDPOINT = f"{BASE_URL}/accounts/{{account_id}}/contracts-accounts/"
-CURVE_ENDPOINT = f"{BASE_URL}/contracts-accounts/{{contract_id}}/curves/"
+REFRESH_PATH = "/refresh/"
+ACCOUNT_PATH = "/accounts/{account_id}/"
+CONTRACTS_PATH = "/accounts/{account_id}/contracts-accounts/"
+CURVE_PATH = "/contracts-accounts/{contract_id}/curves/"
+LOGIN_ENDPOINT = f"{BASE_URL}{LOGIN_PATH}"
+SEND_OTP_ENDPOINT = f"{BASE_URL}{SEND_OTP_PATH}"
+VALIDATE_OTP_ENDPOINT = f"{BASE_URL}{VALIDATE_OTP_PATH}"
+REFRESH_ENDPOINT = f"{BASE_URL}{REFRESH_PATH}"
+ACCOUNT_ENDPOINT = f"{BASE_URL}{ACCOUNT_PATH}"
+CONTRACTS_ENDPOINT = f"{BASE_URL}{CONTRACTS_PATH}"
+CURVE_ENDPOINT = f"{BASE_URL}{CURVE_PATH}"
 
 # ---------------------------------------------------------------------------
 # Behaviour tuning
 # ---------------------------------------------------------------------------
-FETCH_DAYS = 30                             # Rolling window requested every poll.
+FETCH_DAYS = 30                             # Rolling window kept for statistics + sensors.
+# Only the newest days can still change once the portal has published them, so an
+# ordinary poll asks for just the last DELTA_FETCH_DAYS (further back if the portal
+# lags) and merges the answer into the window it already holds. The whole window is
+# re-requested every FULL_FETCH_INTERVAL to pick up late corrections to older days.
+DELTA_FETCH_DAYS = 2
+FULL_FETCH_INTERVAL = timedelta(hours=6)
 TOKEN_EXP_MARGIN = 60                       # Seconds before access-token expiry we refresh.
-# The refresh token lives ~30 min and the access token ~15 min. Each poll refreshes
-# once the access token is within TOKEN_EXP_MARGIN of expiry, which rotates the
-# refresh token too. UPDATE_INTERVAL must stay below BOTH the access-token TTL (so a
-# refresh actually fires every cycle) and the ~30 min refresh-token TTL (so the
-# refresh token never lapses between polls); otherwise the session dies and a fresh
-# OTP login is required.
-UPDATE_INTERVAL = timedelta(minutes=20)
-# A failed poll does not rotate the refresh token, so waiting a whole
-# UPDATE_INTERVAL before trying again leaves a 40 min gap that outlives the ~30 min
-# refresh-token TTL — one network blip would then cost the user an SMS. The
-# coordinator falls back to this interval until a poll succeeds; two consecutive
-# retries still fit inside the TTL.
-POLL_RETRY_INTERVAL = timedelta(minutes=3)
+# The refresh token lives ~30 min and the access token ~15 min, and every refresh
+# rotates both. A keepalive rotates the session on its own clock, KEEPALIVE_MARGIN
+# seconds before the access token expires, so the refresh token never lapses however
+# rarely the curves are polled. A keepalive that fails is tried again after
+# KEEPALIVE_RETRY_INTERVAL; an access token carrying no expiry is rotated every
+# KEEPALIVE_FALLBACK_INTERVAL. Both stay well inside the refresh-token TTL.
+KEEPALIVE_MARGIN = 120
+KEEPALIVE_RETRY_INTERVAL = timedelta(minutes=2)
+KEEPALIVE_FALLBACK_INTERVAL = timedelta(minutes=10)
+# The curves change once a day when the portal syncs, so with the session kept
+# alive separately an hourly poll is plenty.
+UPDATE_INTERVAL = timedelta(hours=1)
+# Once a contract's publish time has been seen on PUBLISH_MIN_OBSERVATIONS of the
+# last PUBLISH_HISTORY_DAYS days, polls cluster around it instead: every
+# PUBLISH_POLL_INTERVAL from PUBLISH_WINDOW_LEAD before the earliest time seen to
+# as long after the latest, then nothing until the next day's window — but never
+# more than ADAPTIVE_MAX_INTERVAL between polls.
+PUBLISH_HISTORY_DAYS = 14
+PUBLISH_MIN_OBSERVATIONS = 3
+PUBLISH_POLL_INTERVAL = timedelta(minutes=15)
+PUBLISH_WINDOW_LEAD = timedelta(minutes=30)
+ADAPTIVE_MAX_INTERVAL = timedelta(hours=12)
+# A failed poll is tried again sooner than the next hourly one. The keepalive holds
+# the session meanwhile, so this only decides how stale the sensors may get.
+POLL_RETRY_INTERVAL = timedelta(minutes=10)
 # A refresh that fails on transport (or a portal 5xx) is retried inside the same
-# poll, for the same reason: the refresh token is ageing while we wait.
+# rotation: the refresh token is ageing while we wait.
 REFRESH_ATTEMPTS = 3
 REFRESH_RETRY_DELAY = 5                     # Seconds between refresh attempts.
-HTTP_TIMEOUT = 30                           # Seconds per request.
+HTTP_TIMEOUT = 30                           # Seconds per request, at most.
+# A data request's timeout follows the portal's latency instead:
+# LATENCY_TIMEOUT_FACTOR times the 95th percentile of the endpoint's last
+# LATENCY_SAMPLES answers, kept within [MIN_HTTP_TIMEOUT, HTTP_TIMEOUT]. Until
+# LATENCY_MIN_SAMPLES answers are in, HTTP_TIMEOUT applies. A refresh always
+# gets HTTP_TIMEOUT: the portal burns the token even for an answer we gave up on.
+LATENCY_SAMPLES = 50
+LATENCY_MIN_SAMPLES = 5
+LATENCY_TIMEOUT_FACTOR = 3.0
+MIN_HTTP_TIMEOUT = 10.0
+# Each endpoint's request phases (DNS, connect, time to first byte...) are kept
+# for its last TRACE_SAMPLES requests; see tracing.py.
+TRACE_SAMPLES = 200
+# Each poll stage's duration is kept for the last STAGE_SAMPLES polls, for the
+# diagnostic sensors' p95; see timings.py.
+STAGE_SAMPLES = 100
+# The last POLL_HISTORY polls are kept whole for the diagnostics download.
+POLL_HISTORY = 50
+# Time budgets, in seconds, that every request and retry wait must fit in. A token
+# rotation has REFRESH_BUDGET of its own, so the session is never starved by slow
+# data requests; the poll's data requests then share POLL_BUDGET.
+REFRESH_BUDGET = 60.0
+POLL_BUDGET = 60.0
+# Data requests (curves, contracts) retry a transport failure, a 429 or a 5xx with
+# exponential backoff and full jitter: a random wait of up to RETRY_BASE_DELAY
+# doubled per attempt, capped at RETRY_MAX_DELAY. A Retry-After longer than that
+# is not waited out inside the poll. The curves get more attempts than the
+# one-off contracts lookup.
+CURVES_RETRY_ATTEMPTS = 3
+CONTRACTS_RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY = 1.0                      # Seconds.
+RETRY_MAX_DELAY = 20.0                      # Seconds.
+# After BREAKER_THRESHOLD calls in a row have failed that way, an endpoint fails
+# fast for BREAKER_COOLDOWN (or the Retry-After, if longer), doubling per renewed
+# failure up to BREAKER_MAX_COOLDOWN. The next call after the cooldown is a trial.
+# A failure that carries a Retry-After opens the breaker for that long at once.
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = timedelta(minutes=5)
+BREAKER_MAX_COOLDOWN = timedelta(hours=1)
+# Curves requests in flight at once when an account has several contracts.
+CONTRACT_FETCH_CONCURRENCY = 4
+# Portal requests in flight at once across every config entry, and the span over
+# which the entries' polls are staggered (each entry gets a fixed offset in it).
+FLEET_CONCURRENCY = 4
+POLL_JITTER = timedelta(minutes=5)
+# Curves answers kept for conditional revalidation. Each contract alternates
+# between a delta and a full-window range, and both roll over at midnight.
+CONDITIONAL_CACHE_SIZE = 8
+
+# History backfill (the ``backfill`` service): month-sized chunks, this many in
+# flight by default, never more than the maximum.
+BACKFILL_CONCURRENCY = 3
+BACKFILL_MAX_CONCURRENCY = 6
+STORAGE_VERSION = 1
+# The statistics bookkeeping (the baseline sums) is saved this many seconds after
+# it last changed, so a backfill writing chunk after chunk saves it once.
+STATS_SAVE_DELAY = 10
 
 # Local time-zone for daily date boundaries and long-term-statistics timestamps.
 TZ = ZoneInfo("Europe/Zurich")
@@ -63,6 +148,18 @@ CURVE_TYPE_CONSUMPTION = "consumption"
 CURVE_TYPE_SURPLUS = "surplus"
 UNIT_KWH = "kWh"
 
+# Curve granularities (options-flow values; the portal takes them upper-cased).
+# Daily and hourly are what the portal was seen to serve; finer curves (15
+# minutes) are folded into their hour by the parser, since long-term statistics
+# are hourly at best.
+GRANULARITY_DAILY = "daily"
+GRANULARITY_HOURLY = "hourly"
+GRANULARITIES = [GRANULARITY_DAILY, GRANULARITY_HOURLY]
+
 # Long-term statistics ids are built per-contract in the coordinator
 # ("<domain>:<contract_id>_consumption" / "_surplus") to avoid collisions
-# between multiple configured accounts.
+# between multiple configured accounts. Hourly statistics get ids of their own,
+# suffixed HOURLY_STAT_SUFFIX: hourly rows left in a daily statistic (or daily
+# ones in an hourly statistic) by a switch of granularity would carry sums out of
+# order, which the energy dashboard reads as a meter reset.
+HOURLY_STAT_SUFFIX = "_hourly"
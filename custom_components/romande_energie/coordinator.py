@@ -1,29 +1,38 @@
 """DataUpdateCoordinator for the Romande Énergie integration.
 
-Keeps the session warm by refreshing before the access token expires, pulls a
-rolling window of daily curves each poll, feeds long-term statistics into the
-recorder and exposes the newest settled daily figure plus the month-to-date
-totals to the sensors.
+Keeps the session warm with a keepalive that rotates the tokens before the
+access token expires, independently of the curve polls; keeps a rolling window
+of daily curves up to date for every contract on the account (re-requesting
+only the days that can still change on most polls), feeds long-term
+statistics into the recorder, polls around the time of day the portal is seen
+to publish each contract, and exposes the newest settled daily figure plus the
+month-to-date totals to the sensors.
 """
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from functools import partial
-from typing import Any
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from array import array
+from collections.abc import Iterable
+from functools import lru_cache, partial
+from typing import Any, TypeVar
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
 from homeassistant.components.recorder.statistics import (
     StatisticsRow,
     async_add_external_statistics,
+    get_last_statistics,
     statistics_during_period,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import slugify
 
@@ -33,50 +42,169 @@ from .api import (
     AuthError,
     CannotConnect,
     DailyPoint,
+    Deadline,
+    HourlyPoint,
     RefreshError,
     RomandeEnergieApiClient,
 )
 from .const import (
     CONF_ACCOUNT_ID,
     CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
+    CONF_GRANULARITY,
     CONF_PASSWORD,
     CONF_REFRESH_TOKEN,
     CONF_USERNAME,
     CURVE_TYPE_CONSUMPTION,
     CURVE_TYPE_SURPLUS,
+    CONTRACT_FETCH_CONCURRENCY,
+    DELTA_FETCH_DAYS,
     DOMAIN,
     FETCH_DAYS,
+    FULL_FETCH_INTERVAL,
+    GRANULARITY_DAILY,
+    HOURLY_STAT_SUFFIX,
+    KEEPALIVE_FALLBACK_INTERVAL,
+    KEEPALIVE_MARGIN,
+    KEEPALIVE_RETRY_INTERVAL,
+    POLL_BUDGET,
     POLL_RETRY_INTERVAL,
     REFRESH_ATTEMPTS,
+    REFRESH_BUDGET,
     REFRESH_RETRY_DELAY,
+    STATS_SAVE_DELAY,
+    STORAGE_VERSION,
     TOKEN_EXP_MARGIN,
     TZ,
     UNIT_KWH,
     UPDATE_INTERVAL,
 )
+from .publish import PublishModel
+from .scheduler import RequestScheduler
+from .series import DailySeries, running_totals
+from .timings import PollTimings
 
 _LOGGER = logging.getLogger(__name__)
 
-# Lower bound for the fallback baseline query: "everything ever stored".
+# Lower bound for the baseline lookup: "everything ever stored".
 EPOCH = datetime(1970, 1, 1, tzinfo=TZ)
+# First span the baseline lookup searches back over when the day before the
+# window is missing but newer rows exist; it grows fourfold per miss.
+BASELINE_SEARCH_SPAN = timedelta(days=7)
+
+_K = TypeVar("_K", date, datetime)
+
+# The curve types the coordinator keeps a window for.
+_CURVE_TYPES = (CURVE_TYPE_CONSUMPTION, CURVE_TYPE_SURPLUS)
 
 
 def _day_start(day: date) -> datetime:
     """Local midnight of ``day`` — the statistic timestamp for that day."""
+    return _midnight(day.toordinal())
+
+
+@lru_cache(maxsize=4096)  # ten years of days, the longest a backfill is likely to go
+def _midnight(ordinal: int) -> datetime:
+    """Local midnight of the day with proleptic ordinal ``ordinal``.
+
+    Cached: a window is re-sent every poll and a backfill writes thousands of
+    days, and building an aware datetime per row is most of a row's cost.
+    """
+    day = date.fromordinal(ordinal)
     return datetime(day.year, day.month, day.day, tzinfo=TZ)
 
 
-def _calendar_month_total(series: list[DailyPoint], ref: date) -> float | None:
+def _statistic_rows(
+    points: DailySeries | list[HourlyPoint], running: float
+) -> list[StatisticData]:
+    """Build gap-filled ``points`` into rows whose sums continue from ``running``.
+
+    The sums are computed for the whole window in one batch (see
+    ``running_totals``), so the per-row work is only assembling the row.
+    """
+    if isinstance(points, DailySeries):
+        starts: list[datetime] = [
+            _midnight(ordinal)
+            for ordinal in range(points.start, points.start + len(points))
+        ]
+        values = points.values
+    else:
+        starts = [point.start for point in points]
+        values = array("d", [point.value for point in points])
+    # Literal dicts: a TypedDict call builds the same dict, only slower.
+    return [
+        {"start": start, "state": state, "sum": total}
+        for start, state, total in zip(
+            starts, values.tolist(), running_totals(values, running).tolist()
+        )
+    ]
+
+
+def _parse_curves(raw: list[dict[str, Any]], *, hourly: bool) -> api.CurveBreakdown:
+    """Parse both curve types of a payload in one pass, per day or per hour.
+
+    The household totals and, for a contract with several installations, each
+    installation's own points; every one carries both curve types.
+    """
+    parsed = api.parse_hourly_breakdown(raw) if hourly else api.parse_daily_breakdown(raw)
+
+    def both(curves: dict[str, list[Any]]) -> dict[str, list[Any]]:
+        return {curve_type: curves.get(curve_type, []) for curve_type in _CURVE_TYPES}
+
+    return api.CurveBreakdown(
+        both(parsed.total),
+        {
+            installation_id: both(curves)
+            for installation_id, curves in parsed.installations.items()
+        },
+    )
+
+
+def _daily_from_hourly(points: list[HourlyPoint]) -> list[DailyPoint]:
+    """Sum hourly points into their local calendar days."""
+    days: dict[date, float] = {}
+    for point in points:
+        day = point.start.astimezone(TZ).date()
+        days[day] = days.get(day, 0.0) + point.value
+    return [DailyPoint(day, value) for day, value in sorted(days.items())]
+
+
+def _merge(
+    held: dict[str, dict[_K, float]],
+    curve_type: str,
+    fetched: list[tuple[_K, float]],
+    cutoff: _K,
+    oldest: _K,
+) -> list[tuple[_K, float]]:
+    """Fold a fetch starting at ``cutoff`` into the held window and return it.
+
+    The fetch is authoritative from ``cutoff`` on — a period it leaves out is
+    one the portal reports as null, exactly as a full fetch would have — and
+    the periods before it keep the values an earlier fetch gave them. Periods
+    that have rolled out of FETCH_DAYS (before ``oldest``) are dropped so the
+    window stays bounded. Works on days and on hour starts alike.
+    """
+    window = {
+        key: value
+        for key, value in held.get(curve_type, {}).items()
+        if oldest <= key < cutoff
+    }
+    window.update(fetched)
+    held[curve_type] = window
+    return sorted(window.items())
+
+
+def _calendar_month_total(series: DailySeries, ref: date) -> float | None:
     """Sum the values of ``series`` that fall in ref's calendar month.
 
     The curve request uses a rolling window, so ``curves_statistics.total`` is a
     rolling total, not month-to-date — compute the calendar month ourselves.
     """
-    month = [p.value for p in series if p.day.year == ref.year and p.day.month == ref.month]
-    return round(sum(month), 4) if month else None
+    total = series.month_total(ref)
+    return None if total is None else round(total, 4)
 
 
-def _settled(series: list[DailyPoint], today: date) -> list[DailyPoint]:
+def _settled(series: DailySeries, today: date) -> DailySeries:
     """Drop the newest day while the portal may still be completing it.
 
     The portal syncs once a day and publishes the day it is working on with a
@@ -87,27 +215,94 @@ def _settled(series: list[DailyPoint], today: date) -> list[DailyPoint]:
     portal is lagging further behind, later syncs have already had their chance
     to complete its newest day, so that day is kept.
     """
-    if series and series[-1].day >= today - timedelta(days=1):
-        return series[:-1]
+    if series and series.last_day >= today - timedelta(days=1):
+        return series.slice(last=series.last_day - timedelta(days=1))
     return series
 
 
-def _fill_gaps(series: list[DailyPoint]) -> list[DailyPoint]:
-    """Return one point per calendar day the series spans, 0.0 where it has none.
+def _snapshot(
+    held: SeriesWindow,
+    today: date,
+    installations: dict[str, RomandeEnergieData] | None = None,
+) -> RomandeEnergieData:
+    """The sensors' view of one window on ``today``."""
+    cons = held.series[CURVE_TYPE_CONSUMPTION]
+    surp = held.series[CURVE_TYPE_SURPLUS]
+    return RomandeEnergieData(
+        consumption=_settled(cons, today).latest(),
+        consumption_month_total=_calendar_month_total(cons, today),
+        surplus=_settled(surp, today).latest(),
+        surplus_month_total=_calendar_month_total(surp, today),
+        # Judged on the full series: a brand-new account whose only day is
+        # still syncing still has surplus.
+        has_surplus=bool(surp),
+        installations=installations or {},
+    )
+
+
+def _first_change(
+    written: DailySeries | list[HourlyPoint] | None,
+    points: DailySeries | list[HourlyPoint],
+) -> int | None:
+    """Index of the first row of ``points`` that differs from ``written``.
 
-    Statistics rows have to stay contiguous. A day the portal has stopped
-    publishing (or has not published yet) would otherwise keep the sum an
-    earlier poll gave it while the days after it are rewritten without its
-    value, leaving the stored sums non-monotonic — which the Energy dashboard
-    reads as a meter reset. A zero written here is corrected by a later poll
-    once the portal publishes that day.
+    Both are gap filled, so rows line up by their offset from the first one.
+    Rows before the written window count as changed; so does a row past its
+    end. ``None`` means every row of ``points`` was written as it is.
     """
-    by_day = {point.day: point.value for point in series}
-    day, last = series[0].day, series[-1].day
-    filled: list[DailyPoint] = []
-    while day <= last:
-        filled.append(DailyPoint(day, by_day.get(day, 0.0)))
-        day += timedelta(days=1)
+    if not written:
+        return 0
+    if isinstance(points, DailySeries):
+        assert isinstance(written, DailySeries)
+        offset = points.start - written.start
+        old, new = written.values, points.values
+    else:
+        assert isinstance(written, list)
+        offset = (points[0].start - written[0].start) // timedelta(hours=1)
+        old = array("d", [point.value for point in written])
+        new = array("d", [point.value for point in points])
+    if offset < 0:
+        return 0
+    for index, value in enumerate(new):
+        if offset + index >= len(old) or old[offset + index] != value:
+            return index
+    return None
+
+
+def _fingerprint(points: DailySeries | list[HourlyPoint]) -> str:
+    """A short digest of a gap-filled window: its first row and every value."""
+    if isinstance(points, DailySeries):
+        first, values = points.start, points.values
+    else:
+        first = int(points[0].start.timestamp())
+        values = array("d", [point.value for point in points])
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(first.to_bytes(8, "little", signed=True))
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def _fill_hour_gaps(
+    series: list[HourlyPoint],
+    first: datetime | None = None,
+    last: datetime | None = None,
+) -> list[HourlyPoint]:
+    """``DailySeries.filled`` for hourly points: one per hour, 0.0 for the gaps.
+
+    An hour missing from the rows would break the stored sums the way a
+    missing day does; see there. ``first``/``last`` widen the span as its
+    bounds do.
+
+    Steps are taken in UTC, so the 23- and 25-hour days of the DST changes
+    come out with exactly the hours they really have.
+    """
+    by_hour = {point.start: point.value for point in series}
+    hour = series[0].start if first is None else first.astimezone(UTC)
+    last = series[-1].start if last is None else last.astimezone(UTC)
+    filled: list[HourlyPoint] = []
+    while hour <= last:
+        filled.append(HourlyPoint(hour, by_hour.get(hour, 0.0)))
+        hour += timedelta(hours=1)
     return filled
 
 
@@ -122,6 +317,9 @@ class RomandeEnergieData:
     still syncing, so they climb as the portal completes it. ``has_surplus`` is
     judged on the full series, so it stays true for an account whose only day
     has yet to settle.
+
+    ``installations`` holds the same snapshot per installation id for a
+    contract with several installations, and is empty otherwise.
     """
 
     consumption: DailyPoint | None
@@ -129,10 +327,125 @@ class RomandeEnergieData:
     surplus: DailyPoint | None
     surplus_month_total: float | None
     has_surplus: bool
+    installations: dict[str, RomandeEnergieData] = field(default_factory=dict)
+
+
+class SeriesWindow:
+    """The rolling windows of one reading: a contract's total or one installation's."""
+
+    def __init__(self, stat_prefix: str) -> None:
+        self.stat_id_consumption = f"{stat_prefix}_consumption"
+        self.stat_id_surplus = f"{stat_prefix}_surplus"
+        # Hourly rows never share a statistic with daily ones; see const.py.
+        self.stat_id_consumption_hourly = self.stat_id_consumption + HOURLY_STAT_SUFFIX
+        self.stat_id_surplus_hourly = self.stat_id_surplus + HOURLY_STAT_SUFFIX
+        # The merged rolling window per curve type, and the series built from it.
+        self.window: dict[str, dict[date, float]] = {}
+        self.series: dict[str, DailySeries] = {}
+        # The hour-level window, held alongside the daily one when the entry is
+        # set to a finer granularity (and left empty otherwise).
+        self.hourly_window: dict[str, dict[datetime, float]] = {}
+        self.hourly_series: dict[str, list[HourlyPoint]] = {}
+
+    def clear(self) -> None:
+        """Forget the held windows, ahead of folding in a whole-window fetch."""
+        self.window.clear()
+        self.hourly_window.clear()
+
+    def fold(
+        self,
+        daily: dict[str, list[DailyPoint]],
+        hourly: dict[str, list[HourlyPoint]] | None,
+        start: date,
+        oldest: date,
+    ) -> None:
+        """Fold a fetch starting at ``start`` into the windows and rebuild the series."""
+        if hourly is not None:
+            for curve_type, points in hourly.items():
+                self.hourly_series[curve_type] = [
+                    HourlyPoint._make(item)
+                    for item in _merge(
+                        self.hourly_window,
+                        curve_type,
+                        points,
+                        _day_start(start),
+                        _day_start(oldest),
+                    )
+                ]
+        for curve_type, points in daily.items():
+            self.series[curve_type] = DailySeries.from_points(
+                _merge(self.window, curve_type, points, start, oldest)
+            )
+
+
+class ContractState(SeriesWindow):
+    """What the coordinator keeps for one contract-account of the entry."""
+
+    def __init__(self, contract_id: str) -> None:
+        # Per-contract statistic ids so multiple contracts never collide. The
+        # contract id comes from the portal and only slugs are valid in a
+        # statistic id, so an id carrying uppercase letters or hyphens would
+        # make every write raise HomeAssistantError.
+        self.stat_prefix = f"{DOMAIN}:{slugify(contract_id)}"
+        super().__init__(self.stat_prefix)
+        self.contract_id = contract_id
+        # When the window was last fetched whole (None until the first poll,
+        # which always fetches it whole), and the last curves answer.
+        self.last_full_fetch: datetime | None = None
+        self.last_raw: list[dict[str, Any]] | None = None
+        # Per installation id, for a contract with several installations.
+        self.installations: dict[str, SeriesWindow] = {}
+        # When the portal publishes this contract, and what the newest days
+        # held after the last poll (None before the first).
+        self.publish = PublishModel()
+        self.published: tuple[DailySeries, ...] | None = None
+
+    def installation(self, installation_id: str) -> SeriesWindow:
+        """The windows of one installation, created on first sight."""
+        windows = self.installations.get(installation_id)
+        if windows is None:
+            windows = self.installations[installation_id] = SeriesWindow(
+                f"{self.stat_prefix}_{slugify(installation_id)}"
+            )
+        return windows
+
+    def newest_days(self) -> tuple[DailySeries, ...]:
+        """The two newest days of each curve type: what a publication moves.
+
+        A sync adds the day it is working on and completes the one before it,
+        so one of these changes whenever the portal has published.
+        """
+        return tuple(self.series[curve_type][-2:] for curve_type in _CURVE_TYPES)
+
+    def full_fetch_due(self, now: datetime) -> bool:
+        """Whether this poll should re-request the whole FETCH_DAYS window."""
+        return (
+            self.last_full_fetch is None
+            or now - self.last_full_fetch >= FULL_FETCH_INTERVAL
+        )
+
+    def delta_start(self, today: date) -> date:
+        """First day an ordinary poll re-requests; every day before it is settled.
+
+        That is the last DELTA_FETCH_DAYS, or from the newest day carrying a value
+        when the portal lags further behind: the portal may still be completing
+        that day, so it has to be asked for again until a later one appears.
+        """
+        start = today - timedelta(days=DELTA_FETCH_DAYS)
+        newest = [max(days) for days in self.window.values() if days]
+        if newest:
+            start = min(start, max(newest))
+        return start
+
 
+class RomandeEnergieCoordinator(DataUpdateCoordinator[dict[str, RomandeEnergieData]]):
+    """Coordinate token refresh, curve polling and statistics ingestion.
 
-class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
-    """Coordinate token refresh, curve polling and statistics ingestion."""
+    One coordinator serves every contract-account of the config entry: the
+    session is rotated once per poll, the contracts' curves are fetched side by
+    side and their statistics go to the recorder together. ``data`` maps each
+    contract id to its snapshot.
+    """
 
     def __init__(
         self, hass: HomeAssistant, entry: ConfigEntry, client: RomandeEnergieApiClient
@@ -142,20 +455,53 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
         self.username: str = entry.data[CONF_USERNAME]
         self.password: str = entry.data[CONF_PASSWORD]
         self.account_id: str = entry.data[CONF_ACCOUNT_ID]
+        # The contract the entry was created for; it names the entry.
         self.contract_id: str = entry.data[CONF_CONTRACT_ID]
-        # Per-contract statistic ids so multiple accounts never collide. The
-        # contract id comes from the portal and only slugs are valid in a
-        # statistic id, so an id carrying uppercase letters or hyphens would
-        # make every write raise HomeAssistantError.
-        contract_slug = slugify(self.contract_id)
-        self._stat_id_consumption = f"{DOMAIN}:{contract_slug}_consumption"
-        self._stat_id_surplus = f"{DOMAIN}:{contract_slug}_surplus"
+        self.granularity: str = entry.options.get(CONF_GRANULARITY, GRANULARITY_DAILY)
+        # Entries created before multi-contract support only know their first
+        # contract; the first poll then asks the portal for the rest.
+        contract_ids: list[str] = entry.data.get(CONF_CONTRACT_IDS) or [self.contract_id]
+        self._contracts_known = CONF_CONTRACT_IDS in entry.data
+        self.contracts: dict[str, ContractState] = {
+            contract_id: ContractState(contract_id) for contract_id in contract_ids
+        }
         # Last window handed to the recorder per statistic id, to skip re-writing
-        # an unchanged one on every poll.
-        self._written: dict[str, list[DailyPoint]] = {}
+        # an unchanged one on every poll. Only its fingerprint is kept on disk:
+        # enough for the first poll after a restart to skip an unchanged window.
+        self._written: dict[str, DailySeries | list[HourlyPoint]] = {}
+        self._written_digests: dict[str, str] = {}
+        # The stored sum a window continues from, per statistic id and window
+        # start (epoch seconds), learnt from our own last write so the recorder
+        # is only asked on a miss. Kept on disk across restarts.
+        self._baselines: dict[str, dict[int, float]] = {}
+        # Statistics whose bookkeeping came from disk and has yet to be checked
+        # against the recorder (``_async_check_stored``).
+        self._unchecked: set[str] = set()
+        self._stats_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{entry.entry_id}"
+        )
+        self._stats_loaded = False
         self._access_token: str | None = None
         self._token_exp: int = 0
         self._refresh_token: str = entry.data[CONF_REFRESH_TOKEN]
+        # The rotation in flight, shared by every caller needing a token meanwhile.
+        self._rotation: asyncio.Future[None] | None = None
+        # This entry's fixed offset in the fleet-wide stagger. It shifts the
+        # first poll and the first keepalive after setup, once: added to every
+        # interval it would change how often the entry polls, not when.
+        self._poll_offset = RequestScheduler.jitter(entry.entry_id)
+        self._poll_shifted = False
+        # How long before expiry the keepalive rotates: earlier by the offset
+        # until its first rotation, which the later ones then follow.
+        self._keepalive_margin = KEEPALIVE_MARGIN + int(
+            self._poll_offset.total_seconds()
+        )
+        # Whether the keepalive runs, and its pending timer.
+        self._keepalive_active = False
+        self._keepalive_unsub: CALLBACK_TYPE | None = None
+        self._keepalive_job = HassJob(self._keepalive_due, "romande_energie keepalive")
+        # What each stage of the recent polls took, for the diagnostic sensors.
+        self.timings = PollTimings()
         super().__init__(
             hass,
             _LOGGER,
@@ -164,26 +510,56 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
         )
 
     # ---- Auth -------------------------------------------------------------
-    async def _ensure_token(self) -> None:
-        """Refresh the access token if missing or close to expiry."""
+    async def _ensure_token(self, margin: int = TOKEN_EXP_MARGIN) -> None:
+        """Refresh the access token if missing or within ``margin`` s of expiry.
+
+        Single flight: the poll, ``update_now`` and a backfill can all find the
+        token stale at once, and the portal burns a refresh token the moment it
+        is used — a second refresh sending the same one would fail and force an
+        SMS reauth. So only the first caller starts a rotation; the others
+        await that one and share its outcome, success or failure.
+
+        The rotation is shielded from its callers' cancellation: abandoning a
+        refresh mid-flight could lose the rotated token the portal already
+        issued, which is the same reauth by another route.
+        """
         now = datetime.now(tz=TZ).timestamp()
-        if self._access_token and self._token_exp - now > TOKEN_EXP_MARGIN:
+        if self._access_token and self._token_exp - now > margin:
             return
+        if self._rotation is None:
+            self._rotation = asyncio.ensure_future(self._rotate_tokens())
+            self._rotation.add_done_callback(self._rotation_done)
+        await asyncio.shield(self._rotation)
+
+    def _rotation_done(self, rotation: asyncio.Future[None]) -> None:
+        """Let the next stale token start a new rotation."""
+        self._rotation = None
+        if not rotation.cancelled():
+            rotation.exception()  # retrieved: a caller gone by then is no bug
+
+    async def _rotate_tokens(self) -> None:
+        """Run one rotation and keep the tokens it returns."""
+        expires_in = None
+        if self._access_token:
+            expires_in = round(self._token_exp - datetime.now(tz=TZ).timestamp())
         tokens = await self._refresh_tokens()
+        self.timings.note_rotation(expires_in)
         self._access_token = tokens["access_token"]
         self._refresh_token = tokens["refresh_token"]
         self._token_exp = api.token_expiry(self._access_token)
         await self._persist_refresh_token()  # rotate: save the new refresh token
+        # Rotated by a poll or a backfill, the keepalive's deadline moved.
+        self._schedule_keepalive()
 
     async def _refresh_tokens(self) -> dict[str, Any]:
         """Rotate the session, retrying a refresh that never got an answer.
 
         The refresh token expires ~30 min after the rotation that issued it, and
         only a successful refresh renews it. Giving up on the first transport
-        failure or portal 5xx means the next attempt is a whole poll interval
-        later, which can land past that TTL — the user then has to re-enter an SMS
-        code because of one blip. Retrying inside the poll keeps the ageing window
-        short.
+        failure or portal 5xx means the next attempt is a keepalive retry
+        later, and a few of those in a row can land past that TTL — the user
+        then has to re-enter an SMS code because of one blip. Retrying inside
+        the poll keeps the ageing window short.
 
         A ``RefreshError`` is not retried: the portal has already rejected the
         token, so further attempts only delay the reauth flow. Note a refresh that
@@ -191,21 +567,28 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
         the retry sends a token the portal has burned and gets that same
         ``RefreshError`` — unrecoverable either way, since the replacement was in
         the answer we never received.
+
+        The attempts and the waits between them share REFRESH_BUDGET, which is
+        the rotation's own: a slow portal bounds how long it takes, but the
+        poll's data requests never eat into it.
         """
+        budget = Deadline(REFRESH_BUDGET)
         for _ in range(REFRESH_ATTEMPTS - 1):
             try:
-                return await self._refresh_once()
+                return await self._refresh_once(budget)
             except (CannotConnect, ApiError) as err:
+                if budget.remaining() <= REFRESH_RETRY_DELAY:
+                    raise  # no time left for another attempt
                 _LOGGER.debug(
                     "Token refresh failed (%s); retrying in %s s", err, REFRESH_RETRY_DELAY
                 )
                 await asyncio.sleep(REFRESH_RETRY_DELAY)
-        return await self._refresh_once()  # last attempt: let the failure surface
+        return await self._refresh_once(budget)  # last attempt: let the failure surface
 
-    async def _refresh_once(self) -> dict[str, Any]:
+    async def _refresh_once(self, budget: Deadline) -> dict[str, Any]:
         """One refresh call, with a dead refresh token mapped to HA reauth."""
         try:
-            return await self.client.refresh(self._refresh_token)
+            return await self.client.refresh(self._refresh_token, deadline=budget)
         except RefreshError as err:  # refresh token dead -> HA reauth (fresh OTP)
             raise ConfigEntryAuthFailed(str(err)) from err
 
@@ -215,36 +598,165 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
             new = {**self.config_entry.data, CONF_REFRESH_TOKEN: self._refresh_token}
             self.hass.config_entries.async_update_entry(self.config_entry, data=new)
 
+    # ---- Keepalive --------------------------------------------------------
+    @callback
+    def async_start_keepalive(self) -> CALLBACK_TYPE:
+        """Start rotating the session on the token's own deadline; return the stop.
+
+        The curves change once a day, but the refresh token dies ~30 min after
+        the rotation that issued it. Tying the rotation to the polls forced a
+        curves download every 20 minutes just to stay logged in; the keepalive
+        rotates on its own clock instead, so the polls can be as rare as the
+        data warrants.
+        """
+        self._keepalive_active = True
+        self._schedule_keepalive()
+        return self.async_stop_keepalive
+
+    @callback
+    def async_stop_keepalive(self) -> None:
+        """Stop the keepalive and cancel its pending timer, if any."""
+        self._keepalive_active = False
+        if self._keepalive_unsub is not None:
+            self._keepalive_unsub()
+            self._keepalive_unsub = None
+
+    @callback
+    def _schedule_keepalive(self, delay: float | None = None) -> None:
+        """(Re)arm a running keepalive, by default for its margin before expiry."""
+        if not self._keepalive_active:
+            return
+        if delay is None:
+            if not self._access_token:  # no session yet: rotate now
+                delay = 0.0
+            elif self._token_exp:
+                now = datetime.now(tz=TZ).timestamp()
+                delay = max(0.0, self._token_exp - self._keepalive_margin - now)
+            else:  # no expiry claim to go by
+                delay = KEEPALIVE_FALLBACK_INTERVAL.total_seconds()
+        if self._keepalive_unsub is not None:
+            self._keepalive_unsub()
+        self._keepalive_unsub = async_call_later(self.hass, delay, self._keepalive_job)
+
+    @callback
+    def _keepalive_due(self, _now: datetime) -> None:
+        """Run the keepalive rotation as a task of the entry."""
+        self._keepalive_unsub = None
+        self.config_entry.async_create_task(
+            self.hass, self._async_keepalive(), f"{DOMAIN} keepalive"
+        )
+
+    async def _async_keepalive(self) -> None:
+        """Rotate the session and arm the next keepalive.
+
+        A rotation that fails on transport is tried again after
+        KEEPALIVE_RETRY_INTERVAL, the refresh token being still good until it
+        is rejected. A rejected one needs a fresh SMS code: the keepalive stops
+        and the reauth flow starts, without waiting for the next poll.
+        """
+        try:
+            await self._ensure_token(self._keepalive_margin)
+        except ConfigEntryAuthFailed as err:
+            _LOGGER.debug("Keepalive refresh rejected (%s); starting reauth", err)
+            self.async_stop_keepalive()
+            self.config_entry.async_start_reauth(self.hass)
+            return
+        except (CannotConnect, ApiError) as err:
+            _LOGGER.debug(
+                "Keepalive refresh failed (%s); retrying in %s",
+                err,
+                KEEPALIVE_RETRY_INTERVAL,
+            )
+            self._schedule_keepalive(KEEPALIVE_RETRY_INTERVAL.total_seconds())
+            return
+        self._keepalive_margin = KEEPALIVE_MARGIN
+        self._schedule_keepalive()
+
+    def request_timings(self) -> dict[str, dict[str, Any]]:
+        """Where the portal requests spend their time, per endpoint.
+
+        Phase percentiles and histograms, plus how many requests opened a new
+        connection rather than reusing one; see tracing.py.
+        """
+        return self.client.request_timings()
+
     # ---- Poll -------------------------------------------------------------
-    async def _async_update_data(self) -> RomandeEnergieData:
+    async def _async_update_data(self) -> dict[str, RomandeEnergieData]:
         """Poll, coming back sooner than usual while polls are failing.
 
-        Only a successful poll rotates the refresh token, so a failed one starts
-        a clock: wait the full UPDATE_INTERVAL and the gap since the last rotation
-        reaches 40 min, outliving the ~30 min refresh-token TTL and costing the
-        user an SMS. Retrying on POLL_RETRY_INTERVAL keeps several attempts inside
-        the TTL, so a transient outage no longer ends the session. An expired
+        The keepalive holds the session through a failed poll, so the shorter
+        POLL_RETRY_INTERVAL only keeps the sensors from going stale for a whole
+        UPDATE_INTERVAL after a blip — unless a data endpoint's circuit breaker
+        has opened, in which case the poll waits for it to close. An expired
         refresh token raises ConfigEntryAuthFailed instead, which stops the
         polling altogether — no interval to tune there.
+
+        The first wait after setup is lengthened by the entry's own offset in
+        POLL_JITTER, so entries set up in the same second do not keep polling
+        in step.
+
+        Every poll is recorded in ``timings`` — its stages, answers and
+        writes — for the diagnostic sensors and the diagnostics download.
         """
-        try:
-            data = await self._poll()
-        except UpdateFailed:
-            self.update_interval = POLL_RETRY_INTERVAL
-            raise
-        self.update_interval = UPDATE_INTERVAL
+        with self.timings.poll() as record:
+            received = self.client.received_bytes()
+            statuses = self.client.statuses()
+            try:
+                data = await self._poll()
+            except UpdateFailed:
+                # No sooner than the client's breakers let the data endpoints through.
+                retry = max(
+                    POLL_RETRY_INTERVAL, timedelta(seconds=self.client.retry_in())
+                )
+                self.update_interval = self._shift_once(retry)
+                raise
+            finally:
+                # A failed poll is recorded too: a slow failure is what to look into.
+                self.timings.count_bytes(self.client.received_bytes() - received)
+                record.statuses = dict(self.client.statuses() - statuses)
+        interval = self._next_interval(datetime.now(tz=TZ))
+        self.update_interval = self._shift_once(interval)
         return data
 
-    async def _poll(self) -> RomandeEnergieData:
-        """Fetch the rolling window and build the snapshot for the sensors."""
+    def _shift_once(self, interval: timedelta) -> timedelta:
+        """``interval``, plus the entry's offset if it is the first after setup."""
+        if self._poll_shifted:
+            return interval
+        self._poll_shifted = True
+        return interval + self._poll_offset
+
+    def _next_interval(self, now: datetime) -> timedelta:
+        """Wait until the soonest poll any contract's publish model asks for.
+
+        UPDATE_INTERVAL while a model has too little to go by. The keepalive
+        rotates the session on its own schedule, so the wait can be long.
+        """
+        return min(
+            (contract.publish.next_poll(now) for contract in self.contracts.values()),
+            default=UPDATE_INTERVAL,
+        )
+
+    async def _poll(self) -> dict[str, RomandeEnergieData]:
+        """Bring every contract's window up to date and build the sensors' snapshots."""
         try:
-            await self._ensure_token()
-            today = datetime.now(tz=TZ).date()
-            start = (today - timedelta(days=FETCH_DAYS)).isoformat()
-            end = (today + timedelta(days=1)).isoformat()
-            raw = await self.client.get_curves(
-                self._access_token, self.contract_id, start, end
-            )
+            # One rotation serves every contract: the refresh token is single
+            # use, so per-contract refreshes would race each other for it. The
+            # keepalive normally rotated it already, making this a no-op.
+            with self.timings.stage("token"):
+                await self._ensure_token()
+            # The data requests' budget starts once the session is secured.
+            deadline = Deadline(POLL_BUDGET)
+            if not self._contracts_known:
+                with self.timings.stage("contracts"):
+                    await self._discover_contracts(deadline)
+            now = datetime.now(tz=TZ)
+            today = now.date()
+            plans = {
+                contract_id: self._fetch_plan(contract, now, today)
+                for contract_id, contract in self.contracts.items()
+            }
+            with self.timings.stage("curves"):
+                answers = await self._fetch_curves(plans, today, deadline)
         except ConfigEntryAuthFailed:
             raise
         except AuthError as err:  # access token rejected mid-poll -> reauth
@@ -252,64 +764,320 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
         except (CannotConnect, ApiError) as err:
             raise UpdateFailed(str(err)) from err
 
-        cons = api.parse_daily_series(raw, CURVE_TYPE_CONSUMPTION)
-        surp = api.parse_daily_series(raw, CURVE_TYPE_SURPLUS)
+        windows: list[tuple[str, str, DailySeries | list[HourlyPoint]]] = []
+        data: dict[str, RomandeEnergieData] = {}
+        for contract_id, contract in self.contracts.items():
+            full, start = plans[contract_id]
+            raw = answers[contract_id]
+            if full:
+                contract.last_full_fetch = now
+            if raw is not contract.last_raw:
+                # The client hands back the very list it returned last time when
+                # the portal answered 304 or repeated the same body; the window
+                # built from it then still stands, so there is nothing to parse.
+                with self.timings.stage("parse"):
+                    await self._update_window(contract, raw, full, start, today)
+                contract.last_raw = raw
+                await self._note_publication(contract, now)
+            windows.extend(self._stat_windows(contract, contract_id))
+            installations: dict[str, RomandeEnergieData] = {}
+            for installation_id, held in contract.installations.items():
+                windows.extend(self._stat_windows(held, contract_id, installation_id))
+                installations[installation_id] = _snapshot(held, today)
+            data[contract_id] = _snapshot(contract, today, installations)
 
         # Long-term statistics feed the energy dashboard but are auxiliary: a
         # recorder hiccup must not blank the sensors, so failures are logged only.
         try:
-            await self._insert_statistics(
-                self._stat_id_consumption, "Consumption", cons
-            )
-            if surp:
-                await self._insert_statistics(self._stat_id_surplus, "Surplus", surp)
+            await self._insert_statistics_batch(windows)
         except Exception:  # noqa: BLE001 - stats are best-effort
             # exception(), not warning(): a failure here is silent to the user
             # (the sensors keep updating) so the traceback is the only lead.
             _LOGGER.exception("Failed to write long-term statistics")
+        return data
+
+    async def _note_publication(self, contract: ContractState, now: datetime) -> None:
+        """Feed the contract's publish model when the newest days moved."""
+        newest = contract.newest_days()
+        if contract.published is None:
+            # The first poll since start-up: there is nothing to compare with.
+            await self._async_load_stats()
+        elif newest != contract.published and contract.publish.observe(now):
+            _LOGGER.debug("Portal published %s at %s", contract.contract_id, now)
+            self._stats_store.async_delay_save(self._stats_data, STATS_SAVE_DELAY)
+        contract.published = newest
+
+    def _stat_windows(
+        self,
+        held: SeriesWindow,
+        contract_id: str,
+        installation_id: str | None = None,
+    ) -> list[tuple[str, str, DailySeries | list[HourlyPoint]]]:
+        """The ``(stat_id, name_suffix, series)`` windows ``held`` has to write.
+
+        Hourly statistics, under their own ids, when the entry asks for them;
+        the sensors stay daily. A surplus statistic only once there is surplus
+        to record.
+        """
+        hourly = self.granularity != GRANULARITY_DAILY
+        stats = held.hourly_series if hourly else held.series
+        windows = [
+            (
+                held.stat_id_consumption_hourly if hourly else held.stat_id_consumption,
+                self._stat_name("Consumption", contract_id, installation_id, hourly),
+                stats[CURVE_TYPE_CONSUMPTION],
+            )
+        ]
+        if held.series[CURVE_TYPE_SURPLUS]:
+            windows.append(
+                (
+                    held.stat_id_surplus_hourly if hourly else held.stat_id_surplus,
+                    self._stat_name("Surplus", contract_id, installation_id, hourly),
+                    stats[CURVE_TYPE_SURPLUS],
+                )
+            )
+        return windows
+
+    def _stat_name(
+        self,
+        name_suffix: str,
+        contract_id: str,
+        installation_id: str | None = None,
+        hourly: bool = False,
+    ) -> str:
+        """The statistic name suffix, naming the contract once there are several."""
+        parts = [name_suffix]
+        if len(self.contracts) > 1:
+            parts.append(contract_id)
+        if installation_id is not None:
+            parts.append(installation_id)
+        if hourly:
+            parts.append("(hourly)")
+        return " ".join(parts)
 
-        return RomandeEnergieData(
-            consumption=api.latest_value(_settled(cons, today)),
-            consumption_month_total=_calendar_month_total(cons, today),
-            surplus=api.latest_value(_settled(surp, today)),
-            surplus_month_total=_calendar_month_total(surp, today),
-            # Judged on the full series: a brand-new account whose only day is
-            # still syncing still has surplus.
-            has_surplus=bool(surp),
+    async def _discover_contracts(self, deadline: Deadline | None = None) -> None:
+        """Learn every contract on the account and record them on the entry.
+
+        Only entries created before multi-contract support lack the list. Their
+        own contract stays first, so it keeps naming the entry.
+        """
+        contracts = await self.client.get_contracts(
+            self._access_token, self.account_id, deadline=deadline
+        )
+        found = [str(c["id"]) for c in contracts if c.get("id")]
+        contract_ids = [self.contract_id, *(c for c in found if c != self.contract_id)]
+        for contract_id in contract_ids:
+            self.contracts.setdefault(contract_id, ContractState(contract_id))
+        self._contracts_known = True
+        new = {**self.config_entry.data, CONF_CONTRACT_IDS: contract_ids}
+        self.hass.config_entries.async_update_entry(self.config_entry, data=new)
+
+    async def _fetch_curves(
+        self,
+        plans: dict[str, tuple[bool, date]],
+        today: date,
+        deadline: Deadline | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Fetch each contract's curves from its planned start, side by side.
+
+        At most CONTRACT_FETCH_CONCURRENCY requests are in flight, so an
+        account with many contracts does not open a burst of connections to
+        the portal. Every fetch is awaited before a failure is raised, so no
+        request is left running past the poll; an auth failure wins over the
+        others since it is the one that needs the user. ``deadline`` bounds
+        them all, so a slow portal cannot stretch the poll.
+        """
+        end = (today + timedelta(days=1)).isoformat()
+        semaphore = asyncio.Semaphore(CONTRACT_FETCH_CONCURRENCY)
+
+        async def fetch(contract_id: str, start: date) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self.client.get_curves(
+                    self._access_token,
+                    contract_id,
+                    start.isoformat(),
+                    end,
+                    granularity=self.granularity,
+                    deadline=deadline,
+                )
+
+        results = await asyncio.gather(
+            *(fetch(contract_id, start) for contract_id, (_full, start) in plans.items()),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise next((err for err in errors if isinstance(err, AuthError)), errors[0])
+        return dict(zip(plans, results))
+
+    # ---- Delta fetching ---------------------------------------------------
+    @staticmethod
+    def _fetch_plan(
+        contract: ContractState, now: datetime, today: date
+    ) -> tuple[bool, date]:
+        """Whether this poll fetches the contract's window whole, and from which day."""
+        if contract.full_fetch_due(now):
+            return True, today - timedelta(days=FETCH_DAYS)
+        return False, contract.delta_start(today)
+
+    async def _update_window(
+        self,
+        contract: ContractState,
+        raw: list[dict[str, Any]],
+        full: bool,
+        start: date,
+        today: date,
+    ) -> None:
+        """Parse a fetch starting at ``start`` and fold it into the contract's windows.
+
+        Each installation's points come out of the same parse as the totals;
+        an installation the fetch leaves out is folded as reporting nothing
+        from ``start`` on, as the totals are.
+        """
+        if full:
+            contract.clear()
+            contract.installations.clear()
+        oldest = today - timedelta(days=FETCH_DAYS)
+        hourly = self.granularity != GRANULARITY_DAILY
+        if hourly:
+            # 24x (or, for 15-minute curves, 96x) the points of a daily payload:
+            # too much to decode on the event loop.
+            parsed = await self.hass.async_add_executor_job(
+                partial(_parse_curves, raw, hourly=True)
+            )
+        else:
+            parsed = _parse_curves(raw, hourly=False)
+
+        def fold(held: SeriesWindow, curves: dict[str, list[Any]]) -> None:
+            if hourly:
+                daily = {
+                    curve_type: _daily_from_hourly(points)
+                    for curve_type, points in curves.items()
+                }
+                held.fold(daily, curves, start, oldest)
+            else:
+                held.fold(curves, None, start, oldest)
+
+        self.timings.count_points(
+            sum(
+                len(points)
+                for curves in (parsed.total, *parsed.installations.values())
+                for points in curves.values()
+            )
         )
+        fold(contract, parsed.total)
+        for installation_id, curves in parsed.installations.items():
+            fold(contract.installation(installation_id), curves)
+        for installation_id, held in contract.installations.items():
+            if installation_id not in parsed.installations:
+                fold(held, {curve_type: [] for curve_type in _CURVE_TYPES})
 
     # ---- Statistics -------------------------------------------------------
     async def _insert_statistics(
-        self, stat_id: str, name_suffix: str, series: list[DailyPoint]
+        self,
+        stat_id: str,
+        name_suffix: str,
+        series: DailySeries | list[DailyPoint] | list[HourlyPoint],
     ) -> None:
-        """Upsert the fetched window as daily cumulative-sum statistics.
+        """Upsert one statistic's window; see ``_insert_statistics_batch``."""
+        await self._insert_statistics_batch([(stat_id, name_suffix, series)])
+
+    async def _insert_statistics_batch(
+        self,
+        windows: list[tuple[str, str, DailySeries | list[DailyPoint] | list[HourlyPoint]]],
+    ) -> None:
+        """Upsert each ``(stat_id, name_suffix, series)`` window as cumulative-sum statistics.
 
         The portal syncs once a day, so a recent day is published with a partial
         value and is completed by a later sync. Days already written must
         therefore be re-sent with their corrected value, not skipped: external
         statistics are keyed on (statistic_id, start), so re-sending a day
         updates its row in place. The cumulative sum is rebuilt from the sum
-        stored just before the window so the rewritten rows stay continuous
-        with the older history.
+        stored just before the rows sent so they stay continuous with the
+        older history.
 
         Note that re-sending only ever adds or updates rows — the recorder
         never deletes the ones we leave out — which is why the points are gap
         filled rather than skipped.
+
+        Only the rows from the first one that differs from the last write are
+        sent: a row's sum depends on nothing after it, so the rows before the
+        change already hold what a full rewrite would give them.
+
+        The windows go together: every baseline the cache cannot answer is
+        read in one recorder job, and the rows of every statistic are queued
+        back to back so the recorder commits them together.
+
+        A plain ``list[DailyPoint]`` is accepted too and packed into a series.
         """
-        if not series:
-            return
-        points_for = _fill_gaps(series)
-        if self._written.get(stat_id) == points_for:
-            # The portal publishes once a day but we poll every 20 minutes;
-            # re-sending an unchanged window would be ~60 recorder writes an
-            # hour for nothing, which is real wear on an SD-card install.
+        await self._async_load_stats()
+        with self.timings.stage("baselines"):
+            await self._async_check_stored(stat_id for stat_id, _name, _s in windows)
+        # stat_id -> (name_suffix, the whole filled window, the rows to send)
+        pending: dict[
+            str,
+            tuple[str, DailySeries | list[HourlyPoint], DailySeries | list[HourlyPoint]],
+        ] = {}
+        starts: dict[str, datetime] = {}
+        for stat_id, name_suffix, series in windows:
+            if not series:
+                continue
+            if isinstance(series, list) and isinstance(series[0], DailyPoint):
+                series = DailySeries.from_points(series)
+            if isinstance(series, DailySeries):
+                points_for: DailySeries | list[HourlyPoint] = series.filled()
+            else:
+                points_for = _fill_hour_gaps(series)
+            written = self._written.get(stat_id)
+            if written is None and self._written_digests.get(stat_id) == _fingerprint(
+                points_for
+            ):
+                # Written before a restart or reload, exactly as it stands now.
+                self._written[stat_id] = points_for
+                self.timings.count_skipped()
+                continue
+            changed = _first_change(written, points_for)
+            if changed is None:
+                # The portal publishes once a day but we poll several times a day;
+                # re-sending an unchanged window would be recorder writes for
+                # nothing, which is real wear on an SD-card install.
+                self.timings.count_skipped()
+                continue
+            # Once a day settles, that is one or two rows instead of the window.
+            to_write = points_for[changed:]
+            pending[stat_id] = (name_suffix, points_for, to_write)
+            if isinstance(to_write, DailySeries):
+                starts[stat_id] = _day_start(to_write.first_day)
+            else:
+                starts[stat_id] = to_write[0].start
+        if not pending:
             return
 
-        window_start = _day_start(points_for[0].day)
-        running = await self._sum_before(stat_id, window_start)
-        if running is None:
-            return  # already logged; writing now would corrupt the history
+        with self.timings.stage("baselines"):
+            baselines = await self._sums_before(starts)
+        with self.timings.stage("statistics"):
+            for stat_id, (name_suffix, points_for, to_write) in pending.items():
+                running = baselines[stat_id]
+                if running is None:
+                    continue  # already logged; writing now would corrupt the history
+                self._write_statistics(stat_id, name_suffix, to_write, running)
+                self.timings.count_rows(len(to_write))
+                self._written[stat_id] = points_for
+                # Goes to disk with the save the write above scheduled.
+                self._written_digests[stat_id] = _fingerprint(points_for)
 
+    def _write_statistics(
+        self,
+        stat_id: str,
+        name_suffix: str,
+        points: DailySeries | list[HourlyPoint],
+        running: float,
+    ) -> float:
+        """Send gap-filled ``points`` as rows continuing from ``running``.
+
+        Returns the cumulative sum of the last row, for a caller writing the
+        range that follows.
+        """
         metadata = StatisticMetaData(
             has_mean=False,
             has_sum=True,
@@ -318,19 +1086,26 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
             statistic_id=stat_id,
             unit_of_measurement=UNIT_KWH,
         )
-        points: list[StatisticData] = []
-        for point in points_for:
-            running += point.value
-            points.append(
-                StatisticData(
-                    start=_day_start(point.day), state=point.value, sum=running
-                )
-            )
-        async_add_external_statistics(self.hass, metadata, points)
-        self._written[stat_id] = points_for
+        rows = _statistic_rows(points, running)
+        async_add_external_statistics(self.hass, metadata, rows)
+        if isinstance(points, DailySeries):
+            following = _midnight(points.start + len(points))
+        else:
+            following = points[-1].start + timedelta(hours=1)
+        self._remember_baselines(stat_id, rows, running, following)
+        return rows[-1]["sum"] if rows else running
 
     async def _sum_before(self, stat_id: str, window_start: datetime) -> float | None:
-        """Return the cumulative sum stored for the last day before the window.
+        """Return the cumulative sum stored for the last row before the window.
+
+        One statistic's ``_sums_before``.
+        """
+        return (await self._sums_before({stat_id: window_start}))[stat_id]
+
+    async def _sums_before(
+        self, window_starts: dict[str, datetime]
+    ) -> dict[str, float | None]:
+        """Return, per statistic id, the sum stored for the last row before its window.
 
         0.0 means this statistic has no history at all before the window — a
         fresh install, or one whose history starts inside it — so the window
@@ -338,42 +1113,234 @@ class RomandeEnergieCoordinator(DataUpdateCoordinator[RomandeEnergieData]):
         running total could not be read: the caller must then write nothing,
         because restarting from zero would rewrite the window far below the
         history it continues and read as a meter reset on the Energy dashboard.
+
+        A window starting on a row we wrote ourselves is answered from
+        ``_baselines``; the rest are read in a single recorder job.
+        """
+        await self._async_load_stats()
+        await self._async_check_stored(window_starts)
+        sums: dict[str, float | None] = {}
+        misses: dict[str, datetime] = {}
+        for stat_id, window_start in window_starts.items():
+            cached = self._baselines.get(stat_id, {}).get(int(window_start.timestamp()))
+            if cached is None:
+                misses[stat_id] = window_start
+            else:
+                sums[stat_id] = cached
+        if not misses:
+            return sums
+        rows = await get_instance(self.hass).async_add_executor_job(
+            self._rows_before, misses
+        )
+        for stat_id, window_start in misses.items():
+            row = rows[stat_id]
+            if row is None:
+                sums[stat_id] = 0.0
+            elif row.get("sum") is None:
+                _LOGGER.warning(
+                    "Last stored %s statistic before %s carries no sum; skipping the "
+                    "write rather than restarting the total from zero",
+                    stat_id,
+                    window_start.date(),
+                )
+                sums[stat_id] = None
+            else:
+                sums[stat_id] = float(row["sum"])
+        return sums
+
+    async def _async_check_stored(self, stat_ids: Iterable[str]) -> None:
+        """Check the bookkeeping loaded from disk against the recorder, once.
+
+        It held when it was saved, but the recorder may have moved on since: a
+        statistic adjusted or deleted, the database reset or restored from a
+        backup. The newest stored row must still be the last one we wrote,
+        with the sum we gave it; a statistic whose row is not is forgotten, so
+        its baselines are read from the recorder and its window written again.
+        """
+        to_check = self._unchecked.intersection(stat_ids)
+        if not to_check:
+            return
+        self._unchecked -= to_check
+        newest = await get_instance(self.hass).async_add_executor_job(
+            self._newest_rows, to_check
+        )
+        for stat_id in to_check:
+            row = newest[stat_id]
+            baselines = self._baselines.get(stat_id)
+            if baselines:
+                # Keyed on the row after the last one written, whose sum it holds.
+                following = max(baselines)
+                consistent = (
+                    row is not None
+                    and row["start"] < following
+                    and row.get("sum") is not None
+                    and abs(row["sum"] - baselines[following]) < 1e-6
+                )
+            else:
+                consistent = row is not None
+            if not consistent:
+                _LOGGER.info(
+                    "Stored %s statistics changed since the last write; reading "
+                    "their baselines from the recorder again",
+                    stat_id,
+                )
+                self._forget_statistic(stat_id)
+
+    def _newest_rows(self, stat_ids: set[str]) -> dict[str, StatisticsRow | None]:
+        """The newest stored row per statistic id. Runs in the recorder's executor."""
+        newest: dict[str, StatisticsRow | None] = {}
+        for stat_id in stat_ids:
+            rows = get_last_statistics(self.hass, 1, stat_id, False, {"sum"})
+            newest[stat_id] = rows[stat_id][0] if rows.get(stat_id) else None
+        return newest
+
+    def _rows_before(
+        self, window_starts: dict[str, datetime]
+    ) -> dict[str, StatisticsRow | None]:
+        """Find the newest stored row before each window. Runs in the recorder's executor.
+
+        The day before each window answers this on every normal miss, and one
+        query covers those days for every statistic id. The wider lookup is
+        only reached when that day is missing (an outage, a purge).
         """
-        # The day before the window answers this on every normal poll; the wide
-        # query is only reached when that day is missing (an outage, a purge).
-        probe = await self._stored_sums(stat_id, window_start - timedelta(days=1), window_start)
-        stored = probe or await self._stored_sums(stat_id, EPOCH, window_start)
-        if not stored:
-            return 0.0
-        last_sum = stored[-1].get("sum")
-        if last_sum is None:
-            _LOGGER.warning(
-                "Last stored %s statistic before %s carries no sum; skipping the "
-                "write rather than restarting the total from zero",
-                stat_id,
-                window_start.date(),
+        first = min(window_starts.values()) - timedelta(days=1)
+        probed = self._stored_sums(
+            set(window_starts), first, max(window_starts.values())
+        )
+        found: dict[str, StatisticsRow | None] = {}
+        for stat_id, window_start in window_starts.items():
+            lo = (window_start - timedelta(days=1)).timestamp()
+            hi = window_start.timestamp()
+            before = [row for row in probed.get(stat_id, []) if lo <= row["start"] < hi]
+            found[stat_id] = (
+                before[-1] if before else self._last_row_before(stat_id, window_start)
             )
+        return found
+
+    def _last_row_before(
+        self, stat_id: str, window_start: datetime
+    ) -> StatisticsRow | None:
+        """Return the newest stored row before ``window_start``, if any.
+
+        The newest row of the statistic overall is one indexed lookup and,
+        after an outage, is the one wanted. Only when rows exist inside the
+        window (so history has a hole right before it) does this search back,
+        over spans growing fourfold, instead of reading the whole history.
+        """
+        rows = get_last_statistics(self.hass, 1, stat_id, False, {"sum"}).get(stat_id)
+        if not rows:
             return None
-        return float(last_sum)
+        if rows[0]["start"] < window_start.timestamp():
+            return rows[0]
+        end, span = window_start - timedelta(days=1), BASELINE_SEARCH_SPAN
+        while end > EPOCH:
+            begin = max(EPOCH, end - span)
+            older = self._stored_sums({stat_id}, begin, end).get(stat_id)
+            if older:
+                return older[-1]
+            end, span = begin, span * 4
+        return None
 
-    async def _stored_sums(
-        self, stat_id: str, start: datetime, end: datetime
-    ) -> list[StatisticsRow]:
-        """Return the stored rows for ``stat_id`` in [start, end), oldest first."""
-        rows = await get_instance(self.hass).async_add_executor_job(
-            partial(
-                statistics_during_period,
-                self.hass,
-                start,
-                end,
-                statistic_ids={stat_id},
-                # "hour" is the only safe period here. It returns our daily rows
-                # unaggregated, and — unlike "day"/"week"/"month" — it leaves
-                # end_time alone: those realign it forward, which would pull the
-                # window's own first row into its baseline and inflate the sum.
-                period="hour",
-                units=None,
-                types={"sum"},
-            )
+    def _stored_sums(
+        self, stat_ids: set[str], start: datetime, end: datetime
+    ) -> dict[str, list[StatisticsRow]]:
+        """Return the stored rows per statistic id in [start, end), oldest first."""
+        return statistics_during_period(
+            self.hass,
+            start,
+            end,
+            statistic_ids=stat_ids,
+            # "hour" is the only safe period here. It returns our daily rows
+            # unaggregated, and — unlike "day"/"week"/"month" — it leaves
+            # end_time alone: those realign it forward, which would pull the
+            # window's own first row into its baseline and inflate the sum.
+            period="hour",
+            units=None,
+            types={"sum"},
+        )
+
+    # ---- Statistics bookkeeping -------------------------------------------
+    async def _async_load_stats(self) -> None:
+        """Load the persisted baselines, written fingerprints and publish times, once."""
+        if self._stats_loaded:
+            return
+        self._stats_loaded = True
+        stored = await self._stats_store.async_load() or {}
+        self._unchecked = {*stored.get("baselines", {}), *stored.get("written", {})}
+        self._written_digests = {
+            **stored.get("written", {}),
+            **self._written_digests,
+        }
+        for stat_id, baselines in stored.get("baselines", {}).items():
+            loaded = {int(start): float(total) for start, total in baselines.items()}
+            # Anything written since start-up is newer than what was on disk.
+            self._baselines[stat_id] = {**loaded, **self._baselines.get(stat_id, {})}
+        for contract_id, observed in stored.get("publish", {}).items():
+            if contract_id in self.contracts:
+                self.contracts[contract_id].publish.load(observed)
+
+    def _remember_baselines(
+        self,
+        stat_id: str,
+        rows: list[StatisticData],
+        running: float,
+        following: datetime,
+    ) -> None:
+        """Note the sum a window starting on each written row continues from.
+
+        The rows just sent are what the recorder now holds, so the next window
+        — or changed suffix of it — finds its baseline here, as does one
+        starting on ``following``, the row after the last one. What was noted
+        for the rows from the first one sent on is replaced, since those rows
+        may have been rewritten on a different baseline; older entries stay
+        for FETCH_DAYS, as far back as a window reaches.
+        """
+        if not rows:
+            return
+        first = int(rows[0]["start"].timestamp())
+        oldest = int((rows[0]["start"] - timedelta(days=FETCH_DAYS)).timestamp())
+        baselines = {
+            start: before
+            for start, before in self._baselines.get(stat_id, {}).items()
+            if oldest <= start < first
+        }
+        befores = [running, *(row["sum"] for row in rows)]
+        starts = [*(row["start"] for row in rows), following]
+        baselines.update(
+            (int(start.timestamp()), before) for start, before in zip(starts, befores)
         )
-        return rows.get(stat_id) or []
+        self._baselines[stat_id] = baselines
+        self._stats_store.async_delay_save(self._stats_data, STATS_SAVE_DELAY)
+
+    def _forget_statistics(self) -> None:
+        """Drop what is known of the stored rows, after history was rewritten.
+
+        The window the poll last wrote now sits on a different baseline, so it
+        has to be written again, and no cached baseline can be trusted.
+        """
+        self._written.clear()
+        self._written_digests.clear()
+        self._baselines.clear()
+        self._stats_store.async_delay_save(self._stats_data, STATS_SAVE_DELAY)
+
+    def _forget_statistic(self, stat_id: str) -> None:
+        """``_forget_statistics`` for one statistic whose stored rows changed."""
+        self._written.pop(stat_id, None)
+        self._written_digests.pop(stat_id, None)
+        self._baselines.pop(stat_id, None)
+        self._stats_store.async_delay_save(self._stats_data, STATS_SAVE_DELAY)
+
+    def _stats_data(self) -> dict[str, Any]:
+        """The statistics bookkeeping, and the publish times, as saved to disk."""
+        return {
+            "baselines": {
+                stat_id: {str(start): total for start, total in baselines.items()}
+                for stat_id, baselines in self._baselines.items()
+            },
+            "written": self._written_digests,
+            "publish": {
+                contract_id: contract.publish.as_list()
+                for contract_id, contract in self.contracts.items()
+                if contract.publish.observed
+            },
+        }
@@ -0,0 +1,92 @@
+"""Diagnostics for the Romande Énergie integration.
+
+What the download holds, beyond the entry itself: the last POLL_HISTORY polls
+(stage latencies, HTTP statuses, bytes, what was parsed, skipped and written),
+the recent token rotations, how the portal's endpoints have been answering
+(latency, request phases, circuit breakers), the shared request scheduler and
+each contract's publish model. Credentials and tokens are redacted.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ACCOUNT_ID,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+    DOMAIN,
+    TZ,
+)
+from .coordinator import RomandeEnergieCoordinator
+from .scheduler import get_scheduler
+from .timings import STAGES, milliseconds
+
+TO_REDACT = {CONF_ACCOUNT_ID, CONF_PASSWORD, CONF_REFRESH_TOKEN, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: RomandeEnergieCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    timings = coordinator.timings
+    now = datetime.now(tz=TZ)
+    expires_in = None
+    if coordinator._access_token:
+        expires_in = round(coordinator._token_exp - now.timestamp())
+    interval = coordinator.update_interval
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "session": {
+            "access_token_expires_in": expires_in,
+            "keepalive_active": coordinator._keepalive_active,
+            "update_interval": interval.total_seconds() if interval else None,
+            "rotations": list(timings.rotations),
+        },
+        "polls": {
+            "stages": {
+                stage: {
+                    "last_ms": milliseconds(timings.last_duration(stage)),
+                    "p95_ms": milliseconds(timings.percentile(stage)),
+                }
+                for stage in STAGES
+            },
+            "history": [record.as_dict() for record in timings.history],
+        },
+        "requests": {
+            "latency": {
+                endpoint: {
+                    "p95_ms": milliseconds(tracker.percentile(0.95)),
+                    "timeout": tracker.timeout(),
+                }
+                for endpoint, tracker in client.latency.items()
+            },
+            "phases": client.request_timings(),
+            "breakers": client.breakers(),
+            "received_bytes": client.received_bytes(),
+            "statuses": dict(client.statuses()),
+        },
+        "scheduler": asdict(get_scheduler(hass).stats()),
+        "publish": {
+            contract_id: {
+                "observed": contract.publish.as_list(),
+                "window": [
+                    moment.isoformat()
+                    for moment in contract.publish.window(now.date()) or ()
+                ],
+                "next_poll": contract.publish.next_poll(now).total_seconds(),
+            }
+            for contract_id, contract in coordinator.contracts.items()
+        },
+    }
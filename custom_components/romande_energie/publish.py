@@ -0,0 +1,119 @@
+"""When the portal publishes a contract's curves, learnt from the polls.
+
+The portal syncs each meter once a day, at a time of day that holds fairly
+steady per contract. Polling around the clock for a change that lands at one
+point of it is mostly wasted requests, so the coordinator notes when a poll
+first sees a day's values move and polls around that time of day instead.
+
+The model keeps the local time of the first change seen on each of the last
+PUBLISH_HISTORY_DAYS days. The expected publish window is the span those times
+cover, widened by PUBLISH_WINDOW_LEAD on either side. A change is only seen
+when a poll runs, so the times are upper bounds of the real ones; polling from
+the start of the window lets a portal that publishes earlier pull it forward.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from .const import (
+    ADAPTIVE_MAX_INTERVAL,
+    PUBLISH_HISTORY_DAYS,
+    PUBLISH_MIN_OBSERVATIONS,
+    PUBLISH_POLL_INTERVAL,
+    PUBLISH_WINDOW_LEAD,
+    TZ,
+    UPDATE_INTERVAL,
+)
+
+# Shortest wait the model ever asks for, so a window opening in a moment
+# does not schedule a poll for right now over and over.
+_MIN_DELAY = timedelta(minutes=1)
+
+
+class PublishModel:
+    """The publish times seen for one contract, and the polling they call for."""
+
+    def __init__(self) -> None:
+        # Local time of the first change seen, one per day, oldest first.
+        self.observed: list[datetime] = []
+
+    def observe(self, when: datetime) -> bool:
+        """Note a change seen at ``when``; only a day's first one counts.
+
+        Returns whether it was noted, so the caller knows to save the model.
+        """
+        when = when.astimezone(TZ)
+        if self.observed and self.observed[-1].date() >= when.date():
+            return False
+        self.observed.append(when)
+        oldest = when.date() - timedelta(days=PUBLISH_HISTORY_DAYS)
+        self.observed = [seen for seen in self.observed if seen.date() > oldest]
+        return True
+
+    def settled(self, today: date) -> bool:
+        """Whether today's publication has been seen already."""
+        return bool(self.observed) and self.observed[-1].date() == today
+
+    def window(self, day: date) -> tuple[datetime, datetime] | None:
+        """The span of ``day`` the portal is expected to publish in.
+
+        ``None`` until PUBLISH_MIN_OBSERVATIONS days have been seen: too few
+        to go by, so the caller keeps to the fixed interval.
+        """
+        if len(self.observed) < PUBLISH_MIN_OBSERVATIONS:
+            return None
+        minutes = [seen.hour * 60 + seen.minute for seen in self.observed]
+
+        def at(minute: int) -> datetime:
+            # Wall-clock time, so the window keeps its hour across DST changes.
+            return datetime(
+                day.year, day.month, day.day, minute // 60, minute % 60, tzinfo=TZ
+            )
+
+        return (
+            at(min(minutes)) - PUBLISH_WINDOW_LEAD,
+            at(max(minutes)) + PUBLISH_WINDOW_LEAD,
+        )
+
+    def next_poll(self, now: datetime) -> timedelta:
+        """How long to wait before polling this contract again.
+
+        Every PUBLISH_POLL_INTERVAL inside the expected window; until the
+        window opens before it; once today's values have been seen, until
+        tomorrow's window, which may open before midnight. A publication running late past the window is
+        waited for on UPDATE_INTERVAL. No wait exceeds ADAPTIVE_MAX_INTERVAL,
+        which keeps the periodic whole-window fetch picking up late
+        corrections to older days.
+        """
+        now = now.astimezone(TZ)
+        today = now.date()
+        window = self.window(today)
+        if window is None:
+            return UPDATE_INTERVAL
+        start, end = window
+        if self.settled(today):
+            target = self.window(today + timedelta(days=1))[0]  # type: ignore[index]
+            if target <= now:
+                # A portal publishing just after midnight: tomorrow's window
+                # opens before today ends, and has opened.
+                return PUBLISH_POLL_INTERVAL
+        elif now < start:
+            target = start
+        elif now <= end:
+            return PUBLISH_POLL_INTERVAL
+        else:
+            return UPDATE_INTERVAL
+        return min(max(target - now, _MIN_DELAY), ADAPTIVE_MAX_INTERVAL)
+
+    # ---- Storage ----------------------------------------------------------
+    def as_list(self) -> list[str]:
+        """The observations as saved to disk."""
+        return [seen.isoformat() for seen in self.observed]
+
+    def load(self, stored: list[str]) -> None:
+        """Take the saved observations, keeping any made since start-up."""
+        loaded = [datetime.fromisoformat(seen).astimezone(TZ) for seen in stored]
+        days = {seen.date() for seen in self.observed}
+        self.observed = sorted(
+            [seen for seen in loaded if seen.date() not in days] + self.observed
+        )
@@ -0,0 +1,106 @@
+"""Portal requests of every config entry, paced together.
+
+Each entry runs its own coordinator, and after a restart they all set up in
+the same second; left alone, a household with several accounts (or an
+installer running dozens) sends the portal one burst per poll. One
+``RequestScheduler`` per Home Assistant instance is shared by the API clients
+of every entry: at most FLEET_CONCURRENCY requests are in flight at once, and
+each entry's polls are shifted by a fixed offset derived from its entry id, so
+entries that started together drift apart instead of polling in lockstep.
+
+The scheduler counts what it does — requests queued, in flight, and how long
+they waited for a slot — so the pacing can be checked rather than guessed.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .const import DOMAIN, FLEET_CONCURRENCY, POLL_JITTER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    """What the scheduler has done so far. Waits are in seconds."""
+
+    queue_depth: int
+    in_flight: int
+    requests: int
+    last_wait: float
+    max_wait: float
+    mean_wait: float
+
+
+class RequestScheduler:
+    """A global cap on portal requests, plus each entry's poll offset."""
+
+    def __init__(self, limit: int = FLEET_CONCURRENCY) -> None:
+        self._slots = asyncio.Semaphore(limit)
+        self._queued = 0
+        self._in_flight = 0
+        self._requests = 0
+        self._last_wait = 0.0
+        self._max_wait = 0.0
+        self._total_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the request slots for the body of the ``async with``."""
+        queued_at = time.monotonic()
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        wait = time.monotonic() - queued_at
+        self._requests += 1
+        self._last_wait = wait
+        self._max_wait = max(self._max_wait, wait)
+        self._total_wait += wait
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    @staticmethod
+    def jitter(key: str) -> timedelta:
+        """A fixed offset in ``[0, POLL_JITTER)`` for ``key`` (an entry id).
+
+        Derived from a hash rather than drawn at random, so an entry keeps its
+        place in the stagger across restarts and reloads.
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        fraction = int.from_bytes(digest, "big") / 2**64
+        return timedelta(seconds=int(POLL_JITTER.total_seconds() * fraction))
+
+    def stats(self) -> SchedulerStats:
+        """The current queue and the waits seen so far."""
+        return SchedulerStats(
+            queue_depth=self._queued,
+            in_flight=self._in_flight,
+            requests=self._requests,
+            last_wait=self._last_wait,
+            max_wait=self._max_wait,
+            mean_wait=self._total_wait / self._requests if self._requests else 0.0,
+        )
+
+
+def get_scheduler(hass: HomeAssistant) -> RequestScheduler:
+    """The scheduler shared by every entry, created on first use."""
+    scheduler: RequestScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = RequestScheduler()
+    return scheduler
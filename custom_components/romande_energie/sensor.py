@@ -1,4 +1,4 @@
-"""Romande Énergie energy sensors."""
+"""Romande Énergie energy sensors, plus diagnostic sensors timing the polls."""
 from __future__ import annotations
 
 from collections.abc import Callable
@@ -11,7 +11,12 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -19,6 +24,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import RomandeEnergieCoordinator, RomandeEnergieData
+from .timings import STAGES, PollTimings, milliseconds
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -73,6 +79,82 @@ DESCRIPTIONS: tuple[RomandeEnergieSensorEntityDescription, ...] = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class RomandeEnergiePollSensorEntityDescription(SensorEntityDescription):
+    """Describe a diagnostic sensor reading the coordinator's poll timings."""
+
+    value_fn: Callable[[PollTimings], float | int | None]
+
+
+def _stage_descriptions(
+    stage: str,
+) -> tuple[RomandeEnergiePollSensorEntityDescription, ...]:
+    """The last and p95 duration sensors of one poll stage.
+
+    Only the whole poll's are enabled by default; the per-stage ones are there
+    to enable when a poll turns slow.
+    """
+    common = {
+        "device_class": SensorDeviceClass.DURATION,
+        "native_unit_of_measurement": UnitOfTime.MILLISECONDS,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "entity_registry_enabled_default": stage == "total",
+    }
+    return (
+        RomandeEnergiePollSensorEntityDescription(
+            key=f"poll_{stage}_last",
+            name=f"Poll {stage} (last)",
+            value_fn=lambda t: milliseconds(t.last_duration(stage)),
+            **common,
+        ),
+        RomandeEnergiePollSensorEntityDescription(
+            key=f"poll_{stage}_p95",
+            name=f"Poll {stage} (p95)",
+            value_fn=lambda t: milliseconds(t.percentile(stage)),
+            **common,
+        ),
+    )
+
+
+# Diagnostic sensors: no state_class either, so they stay out of the long-term
+# statistics — they are for spotting a regression, not for keeping.
+POLL_DESCRIPTIONS: tuple[RomandeEnergiePollSensorEntityDescription, ...] = (
+    *(description for stage in STAGES for description in _stage_descriptions(stage)),
+    RomandeEnergiePollSensorEntityDescription(
+        key="poll_payload_bytes",
+        name="Poll payload",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda t: t.last.payload_bytes if t.last else None,
+    ),
+    RomandeEnergiePollSensorEntityDescription(
+        key="poll_rows_written",
+        name="Poll statistics rows written",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda t: t.last.rows_written if t.last else None,
+    ),
+)
+
+
+def _device_info(coordinator: RomandeEnergieCoordinator, contract_id: str) -> DeviceInfo:
+    """The device of one contract of the entry.
+
+    The entry's own contract keeps the plain name it always had; the others
+    carry their id to tell them apart.
+    """
+    name = "Romande Énergie"
+    if contract_id != coordinator.contract_id:
+        name = f"Romande Énergie ({contract_id})"
+    return DeviceInfo(
+        identifiers={(DOMAIN, contract_id)},
+        name=name,
+        manufacturer="Romande Énergie",
+        model="Espace client",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -81,19 +163,37 @@ async def async_setup_entry(
     """Set up the sensors from a config entry."""
     coordinator: RomandeEnergieCoordinator = hass.data[DOMAIN][entry.entry_id]
     # First refresh already ran, so coordinator.data is populated.
-    has_surplus = bool(coordinator.data and coordinator.data.has_surplus)
-    entities = [
-        RomandeEnergieSensor(coordinator, description)
-        for description in DESCRIPTIONS
-        if has_surplus or not description.surplus
-    ]
+    entities: list[SensorEntity] = []
+    for contract_id in coordinator.contracts:
+        data = (coordinator.data or {}).get(contract_id)
+        # The household totals, then each installation of a contract that
+        # has several.
+        readings: list[tuple[str | None, RomandeEnergieData | None]] = [(None, data)]
+        if data is not None:
+            readings.extend(data.installations.items())
+        for installation_id, reading in readings:
+            has_surplus = bool(reading and reading.has_surplus)
+            entities.extend(
+                RomandeEnergieSensor(coordinator, contract_id, description, installation_id)
+                for description in DESCRIPTIONS
+                if has_surplus or not description.surplus
+            )
+    # The polls are the entry's, so their sensors sit on its own contract's device.
+    entities.extend(
+        RomandeEnergiePollSensor(coordinator, description)
+        for description in POLL_DESCRIPTIONS
+    )
     async_add_entities(entities)
 
 
 class RomandeEnergieSensor(
     CoordinatorEntity[RomandeEnergieCoordinator], SensorEntity
 ):
-    """A single Romande Énergie energy sensor."""
+    """A single Romande Énergie energy sensor, for one contract of the entry.
+
+    With an ``installation_id`` it reads that installation of the contract
+    rather than the household total, on the same device.
+    """
 
     _attr_has_entity_name = True
     entity_description: RomandeEnergieSensorEntityDescription
@@ -101,25 +201,39 @@ class RomandeEnergieSensor(
     def __init__(
         self,
         coordinator: RomandeEnergieCoordinator,
+        contract_id: str,
         description: RomandeEnergieSensorEntityDescription,
+        installation_id: str | None = None,
     ) -> None:
         super().__init__(coordinator)
+        self.contract_id = contract_id
+        self.installation_id = installation_id
         self.entity_description = description
-        self._attr_unique_id = f"{DOMAIN}_{coordinator.contract_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.contract_id)},
-            name="Romande Énergie",
-            manufacturer="Romande Énergie",
-            model="Espace client",
-            entry_type=DeviceEntryType.SERVICE,
-        )
+        if installation_id is None:
+            self._attr_unique_id = f"{DOMAIN}_{contract_id}_{description.key}"
+        else:
+            self._attr_unique_id = (
+                f"{DOMAIN}_{contract_id}_{installation_id}_{description.key}"
+            )
+            self._attr_name = f"{description.name} {installation_id}"
+        # One device per contract.
+        self._attr_device_info = _device_info(coordinator, contract_id)
+
+    @property
+    def _data(self) -> RomandeEnergieData | None:
+        """This sensor's snapshot, None before the first poll."""
+        data = (self.coordinator.data or {}).get(self.contract_id)
+        if data is None or self.installation_id is None:
+            return data
+        return data.installations.get(self.installation_id)
 
     @property
     def native_value(self) -> float | None:
         """Return the current value from the coordinator data."""
-        if self.coordinator.data is None:
+        data = self._data
+        if data is None:
             return None
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(data)
 
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
@@ -129,8 +243,40 @@ class RomandeEnergieSensor(
         sensors state it rather than leaving it implied.
         """
         day_fn = self.entity_description.day_fn
-        data = self.coordinator.data
+        data = self._data
         if day_fn is None or data is None:
             return None
         day = day_fn(data)
         return {"measurement_day": day.isoformat()} if day else None
+
+
+class RomandeEnergiePollSensor(
+    CoordinatorEntity[RomandeEnergieCoordinator], SensorEntity
+):
+    """A diagnostic sensor on how the entry's polls have been going.
+
+    It stays available while polls fail: how long a failing poll took is
+    exactly what it is there to show.
+    """
+
+    _attr_has_entity_name = True
+    entity_description: RomandeEnergiePollSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: RomandeEnergieCoordinator,
+        description: RomandeEnergiePollSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.contract_id}_{description.key}"
+        self._attr_device_info = _device_info(coordinator, coordinator.contract_id)
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the figure from the coordinator's poll timings."""
+        return self.entity_description.value_fn(self.coordinator.timings)
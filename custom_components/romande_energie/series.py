@@ -0,0 +1,250 @@
+"""Columnar daily series for the Romande Énergie curves.
+
+A ``list[DailyPoint]`` costs a tuple, a ``date`` and a ``float`` object per
+day, and every gap fill or month filter builds a fresh list of them. Years of
+backfilled history make that add up. ``DailySeries`` holds the same data as
+the proleptic ordinal of its first day plus one ``array('d')`` slot per day,
+so a day's position is plain arithmetic: finding a month, slicing a range or
+widening the span never touches the days outside it.
+
+A day without a value is held as NaN. The ends of a series always carry a
+value, so ``last_day`` is the newest day the portal has published, exactly as
+the last entry of a parsed ``list[DailyPoint]`` is.
+
+Iterating a series yields ``DailyPoint``s for the days holding a value, so it
+drops in wherever a day-sorted ``list[DailyPoint]`` was read.
+
+Gap filling and running totals go through NumPy when it is installed (Home
+Assistant ships it, but it is no requirement of this integration) and fall
+back to the standard library otherwise; both give the same floats.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import date
+from itertools import accumulate
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised by forcing ``np = None``
+    np = None
+
+from .api import DailyPoint
+
+_NAN = math.nan
+
+
+def running_totals(values: array, initial: float = 0.0) -> array:
+    """Running sums of ``values`` continuing from ``initial``, one per value.
+
+    The additions happen strictly in order on both paths — NumPy's
+    ``cumsum`` is sequential, not pairwise — so the totals match a running
+    sum kept by hand to the last bit.
+    """
+    if np is not None and values:
+        totals = np.empty(len(values) + 1)
+        totals[0] = initial
+        totals[1:] = np.frombuffer(values, dtype=np.float64)
+        return array("d", np.cumsum(totals)[1:].tobytes())
+    totals = array("d", accumulate(values, initial=initial))
+    del totals[0]
+    return totals
+
+
+def _month_bounds(ref: date) -> tuple[int, int]:
+    """Ordinals of the first day of ref's month and of the month after it."""
+    first = date(ref.year, ref.month, 1)
+    if ref.month == 12:
+        stop = date(ref.year + 1, 1, 1)
+    else:
+        stop = date(ref.year, ref.month + 1, 1)
+    return first.toordinal(), stop.toordinal()
+
+
+class DailySeries:
+    """Daily values for a contiguous run of days, one float slot per day."""
+
+    __slots__ = ("start", "values")
+
+    def __init__(self, start: int = 0, values: array | None = None) -> None:
+        self.start = start  # date.toordinal() of the first day
+        self.values: array = array("d") if values is None else values
+
+    @classmethod
+    def from_points(cls, points: Iterable[tuple[date, float]]) -> DailySeries:
+        """Build a series from ``(day, value)`` pairs in any order.
+
+        ``DailyPoint``s are such pairs. Days left out become gaps; a day given
+        twice keeps its last value.
+        """
+        by_ordinal = {day.toordinal(): value for day, value in points}
+        if not by_ordinal:
+            return cls()
+        start = min(by_ordinal)
+        values = array("d", [_NAN]) * (max(by_ordinal) - start + 1)
+        for ordinal, value in by_ordinal.items():
+            values[ordinal - start] = value
+        return cls(start, values)
+
+    # ---- Shape ------------------------------------------------------------
+    def __len__(self) -> int:
+        """Number of days spanned, gaps included."""
+        return len(self.values)
+
+    def __bool__(self) -> bool:
+        return bool(self.values)
+
+    def __getitem__(self, index: slice) -> DailySeries:
+        """The days at positions ``index`` (a step-less slice), as a series.
+
+        Positional, like slicing a list; ``slice`` selects by day instead.
+        """
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("DailySeries only supports step-less slices")
+        first, stop, _step = index.indices(len(self.values))
+        if first >= stop:
+            return DailySeries()
+        return DailySeries(self.start + first, self.values[first:stop])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DailySeries):
+            return NotImplemented
+        # Compared as bytes: the gaps are NaN, which never equals itself.
+        return self.values.tobytes() == other.values.tobytes() and (
+            self.start == other.start or not self.values
+        )
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, like a list
+
+    def __repr__(self) -> str:
+        if not self.values:
+            return "DailySeries()"
+        return f"DailySeries({self.first_day}..{self.last_day}, {len(self)} days)"
+
+    @property
+    def first_day(self) -> date:
+        """The oldest day of the series. Raises IndexError when it is empty."""
+        if not self.values:
+            raise IndexError("empty DailySeries")
+        return date.fromordinal(self.start)
+
+    @property
+    def last_day(self) -> date:
+        """The newest day of the series. Raises IndexError when it is empty."""
+        if not self.values:
+            raise IndexError("empty DailySeries")
+        return date.fromordinal(self.start + len(self.values) - 1)
+
+    # ---- DailyPoint interop -----------------------------------------------
+    def __iter__(self) -> Iterator[DailyPoint]:
+        """Yield a ``DailyPoint`` per day holding a value, oldest first."""
+        fromordinal = date.fromordinal
+        for offset, value in enumerate(self.values, self.start):
+            if value == value:  # not NaN
+                yield DailyPoint(fromordinal(offset), value)
+
+    def days(self) -> Iterator[date]:
+        """Every day of the span, gaps included, lined up with ``values``."""
+        return map(date.fromordinal, range(self.start, self.start + len(self.values)))
+
+    def points(self) -> list[DailyPoint]:
+        """The days holding a value, as the day-sorted list the parser returns."""
+        return list(self)
+
+    def get(self, day: date) -> float | None:
+        """The value of ``day``, or None for a gap or a day outside the series."""
+        offset = day.toordinal() - self.start
+        if not 0 <= offset < len(self.values):
+            return None
+        value = self.values[offset]
+        return None if value != value else value
+
+    def latest(self) -> DailyPoint | None:
+        """The newest day and its value, or None for an empty series."""
+        if not self.values:
+            return None
+        return DailyPoint(self.last_day, self.values[-1])
+
+    # ---- Ranges -----------------------------------------------------------
+    def slice(self, first: date | None = None, last: date | None = None) -> DailySeries:
+        """The days from ``first`` to ``last`` inclusive, trimmed to their values.
+
+        Either bound may lie outside the series; the result never widens it.
+        """
+        lo = self.start if first is None else max(self.start, first.toordinal())
+        hi = len(self.values) + self.start
+        if last is not None:
+            hi = min(hi, last.toordinal() + 1)
+        return self._trimmed(lo, hi)
+
+    def _trimmed(self, lo: int, hi: int) -> DailySeries:
+        """The ordinals [lo, hi) without the gaps at either end."""
+        values = self.values
+        lo_i, hi_i = lo - self.start, hi - self.start
+        while lo_i < hi_i and values[lo_i] != values[lo_i]:
+            lo_i += 1
+        while hi_i > lo_i and values[hi_i - 1] != values[hi_i - 1]:
+            hi_i -= 1
+        if lo_i >= hi_i:
+            return DailySeries()
+        return DailySeries(self.start + lo_i, values[lo_i:hi_i])
+
+    def filled(self, first: date | None = None, last: date | None = None) -> DailySeries:
+        """One value per day from ``first`` to ``last``, 0.0 for the gaps.
+
+        Statistics rows have to stay contiguous. A day the portal has stopped
+        publishing (or has not published yet) would otherwise keep the sum an
+        earlier poll gave it while the days after it are rewritten without its
+        value, leaving the stored sums non-monotonic — which the Energy
+        dashboard reads as a meter reset. A zero written here is corrected by a
+        later poll once the portal publishes that day.
+
+        The bounds default to the series' own ends; unlike ``slice`` they widen
+        the span when they lie outside it, for writers that must meet an
+        adjoining range without a hole between them.
+        """
+        lo = self.start if first is None else first.toordinal()
+        hi = (
+            self.start + len(self.values)
+            if last is None
+            else last.toordinal() + 1
+        )
+        if hi <= lo:
+            return DailySeries()
+        out = array("d", bytes(8 * (hi - lo)))  # all 0.0
+        copy_lo = max(lo, self.start)
+        copy_hi = min(hi, self.start + len(self.values))
+        if copy_lo < copy_hi:
+            out[copy_lo - lo : copy_hi - lo] = self.values[
+                copy_lo - self.start : copy_hi - self.start
+            ]
+        if np is not None:
+            view = np.frombuffer(out, dtype=np.float64)
+            view[np.isnan(view)] = 0.0
+        else:
+            for offset in range(copy_lo - lo, copy_hi - lo):
+                if out[offset] != out[offset]:
+                    out[offset] = 0.0
+        return DailySeries(lo, out)
+
+    # ---- Aggregates -------------------------------------------------------
+    def month_total(self, ref: date) -> float | None:
+        """Sum of the values in ref's calendar month, None if it holds none.
+
+        The month is located by ordinal arithmetic, so only its own (at most
+        31) slots are read whatever the length of the series.
+        """
+        first, stop = _month_bounds(ref)
+        lo = max(first, self.start) - self.start
+        hi = min(stop, self.start + len(self.values)) - self.start
+        month = [value for value in self.values[lo:hi] if value == value] if lo < hi else []
+        return sum(month) if month else None
+
+    def cumsum(self, initial: float = 0.0) -> array:
+        """Running totals continuing from ``initial``, one per day.
+
+        Meant for a ``filled`` series: a gap would turn every later total NaN.
+        """
+        return running_totals(self.values, initial)
@@ -0,0 +1,192 @@
+"""Where a poll spends its time, stage by stage.
+
+A slow poll alone does not say which part of it was slow: rotating the
+session, the portal's answer, decoding it, or the recorder — reading the sums
+the new rows continue from, and queueing the rows themselves. The coordinator
+times each stage of every poll, and ``PollTimings`` keeps the durations of the
+last STAGE_SAMPLES polls per stage, together with how many bytes the portal
+sent and how many statistics rows the poll wrote. The diagnostic sensors read
+them from here.
+
+The last POLL_HISTORY polls are kept whole as well — stages, HTTP statuses,
+what was parsed and written, and the session's state when a poll had to
+rotate it — for the diagnostics download. Every history is a bounded deque, so
+the memory held stays the same however long Home Assistant runs.
+
+Stages:
+
+``token``
+    making sure the session holds a live access token (a no-op when the
+    keepalive rotated it already);
+``contracts``
+    discovering the account's contracts (only ever once per entry);
+``curves``
+    the curves requests, side by side;
+``parse``
+    decoding the answers and folding them into the contracts' windows;
+``baselines``
+    reading the sums stored before the rows to write;
+``statistics``
+    building the rows and handing them to the recorder;
+``total``
+    the whole poll.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .const import POLL_HISTORY, STAGE_SAMPLES, TZ
+from .tracing import nearest_rank
+
+STAGES = ("token", "contracts", "curves", "parse", "baselines", "statistics", "total")
+
+
+def milliseconds(seconds: float | None) -> float | None:
+    """``seconds`` as the sensors and diagnostics show it: in ms, to 0.1 ms."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+@dataclass
+class PollRecord:
+    """One poll: what each stage took (seconds) and what went through it.
+
+    A stage the poll never reached, or had no need of, is absent.
+    ``statuses`` counts the data endpoints' answers by ``"<endpoint> <status>"``;
+    ``windows_skipped`` the statistics left unwritten because they had not
+    changed since the last write; ``token_expires_in`` the seconds the access
+    token had left when the poll had to rotate it (None: no rotation, or no
+    token to start with).
+    """
+
+    started: datetime = field(default_factory=lambda: datetime.now(tz=TZ))
+    stages: dict[str, float] = field(default_factory=dict)
+    statuses: dict[str, int] = field(default_factory=dict)
+    payload_bytes: int = 0
+    points_parsed: int = 0
+    windows_skipped: int = 0
+    rows_written: int = 0
+    token_expires_in: float | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """The record as the diagnostics show it, durations in milliseconds."""
+        return {
+            "started": self.started.isoformat(),
+            "stages_ms": {
+                stage: round(seconds * 1000, 1)
+                for stage, seconds in self.stages.items()
+            },
+            "statuses": self.statuses,
+            "payload_bytes": self.payload_bytes,
+            "points_parsed": self.points_parsed,
+            "windows_skipped": self.windows_skipped,
+            "rows_written": self.rows_written,
+            "token_expires_in": self.token_expires_in,
+            "error": self.error,
+        }
+
+
+class PollTimings:
+    """Stage durations of the last STAGE_SAMPLES polls; the last POLL_HISTORY whole."""
+
+    def __init__(self) -> None:
+        self._history: dict[str, deque[float]] = {
+            stage: deque(maxlen=STAGE_SAMPLES) for stage in STAGES
+        }
+        self.history: deque[PollRecord] = deque(maxlen=POLL_HISTORY)
+        # Every rotation, a poll's or the keepalive's: when, and how long the
+        # access token had left.
+        self.rotations: deque[dict[str, Any]] = deque(maxlen=POLL_HISTORY)
+        self.last: PollRecord | None = None
+        self._current: PollRecord | None = None
+        self._started = 0.0
+
+    def begin(self) -> PollRecord:
+        """Start timing a poll; the stages timed until ``end`` belong to it."""
+        self._current = PollRecord()
+        self._started = time.monotonic()
+        return self._current
+
+    def end(self) -> None:
+        """Close the poll, failed or not, and file its stages."""
+        record = self._current
+        if record is None:
+            return
+        record.stages["total"] = time.monotonic() - self._started
+        for stage, seconds in record.stages.items():
+            self._history[stage].append(seconds)
+        self.history.append(record)
+        self.last = record
+        self._current = None
+
+    @contextmanager
+    def poll(self) -> Iterator[PollRecord]:
+        """``begin`` and ``end`` around the ``with``, noting what it raised."""
+        record = self.begin()
+        try:
+            yield record
+        except Exception as err:
+            record.error = f"{type(err).__name__}: {err}"
+            raise
+        finally:
+            self.end()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body of the ``with`` as ``name``, adding up repeated stages.
+
+        Outside a poll (a backfill writing statistics, say) nothing is timed.
+        """
+        record = self._current
+        if record is None:
+            yield
+            return
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            record.stages[name] = record.stages.get(name, 0.0) + elapsed
+
+    def count_rows(self, rows: int) -> None:
+        """Add ``rows`` statistics rows to the poll under way, if any."""
+        if self._current is not None:
+            self._current.rows_written += rows
+
+    def count_bytes(self, payload_bytes: int) -> None:
+        """Add ``payload_bytes`` of portal answers to the poll under way, if any."""
+        if self._current is not None:
+            self._current.payload_bytes += payload_bytes
+
+    def count_points(self, points: int) -> None:
+        """Add ``points`` parsed curve points to the poll under way, if any."""
+        if self._current is not None:
+            self._current.points_parsed += points
+
+    def count_skipped(self) -> None:
+        """Note a statistic the poll under way left unwritten, unchanged."""
+        if self._current is not None:
+            self._current.windows_skipped += 1
+
+    def note_rotation(self, expires_in: float | None) -> None:
+        """Note a rotation, the access token having ``expires_in`` seconds left."""
+        self.rotations.append(
+            {"at": datetime.now(tz=TZ).isoformat(), "expires_in": expires_in}
+        )
+        if self._current is not None:
+            self._current.token_expires_in = expires_in
+
+    def last_duration(self, stage: str) -> float | None:
+        """Seconds ``stage`` took in the last poll, None if it did not run."""
+        return self.last.stages.get(stage) if self.last else None
+
+    def percentile(self, stage: str, fraction: float = 0.95) -> float | None:
+        """The ``fraction`` percentile of ``stage`` over the polls kept."""
+        ranked = sorted(self._history[stage])
+        return nearest_rank(ranked, fraction) if ranked else None
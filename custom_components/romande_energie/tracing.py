@@ -0,0 +1,179 @@
+"""Where a portal request spends its time, phase by phase.
+
+A slow poll can come from name resolution, from opening a connection (the TCP
+and TLS handshakes: a pooled connection rarely survives the time between two
+polls), or from the portal itself. An aiohttp ``TraceConfig`` on the entry's
+session times each request's phases, and the API client files them per
+endpoint into rolling windows of recent samples:
+
+``queued``
+    waiting for a free connection in the pool;
+``dns``
+    resolving the portal's host name (absent on a cache hit);
+``connect``
+    opening a new connection, TCP and TLS, with name resolution taken out —
+    aiohttp signals no separate TLS phase, so for the portal's https endpoints
+    this is mostly the handshake;
+``ttfb``
+    from the request headers going out to the response headers coming back:
+    the portal's own time;
+``total``
+    the whole request up to the response headers.
+
+Alongside them each endpoint counts requests on new versus reused
+connections, which is what decides whether warming a connection up or
+keeping one alive would pay off.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from .const import TRACE_SAMPLES
+
+PHASES = ("queued", "dns", "connect", "ttfb", "total")
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def nearest_rank(ranked: Sequence[float], fraction: float) -> float:
+    """The ``fraction`` quantile of ``ranked``, sorted and non-empty (nearest rank)."""
+    return ranked[min(len(ranked) - 1, int(fraction * len(ranked)))]
+
+
+class PhaseHistogram:
+    """The last TRACE_SAMPLES durations of one phase, in milliseconds."""
+
+    def __init__(self) -> None:
+        self._samples: deque[float] = deque(maxlen=TRACE_SAMPLES)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds * 1000)
+
+    def summary(self) -> dict[str, Any]:
+        """Count, p50/p95/max and bucket counts of the samples held."""
+        ranked = sorted(self._samples)
+        if not ranked:
+            return {"count": 0}
+        buckets = [0] * (len(BUCKETS_MS) + 1)
+        for sample in ranked:
+            buckets[bisect_left(BUCKETS_MS, sample)] += 1
+
+        return {
+            "count": len(ranked),
+            "p50_ms": round(nearest_rank(ranked, 0.5), 1),
+            "p95_ms": round(nearest_rank(ranked, 0.95), 1),
+            "max_ms": round(ranked[-1], 1),
+            "buckets": {
+                **{f"le_{bound}ms": count for bound, count in zip(BUCKETS_MS, buckets)},
+                f"gt_{BUCKETS_MS[-1]}ms": buckets[-1],
+            },
+        }
+
+
+class EndpointTrace:
+    """The phase timings and connection counts of one endpoint's requests."""
+
+    def __init__(self) -> None:
+        self.phases = {phase: PhaseHistogram() for phase in PHASES}
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.failures = 0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "phases": {
+                phase: histogram.summary()
+                for phase, histogram in self.phases.items()
+                if histogram
+            },
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "failures": self.failures,
+        }
+
+
+# ---------------------------------------------------------------------------
+# TraceConfig callbacks. ``ctx`` is aiohttp's per-request namespace; the
+# EndpointTrace a request is filed under rides in ``ctx.trace_request_ctx``,
+# and requests made without one are not timed.
+# ---------------------------------------------------------------------------
+def _mark(name: str) -> Any:
+    async def mark(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        setattr(ctx, name, time.monotonic())
+
+    return mark
+
+
+async def _on_reuseconn(
+    _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any
+) -> None:
+    ctx.reused = True
+
+
+async def _on_request_end(
+    _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any
+) -> None:
+    trace: EndpointTrace | None = ctx.trace_request_ctx
+    if trace is None:
+        return
+    end = time.monotonic()
+    marks = vars(ctx)
+
+    def span(start: str, stop: str) -> float | None:
+        if start in marks and stop in marks:
+            return marks[stop] - marks[start]
+        return None
+
+    dns = span("dns_start", "dns_end")
+    connect = span("connect_start", "connect_end")
+    phases = {
+        "queued": span("queued_start", "queued_end"),
+        "dns": dns,
+        "connect": None if connect is None else max(0.0, connect - (dns or 0.0)),
+        "ttfb": end - marks["headers_sent"] if "headers_sent" in marks else None,
+        "total": end - marks["request_start"] if "request_start" in marks else None,
+    }
+    for phase, seconds in phases.items():
+        if seconds is not None:
+            trace.phases[phase].record(seconds)
+    if marks.get("reused"):
+        trace.reused_connections += 1
+    elif connect is not None:
+        trace.new_connections += 1
+
+
+async def _on_request_exception(
+    _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any
+) -> None:
+    trace: EndpointTrace | None = ctx.trace_request_ctx
+    if trace is not None:
+        trace.failures += 1
+
+
+def request_trace_config() -> aiohttp.TraceConfig:
+    """A TraceConfig filing each request's phases under its EndpointTrace."""
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_mark("request_start"))
+    config.on_connection_queued_start.append(_mark("queued_start"))
+    config.on_connection_queued_end.append(_mark("queued_end"))
+    config.on_connection_create_start.append(_mark("connect_start"))
+    config.on_connection_create_end.append(_mark("connect_end"))
+    config.on_dns_resolvehost_start.append(_mark("dns_start"))
+    config.on_dns_resolvehost_end.append(_mark("dns_end"))
+    config.on_connection_reuseconn.append(_on_reuseconn)
+    config.on_request_headers_sent.append(_mark("headers_sent"))
+    config.on_request_end.append(_on_request_end)
+    config.on_request_exception.append(_on_request_exception)
+    return config
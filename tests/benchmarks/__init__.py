@@ -0,0 +1 @@
+"""Benchmarks for the Romande Énergie integration (not collected by pytest)."""
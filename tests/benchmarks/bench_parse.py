@@ -0,0 +1,81 @@
+"""Compare the single-pass curves parser with one parse per curve type.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_parse
+
+``_per_type_parse`` is the parser as it stood before the single pass: it walks
+the payload once per requested curve type and decodes a timestamp for every
+value of every matching curve. The poll asks for consumption and surplus, so
+the baseline is two such calls against one ``parse_daily_curves``.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+import timeit
+from typing import Any
+
+from custom_components.romande_energie.api import DailyPoint, parse_daily_curves
+from custom_components.romande_energie.const import (
+    CURVE_TYPE_CONSUMPTION,
+    CURVE_TYPE_SURPLUS,
+)
+
+from .payloads import make_curves_payload
+
+# (days, installations)
+CASES = [(30, 1), (30, 4), (365, 1), (365, 4), (1825, 2), (1825, 8)]
+
+
+def _per_type_parse(curves_response: list[dict[str, Any]], curve_type: str) -> list[DailyPoint]:
+    """The pre-single-pass parser, minus its logging."""
+    block = curves_response[0] if curves_response else None
+    if not block:
+        return []
+    timestamps = block.get("timestamps") or []
+    dedup: dict[date, float] = {}
+    for installation in block.get("installations") or []:
+        for curve in installation.get("curves") or []:
+            if curve.get("curve_type") != curve_type:
+                continue
+            for ts, value in zip(timestamps, curve.get("values") or []):
+                if value is None:
+                    continue
+                try:
+                    day = datetime.fromisoformat(ts).date()
+                    parsed = float(value)
+                except (ValueError, TypeError):
+                    continue
+                dedup[day] = dedup.get(day, 0.0) + parsed
+    return [DailyPoint(day, value) for day, value in sorted(dedup.items())]
+
+
+def _baseline(payload: list[dict[str, Any]]) -> dict[str, list[DailyPoint]]:
+    return {
+        curve_type: _per_type_parse(payload, curve_type)
+        for curve_type in (CURVE_TYPE_CONSUMPTION, CURVE_TYPE_SURPLUS)
+    }
+
+
+def _best_of(func, payload, repeat: int = 5) -> float:
+    number = max(1, 20_000 // len(payload[0]["timestamps"]))
+    return min(timeit.repeat(lambda: func(payload), number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    """Print per-call timings and the speed-up for each payload size."""
+    print(f"{'days':>6} {'inst':>5} {'values':>8} {'per-type ms':>12} {'single ms':>10} {'x':>6}")
+    for days, installations in CASES:
+        payload = make_curves_payload(days=days, installations=installations, null_ratio=0.02)
+        assert parse_daily_curves(payload) == _baseline(payload)  # same answer
+        before = _best_of(_baseline, payload)
+        after = _best_of(parse_daily_curves, payload)
+        values = days * installations * 2
+        print(
+            f"{days:>6} {installations:>5} {values:>8} "
+            f"{before * 1e3:>12.3f} {after * 1e3:>10.3f} {before / after:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Time a curves answer's way from the portal to the recorder, stage by stage.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_pipeline
+    python -m tests.benchmarks.bench_pipeline --save before.json
+    python -m tests.benchmarks.bench_pipeline --baseline before.json
+
+Each case is a synthetic payload (``payloads.make_curves_payload``) scaled in
+days, installations, curve types, null density and granularity, taken
+through what a poll does with it, for the household totals and every
+installation alike:
+
+``parse``
+    ``_parse_curves``, both curve types in one walk;
+``series``
+    the daily series the sensors read (hourly points summed into their days
+    first, as ``_update_window`` does);
+``gap-fill``
+    the windows the statistics are written from: ``DailySeries.filled`` or
+    ``_fill_hour_gaps``;
+``settled``, ``month``
+    ``_settled`` and ``_calendar_month_total``, for the sensors;
+``rows``
+    ``_statistic_rows``, the rows handed to the recorder.
+
+Every stage reports its best time, its throughput in payload values per
+second and the peak memory it allocated (``tracemalloc``, in a run of its own
+so the tracing does not skew the timing). ``--save`` writes the figures to a
+JSON file; ``--baseline`` reads one back and prints each stage's time and
+peak memory as a ratio of it, so an optimisation shows up as a ratio below 1.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, timedelta
+import json
+from pathlib import Path
+import timeit
+import tracemalloc
+from typing import Any
+
+from custom_components.romande_energie.const import (
+    CURVE_TYPE_CONSUMPTION,
+    CURVE_TYPE_SURPLUS,
+    GRANULARITY_DAILY,
+    GRANULARITY_HOURLY,
+)
+from custom_components.romande_energie.coordinator import (
+    _calendar_month_total,
+    _daily_from_hourly,
+    _fill_hour_gaps,
+    _midnight,
+    _parse_curves,
+    _settled,
+    _statistic_rows,
+)
+from custom_components.romande_energie.series import DailySeries
+
+from .payloads import make_curves_payload
+
+BOTH = (CURVE_TYPE_CONSUMPTION, CURVE_TYPE_SURPLUS)
+START = date(2026, 1, 1)
+STAGES = ("parse", "series", "gap-fill", "settled", "month", "rows")
+
+
+@dataclass(frozen=True)
+class Case:
+    """One payload shape."""
+
+    days: int
+    installations: int = 1
+    curve_types: tuple[str, ...] = BOTH
+    null_ratio: float = 0.02
+    granularity: str = GRANULARITY_DAILY
+
+    @property
+    def label(self) -> str:
+        return (
+            f"{self.days}d {self.granularity} x{self.installations} "
+            f"{len(self.curve_types)}c {self.null_ratio:.0%}"
+        )
+
+    @property
+    def values(self) -> int:
+        """The values the payload carries, nulls included."""
+        per_day = 24 if self.granularity == GRANULARITY_HOURLY else 1
+        return self.days * per_day * self.installations * len(self.curve_types)
+
+
+CASES = [
+    Case(days=30),
+    Case(days=30, installations=4),
+    Case(days=365),
+    Case(days=365, installations=4),
+    Case(days=365, curve_types=(CURVE_TYPE_CONSUMPTION,)),
+    Case(days=365, null_ratio=0.3),
+    Case(days=1825, installations=2),
+    Case(days=30, granularity=GRANULARITY_HOURLY),
+    Case(days=30, installations=4, granularity=GRANULARITY_HOURLY),
+    Case(days=365, granularity=GRANULARITY_HOURLY),
+    Case(days=365, null_ratio=0.3, granularity=GRANULARITY_HOURLY),
+]
+
+
+def _stages(case: Case) -> list[tuple[str, Callable[[], Any]]]:
+    """Each stage as a call on the previous stage's output, computed once here."""
+    payload = make_curves_payload(
+        days=case.days,
+        installations=case.installations,
+        curve_types=case.curve_types,
+        granularity=case.granularity,
+        null_ratio=case.null_ratio,
+        start=START,
+    )
+    hourly = case.granularity == GRANULARITY_HOURLY
+    today = START + timedelta(days=case.days)
+
+    def parse() -> list[list[Any]]:
+        parsed = _parse_curves(payload, hourly=hourly)
+        return [
+            points
+            for curves in (parsed.total, *parsed.installations.values())
+            for points in curves.values()
+            if points
+        ]
+
+    def series() -> list[DailySeries]:
+        if hourly:
+            return [DailySeries.from_points(_daily_from_hourly(p)) for p in points]
+        return [DailySeries.from_points(p) for p in points]
+
+    def gap_fill() -> list[Any]:
+        if hourly:
+            return [_fill_hour_gaps(p) for p in points]
+        return [s.filled() for s in daily]
+
+    points = parse()
+    daily = series()
+    filled = gap_fill()
+    return [
+        ("parse", parse),
+        ("series", series),
+        ("gap-fill", gap_fill),
+        ("settled", lambda: [_settled(s, today) for s in daily]),
+        ("month", lambda: [_calendar_month_total(s, today) for s in daily]),
+        ("rows", lambda: [_statistic_rows(f, 100.0) for f in filled]),
+    ]
+
+
+def _best_of(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Seconds per call: the best of ``repeat`` runs of about 0.1 s each."""
+    number, _elapsed = timeit.Timer(func).autorange()
+    number = max(1, number // 2)
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def _peak(func: Callable[[], Any]) -> int:
+    """Bytes allocated at the peak of one call, its result included."""
+    _midnight.cache_clear()  # what a first write pays for the row timestamps
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case) -> dict[str, dict[str, float]]:
+    """Seconds per call, values per second and peak bytes, per stage."""
+    figures: dict[str, dict[str, float]] = {}
+    for stage, func in _stages(case):
+        seconds = _best_of(func)
+        figures[stage] = {
+            "seconds": seconds,
+            "values_per_second": case.values / seconds,
+            "peak_bytes": _peak(func),
+        }
+    return figures
+
+
+def main() -> None:
+    """Print every case's stages, against a baseline if one is given."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", type=Path, help="write the figures to this file")
+    parser.add_argument("--baseline", type=Path, help="compare with a saved run")
+    args = parser.parse_args()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+
+    header = (
+        f"{'case':>26} {'values':>8} {'stage':>9} {'ms':>9} {'Mval/s':>7} "
+        f"{'peak KiB':>9}"
+    )
+    if baseline:
+        header += f" {'time x':>7} {'mem x':>6}"
+    print(header)
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for case in CASES:
+        results[case.label] = figures = measure(case)
+        for stage in STAGES:
+            figure = figures[stage]
+            line = (
+                f"{case.label:>26} {case.values:>8} {stage:>9} "
+                f"{figure['seconds'] * 1e3:>9.3f} "
+                f"{figure['values_per_second'] / 1e6:>7.2f} "
+                f"{figure['peak_bytes'] / 1024:>9.1f}"
+            )
+            before = baseline.get(case.label, {}).get(stage)
+            if before:
+                line += (
+                    f" {figure['seconds'] / before['seconds']:>7.2f}"
+                    f" {figure['peak_bytes'] / max(1, before['peak_bytes']):>6.2f}"
+                )
+            print(line)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the batch statistics-row builder with the per-row loop it replaced.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_stats_rows
+
+``_per_row`` is the writer's loop as it stood before: one aware ``datetime``
+built and one addition made per row. The batch builder is timed twice, with
+NumPy and with the pure-Python fallback forced, over 10 years of daily rows
+and 1 year of hourly rows.
+"""
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+import random
+import timeit
+
+from homeassistant.components.recorder.models import StatisticData
+
+from custom_components.romande_energie import series as series_module
+from custom_components.romande_energie.api import DailyPoint, HourlyPoint
+from custom_components.romande_energie.const import TZ
+from custom_components.romande_energie.coordinator import _midnight, _statistic_rows
+from custom_components.romande_energie.series import DailySeries
+
+
+def _per_row(points: list[DailyPoint] | list[HourlyPoint], running: float) -> list[StatisticData]:
+    """The writer's row loop before the batch builder."""
+    rows: list[StatisticData] = []
+    for point in points:
+        running += point.value
+        if isinstance(point, HourlyPoint):
+            start = point.start
+        else:
+            start = datetime(point.day.year, point.day.month, point.day.day, tzinfo=TZ)
+        rows.append(StatisticData(start=start, state=point.value, sum=running))
+    return rows
+
+
+def _daily(days: int) -> list[DailyPoint]:
+    rng = random.Random(0)
+    first = date(2016, 1, 1)
+    return [DailyPoint(first + timedelta(days=n), rng.uniform(2, 20)) for n in range(days)]
+
+
+def _hourly(hours: int) -> list[HourlyPoint]:
+    rng = random.Random(0)
+    first = datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        HourlyPoint(first + timedelta(hours=n), rng.uniform(0, 2)) for n in range(hours)
+    ]
+
+
+def _best_of(func, repeat: int = 5, number: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    """Print per-window timings for each builder."""
+    daily = _daily(3653)
+    hourly = _hourly(8760)
+    cases = [
+        ("10y daily", daily, DailySeries.from_points(daily).filled()),
+        ("1y hourly", hourly, hourly),
+    ]
+    print(f"{'window':>10} {'rows':>6} {'per-row ms':>11} {'numpy ms':>9} {'pure ms':>8}")
+    for name, points, batch_input in cases:
+        expected = _per_row(points, 100.0)
+        assert _statistic_rows(batch_input, 100.0) == expected  # same rows
+        before = _best_of(lambda: _per_row(points, 100.0))
+        _midnight.cache_clear()  # first call pays for the timestamps; later ones hit
+        with_numpy = _best_of(lambda: _statistic_rows(batch_input, 100.0))
+        numpy, series_module.np = series_module.np, None
+        try:
+            pure = _best_of(lambda: _statistic_rows(batch_input, 100.0))
+        finally:
+            series_module.np = numpy
+        print(
+            f"{name:>10} {len(points):>6} {before * 1e3:>11.2f} "
+            f"{with_numpy * 1e3:>9.2f} {pure * 1e3:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Synthetic curves payloads shaped like the portal's answers.
+
+Deterministic for a given set of arguments, so two runs compare like for like.
+"""
+from __future__ import annotations
+
+import random
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from custom_components.romande_energie.const import (
+    CURVE_TYPE_CONSUMPTION,
+    CURVE_TYPE_SURPLUS,
+    GRANULARITY_DAILY,
+    TZ,
+)
+
+def timestamps(start: date, days: int, granularity: str = GRANULARITY_DAILY) -> list[str]:
+    """Local ISO timestamps covering ``days`` days from ``start``.
+
+    Hours are stepped in UTC, which gives the DST days their 23 or 25 hours as
+    the portal does; days are stepped on the wall clock, so each is a midnight.
+    """
+    midnight = datetime(start.year, start.month, start.day, tzinfo=TZ)
+    if granularity == GRANULARITY_DAILY:
+        return [(midnight + timedelta(days=n)).isoformat() for n in range(days)]
+    moment = midnight.astimezone(UTC)
+    end = (midnight + timedelta(days=days)).astimezone(UTC)
+    out: list[str] = []
+    while moment < end:
+        out.append(moment.astimezone(TZ).isoformat())
+        moment += timedelta(hours=1)
+    return out
+
+
+def make_curves_payload(
+    *,
+    days: int = 30,
+    installations: int = 1,
+    curve_types: tuple[str, ...] = (CURVE_TYPE_CONSUMPTION, CURVE_TYPE_SURPLUS),
+    granularity: str = GRANULARITY_DAILY,
+    null_ratio: float = 0.0,
+    start: date = date(2026, 1, 1),
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Build a curves answer: ``installations`` meters x ``curve_types`` curves."""
+    rng = random.Random(seed)
+    stamps = timestamps(start, days, granularity)
+    return [
+        {
+            "contract_id": "CONTRACT_BENCH",
+            "granularity": granularity.upper(),
+            "timestamps": stamps,
+            "installations": [
+                {
+                    "installation_id": f"INST_{index}",
+                    "curves": [
+                        {
+                            "curve_type": curve_type,
+                            "unit": "kWh",
+                            "values": [
+                                None
+                                if rng.random() < null_ratio
+                                else f"{rng.uniform(0, 20):.3f}"
+                                for _ in stamps
+                            ],
+                        }
+                        for curve_type in curve_types
+                    ],
+                }
+                for index in range(installations)
+            ],
+        }
+    ]
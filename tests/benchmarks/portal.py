@@ -0,0 +1,440 @@
+"""A local stand-in for the customer portal, for load and soak runs.
+
+Serves every endpoint in ``const.py`` from ``aiohttp.web`` on 127.0.0.1, and
+behaves like the portal where the integration depends on it:
+
+* login, send-otp and validate-otp hand out the same JWTs the portal does
+  (``user_account_id`` and ``exp`` claims), the SMS code being ``otp_code``;
+* every refresh token is single use and lives ``refresh_ttl`` seconds, the
+  access tokens ``access_ttl``; a refresh burns the token it was sent and
+  answers with a new pair, and a burned or lapsed one gets a 401;
+* the curves answer any range of the ``history_days`` before today, for every
+  installation of the contract, daily or hourly, with an ETag the client can
+  revalidate; today's values are null, as the portal's are until it syncs;
+* every answer waits ``latency`` seconds first, give or take ``jitter``;
+* a ``Fault`` injected with ``inject`` makes it time out, fail, answer late or
+  lose its answers for a while.
+
+The clock is ``clock`` (``time.time`` unless given), so a run can warp it.
+Point a client at ``base_url`` once ``start`` has returned it::
+
+    portal = FakePortal(latency=0.05)
+    account = portal.add_account(contracts=2, installations=3)
+    client = RomandeEnergieApiClient(session, base_url=await portal.start())
+
+or, for a run on a frozen clock, hand it a session that never leaves the event
+loop: ``RomandeEnergieApiClient(portal.session(), base_url=BASE_URL)``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import random
+import time
+import zlib
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.streams import StreamReader
+from aiohttp.test_utils import TestServer, make_mocked_request
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
+)
+from yarl import URL
+
+from custom_components.romande_energie.const import (
+    ACCOUNT_PATH,
+    CONTRACTS_PATH,
+    CURVE_PATH,
+    CURVE_TYPE_CONSUMPTION,
+    CURVE_TYPE_SURPLUS,
+    GRANULARITY_DAILY,
+    LOGIN_PATH,
+    REFRESH_PATH,
+    SEND_OTP_PATH,
+    TZ,
+    VALIDATE_OTP_PATH,
+)
+
+from .payloads import timestamps
+
+API_PREFIX = "/v2"
+CURVE_TYPES = (CURVE_TYPE_CONSUMPTION, CURVE_TYPE_SURPLUS)
+
+# What the requests a Fault hits meet.
+TIMEOUT = "timeout"  # no answer at all, until the client gives up
+ERROR = "error"  # an error status straight away
+SLOW = "slow"  # the answer, ``delay`` seconds late
+LOST = "lost"  # handled (a refresh burns its token), but the answer never comes
+
+
+@dataclass
+class Account:
+    """One customer account: its login and its contracts' meters."""
+
+    account_id: str
+    username: str
+    password: str
+    contracts: list[str]
+    installations: int = 1
+
+
+@dataclass
+class Fault:
+    """The portal misbehaving from ``start`` to ``end`` (its clock, epoch seconds).
+
+    ``kind`` is one of TIMEOUT, ERROR (answering ``status``), SLOW (``delay``
+    seconds late) and LOST. ``routes`` limits it to some routes ("refresh",
+    "curves"...); it hits every one when None.
+    """
+
+    kind: str
+    start: float
+    end: float
+    routes: frozenset[str] | None = None
+    status: int = 503
+    delay: float = 0.0
+
+    def hits(self, route: str, now: float) -> bool:
+        return self.start <= now < self.end and (
+            self.routes is None or route in self.routes
+        )
+
+
+def _jwt(claims: dict[str, Any]) -> str:
+    def segment(payload: dict[str, Any]) -> str:
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    return f"{segment({'alg': 'none', 'typ': 'JWT'})}.{segment(claims)}.sig"
+
+
+def _reading(contract_id: str, installation: int, curve_type: str, stamp: str) -> str:
+    """A reading (kWh, as the portal's strings) that every request agrees on."""
+    key = f"{contract_id}/{installation}/{curve_type}/{stamp}"
+    return f"{(zlib.crc32(key.encode('utf-8')) % 20000) / 1000:.3f}"
+
+
+class FakePortal:
+    """The portal's API on a local port; see the module docstring."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        access_ttl: int = 900,
+        refresh_ttl: int = 1800,
+        history_days: int = 3 * 365,
+        otp_code: str = "123456",
+        clock: Callable[[], float] | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self.history_days = history_days
+        self.otp_code = otp_code
+        self.clock = clock or time.time
+        self.faults: list[Fault] = []
+        self.accounts: dict[str, Account] = {}
+        # Requests served, by route name ("login", "refresh", "curves"...).
+        self.requests: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._otp_pending: dict[str, str] = {}  # otp_id -> account_id
+        # Live refresh tokens -> (account_id, expiry in epoch seconds).
+        self._refresh_tokens: dict[str, tuple[str, float]] = {}
+        self._app = self._build_app()
+        # Requests being served in-process, whether the client still waits or not.
+        self._handling: set[asyncio.Future[web.Response]] = set()
+        self._server: TestServer | None = None
+
+    # ---- Set-up -----------------------------------------------------------
+    def add_account(self, *, contracts: int = 1, installations: int = 1) -> Account:
+        """Open an account of ``contracts`` contracts, ``installations`` meters each."""
+        number = next(self._ids)
+        account = Account(
+            account_id=f"ACCT_{number}",
+            username=f"user{number}@example.com",
+            password=f"password-{number}",
+            contracts=[f"CONTRACT_{number}_{index}" for index in range(contracts)],
+            installations=installations,
+        )
+        self.accounts[account.account_id] = account
+        return account
+
+    def inject(self, fault: Fault) -> None:
+        """Misbehave as ``fault`` says, for the requests arriving in its span."""
+        self.faults.append(fault)
+
+    def _build_app(self) -> web.Application:
+        app = web.Application()
+        routes = [
+            ("POST", LOGIN_PATH, "login", self._login),
+            ("POST", SEND_OTP_PATH, "send_otp", self._send_otp),
+            ("POST", VALIDATE_OTP_PATH, "validate_otp", self._validate_otp),
+            ("POST", REFRESH_PATH, "refresh", self._refresh),
+            ("GET", ACCOUNT_PATH, "account", self._account),
+            ("GET", CONTRACTS_PATH, "contracts", self._contracts),
+            ("GET", CURVE_PATH, "curves", self._curves),
+        ]
+        for method, path, route, handler in routes:
+            app.router.add_route(method, API_PREFIX + path, self._serve(route, handler))
+        return app
+
+    async def start(self) -> str:
+        """Start serving; returns the base URL to hand the client."""
+        self._server = TestServer(self._app, host="127.0.0.1")
+        await self._server.start_server()
+        return str(self._server.make_url(API_PREFIX))
+
+    async def close(self) -> None:
+        for handling in self._handling:
+            handling.cancel()
+        await asyncio.gather(*self._handling, return_exceptions=True)
+        if self._server is not None:
+            await self._server.close()
+
+    # ---- In-process transport ---------------------------------------------
+    def session(self) -> aiohttp.ClientSession:
+        """A session whose requests the portal serves without a socket.
+
+        Nothing leaves the event loop, so on a frozen clock a run is
+        deterministic: the portal's delays and the client's timeouts only pass
+        as the clock is moved. Any host will do; the paths are routed as is.
+        """
+        session = aiohttp.ClientSession()
+        # As aioclient_mock does: the session's requests all go through here.
+        object.__setattr__(session, "_request", self._request)
+        return session
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+        **_kwargs: Any,
+    ) -> AiohttpClientMockResponse:
+        target = URL(url)
+        if params:
+            target = target.with_query({key: str(val) for key, val in params.items()})
+        async with asyncio.timeout(timeout.total if timeout else None):
+            response = await self.dispatch(method, target, headers or {}, json)
+        return AiohttpClientMockResponse(
+            method,
+            target,
+            status=response.status,
+            response=response.body,
+            headers=dict(response.headers),
+        )
+
+    async def dispatch(
+        self, method: str, url: URL, headers: dict[str, str], body: Any = None
+    ) -> web.Response:
+        """Route one request to its handler, as the server would."""
+        match = await self._app.router.resolve(make_mocked_request(method, url.path_qs))
+        payload = StreamReader(mock.Mock(), 2**16, loop=asyncio.get_running_loop())
+        if body is not None:
+            payload.feed_data(json.dumps(body).encode("utf-8"))
+        payload.feed_eof()
+        request = make_mocked_request(
+            method, url.path_qs, headers, match_info=match, payload=payload
+        )
+        # As a server does, the portal carries on with a request the client
+        # gave up on: a refresh answered too late has still burnt its token.
+        handling = asyncio.ensure_future(match.handler(request))
+        self._handling.add(handling)
+        handling.add_done_callback(self._handling.discard)
+        return await asyncio.shield(handling)
+
+    # ---- Tokens -----------------------------------------------------------
+    def _issue(self, account: Account) -> dict[str, str]:
+        now = self.clock()
+        jti = next(self._ids)
+        refresh = _jwt({"user_account_id": account.account_id, "jti": jti})
+        self._refresh_tokens[refresh] = (account.account_id, now + self.refresh_ttl)
+        access = _jwt(
+            {
+                "user_account_id": account.account_id,
+                "exp": int(now + self.access_ttl),
+                "jti": jti,
+            }
+        )
+        return {"access_token": access, "refresh_token": refresh}
+
+    def _bearer(self, request: web.Request) -> dict[str, Any] | None:
+        """The claims of a live bearer token, None when there is none."""
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return None
+        try:
+            payload = header[7:].split(".")[1]
+            padding = "=" * (-len(payload) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload + padding))
+        except (IndexError, ValueError):
+            return None
+        if claims.get("exp", float("inf")) <= self.clock():
+            return None
+        return claims
+
+    # ---- Handlers ---------------------------------------------------------
+    def _serve(
+        self, route: str, handler: Callable[[web.Request], Awaitable[web.Response]]
+    ) -> Callable[[web.Request], Awaitable[web.Response]]:
+        """``handler`` behind the portal's latency and whatever faults are on."""
+
+        async def serve(request: web.Request) -> web.Response:
+            self.requests[route] += 1
+            now = self.clock()
+            active: dict[str, Fault] = {}  # by kind
+            for fault in self.faults:
+                if fault.hits(route, now):
+                    active.setdefault(fault.kind, fault)
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+            if SLOW in active:
+                delay += active[SLOW].delay
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if TIMEOUT in active:
+                await asyncio.Event().wait()  # until the portal is closed
+            if ERROR in active:
+                return web.json_response(
+                    {"detail": "injected fault"}, status=active[ERROR].status
+                )
+            response = await handler(request)
+            if LOST in active:
+                await asyncio.Event().wait()
+            return response
+
+        return serve
+
+    async def _login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for account in self.accounts.values():
+            if (account.username, account.password) == (
+                body.get("username"),
+                body.get("password"),
+            ):
+                pending = _jwt({"user_account_id": account.account_id, "otp": True})
+                return web.json_response(
+                    {"access_token": pending, "mobile_number": "+41 79 *** ** 00"}
+                )
+        return web.json_response({"detail": "invalid credentials"}, status=401)
+
+    async def _send_otp(self, request: web.Request) -> web.Response:
+        claims = self._bearer(request)
+        if claims is None:
+            return web.json_response({"detail": "unauthorized"}, status=401)
+        otp_id = f"OTP_{next(self._ids)}"
+        self._otp_pending[otp_id] = claims["user_account_id"]
+        return web.json_response({"otp_id": otp_id})
+
+    async def _validate_otp(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        account_id = self._otp_pending.pop(body.get("otp_id"), None)
+        if account_id is None or body.get("otp_code") != self.otp_code:
+            return web.json_response({"detail": "invalid otp"}, status=400)
+        return web.json_response(self._issue(self.accounts[account_id]))
+
+    async def _refresh(self, request: web.Request) -> web.Response:
+        token = (await request.json()).get("refresh")
+        live = self._refresh_tokens.pop(token, None)  # single use: burnt either way
+        if live is None or live[1] <= self.clock():
+            return web.json_response({"detail": "token not valid"}, status=401)
+        return web.json_response(self._issue(self.accounts[live[0]]))
+
+    async def _account(self, request: web.Request) -> web.Response:
+        claims = self._bearer(request)
+        account_id = request.match_info["account_id"]
+        if claims is None or claims["user_account_id"] != account_id:
+            return web.json_response({"detail": "unauthorized"}, status=401)
+        return web.json_response({"id": account_id})
+
+    async def _contracts(self, request: web.Request) -> web.Response:
+        claims = self._bearer(request)
+        account = self.accounts.get(request.match_info["account_id"])
+        if account is None or claims is None or (
+            claims["user_account_id"] != account.account_id
+        ):
+            return web.json_response({"detail": "unauthorized"}, status=401)
+        return web.json_response([{"id": contract} for contract in account.contracts])
+
+    async def _curves(self, request: web.Request) -> web.Response:
+        claims = self._bearer(request)
+        contract_id = request.match_info["contract_id"]
+        account = self.accounts.get(claims["user_account_id"]) if claims else None
+        if account is None or contract_id not in account.contracts:
+            return web.json_response({"detail": "unauthorized"}, status=401)
+        try:
+            start = date.fromisoformat(request.query["start_date"])
+            end = date.fromisoformat(request.query["end_date"])
+        except (KeyError, ValueError):
+            return web.json_response({"detail": "bad range"}, status=400)
+        granularity = request.query.get("granularity", GRANULARITY_DAILY).lower()
+        body = json.dumps(self.curves(account, contract_id, start, end, granularity))
+        etag = f'"{hashlib.blake2b(body.encode(), digest_size=8).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            text=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    # ---- Payloads ---------------------------------------------------------
+    def curves(
+        self,
+        account: Account,
+        contract_id: str,
+        start: date,
+        end: date,
+        granularity: str = GRANULARITY_DAILY,
+    ) -> list[dict[str, Any]]:
+        """The curves answer for ``[start, end)``.
+
+        Null before the history starts and from today on.
+        """
+        today = datetime.fromtimestamp(self.clock(), tz=TZ).date()
+        first = (today - timedelta(days=self.history_days)).isoformat()
+        stamps = timestamps(start, max(0, (end - start).days), granularity)
+        # The local day of each timestamp is its first ten characters.
+        published = [first <= stamp[:10] < today.isoformat() for stamp in stamps]
+        return [
+            {
+                "contract_id": contract_id,
+                "granularity": granularity.upper(),
+                "timestamps": stamps,
+                "installations": [
+                    {
+                        "installation_id": f"{contract_id}_INST_{index}",
+                        "curves": [
+                            {
+                                "curve_type": curve_type,
+                                "unit": "kWh",
+                                "values": [
+                                    _reading(contract_id, index, curve_type, stamp)
+                                    if live
+                                    else None
+                                    for stamp, live in zip(stamps, published)
+                                ],
+                            }
+                            for curve_type in CURVE_TYPES
+                        ],
+                    }
+                    for index in range(account.installations)
+                ],
+            }
+        ]
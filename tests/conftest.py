@@ -9,16 +9,22 @@ from __future__ import annotations
 import base64
 import json
 import time
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, Callable
 from pathlib import Path
 from typing import Any
 
 import pytest
+from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
 
+from custom_components.romande_energie.api import RomandeEnergieApiClient
 from custom_components.romande_energie.const import (
     CONF_ACCOUNT_ID,
     CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
     CONF_PASSWORD,
     CONF_REFRESH_TOKEN,
     CONF_USERNAME,
@@ -108,6 +114,22 @@ def sample_curves() -> list[dict[str, Any]]:
         return json.load(handle)
 
 
+# ---------------------------------------------------------------------------
+# API client fixture
+# ---------------------------------------------------------------------------
+@pytest.fixture
+async def client(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> AsyncGenerator[RomandeEnergieApiClient]:
+    """A real API client on a session answered by ``aioclient_mock``.
+
+    Modules that test past the client override it with their own ``client``.
+    """
+    session = aioclient_mock.create_session(hass.loop)
+    yield RomandeEnergieApiClient(session)
+    await session.close()
+
+
 # ---------------------------------------------------------------------------
 # Config entry builder
 # ---------------------------------------------------------------------------
@@ -124,6 +146,7 @@ def build_config_entry(
     }
     if data:
         entry_data.update(data)
+    entry_data.setdefault(CONF_CONTRACT_IDS, [entry_data[CONF_CONTRACT_ID]])
     kwargs: dict[str, Any] = {
         "domain": DOMAIN,
         "data": entry_data,
@@ -0,0 +1,108 @@
+"""Tests for the conditional curves request in ``api.py``.
+
+The portal publishes once a day but is polled far more often; an unchanged
+answer must come back as the very list returned before so the coordinator can
+skip parsing it.
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.romande_energie.api import ApiError
+from custom_components.romande_energie.const import CONDITIONAL_CACHE_SIZE, CURVE_ENDPOINT
+
+URL = CURVE_ENDPOINT.format(contract_id="CONTRACT_TEST")
+START, END = "2026-06-01", "2026-06-06"
+
+
+def _answer(aioclient_mock: AiohttpClientMocker, **kwargs) -> None:
+    """Replace whatever the curves URL answered before with ``kwargs``."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(URL, **kwargs)
+
+
+def _sent_headers(aioclient_mock: AiohttpClientMocker) -> dict[str, str]:
+    _method, _url, _data, headers = aioclient_mock.mock_calls[-1]
+    return headers
+
+
+async def test_validators_are_sent_back_and_304_returns_the_kept_list(
+    client, aioclient_mock, sample_curves
+) -> None:
+    _answer(
+        aioclient_mock,
+        text=json.dumps(sample_curves),
+        headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jun 2026 06:00:00 GMT"},
+    )
+    first = await client.get_curves("token", "CONTRACT_TEST", START, END)
+    assert "If-None-Match" not in _sent_headers(aioclient_mock)
+
+    _answer(aioclient_mock, status=304, text="")
+    second = await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+    assert second is first
+    headers = _sent_headers(aioclient_mock)
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jun 2026 06:00:00 GMT"
+
+
+async def test_identical_body_without_validators_returns_the_kept_list(
+    client, aioclient_mock, sample_curves
+) -> None:
+    _answer(aioclient_mock, text=json.dumps(sample_curves))
+    first = await client.get_curves("token", "CONTRACT_TEST", START, END)
+    assert "If-None-Match" not in _sent_headers(aioclient_mock)
+
+    _answer(aioclient_mock, text=json.dumps(sample_curves))
+    second = await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+    assert second is first
+
+
+async def test_changed_body_is_decoded_afresh(client, aioclient_mock, sample_curves) -> None:
+    _answer(aioclient_mock, text=json.dumps(sample_curves))
+    first = await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+    changed = [{**sample_curves[0], "timestamps": sample_curves[0]["timestamps"][:2]}]
+    _answer(aioclient_mock, text=json.dumps(changed))
+    second = await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+    assert second is not first
+    assert second == changed
+
+
+async def test_ranges_are_kept_apart(client, aioclient_mock, sample_curves) -> None:
+    _answer(aioclient_mock, text=json.dumps(sample_curves), headers={"ETag": '"v1"'})
+    await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+    await client.get_curves("token", "CONTRACT_TEST", "2026-06-04", END)
+
+    assert "If-None-Match" not in _sent_headers(aioclient_mock)
+
+
+async def test_304_without_a_kept_answer_is_an_error(client, aioclient_mock) -> None:
+    _answer(aioclient_mock, status=304, text="")
+
+    with pytest.raises(ApiError):
+        await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+
+async def test_a_body_that_is_not_utf8_is_an_error(client, aioclient_mock) -> None:
+    # Hashed and decoded from the bytes read: no text decoding to lean on.
+    _answer(aioclient_mock, content=b"[\x80]")
+
+    with pytest.raises(ApiError, match="Non-JSON"):
+        await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+
+async def test_kept_answers_are_bounded(client, aioclient_mock, sample_curves) -> None:
+    _answer(aioclient_mock, text=json.dumps(sample_curves))
+    for day in range(1, CONDITIONAL_CACHE_SIZE + 3):
+        await client.get_curves("token", "CONTRACT_TEST", f"2026-05-{day:02d}", END)
+
+    assert len(client._curves_cache) == CONDITIONAL_CACHE_SIZE
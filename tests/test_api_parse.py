@@ -1,12 +1,16 @@
 """Tests for the pure curve-parsing helpers in ``api.py``."""
 from __future__ import annotations
 
-from datetime import date
+from datetime import UTC, date, datetime, timedelta
 
 from custom_components.romande_energie.api import (
     DailyPoint,
+    HourlyPoint,
     latest_value,
+    parse_daily_breakdown,
+    parse_daily_curves,
     parse_daily_series,
+    parse_hourly_series,
 )
 
 D1 = "2026-06-01T00:00:00+02:00"
@@ -217,3 +221,147 @@ def test_latest_value_returns_last(sample_curves):
 
 def test_latest_value_empty_is_none():
     assert latest_value([]) is None
+
+
+# ---------------------------------------------------------------------------
+# Hourly curves
+# ---------------------------------------------------------------------------
+def _hours(day: str, offset: str, count: int, *, step: int = 60) -> list[str]:
+    """``count`` wall-clock timestamps ``step`` minutes apart from local midnight."""
+    return [
+        f"{day}T{minute // 60:02d}:{minute % 60:02d}:00{offset}"
+        for minute in range(0, count * step, step)
+    ]
+
+
+def test_hourly_points_are_utc_hour_starts():
+    payload = _block(
+        _hours("2026-06-01", "+02:00", 2),
+        [{"curve_type": "consumption", "values": ["0.5", "0.25"]}],
+    )
+    assert parse_hourly_series(payload, "consumption") == [
+        HourlyPoint(datetime(2026, 5, 31, 22, tzinfo=UTC), 0.5),
+        HourlyPoint(datetime(2026, 5, 31, 23, tzinfo=UTC), 0.25),
+    ]
+
+
+def test_autumn_dst_change_keeps_both_two_oclock_hours():
+    # 2026-10-25: 02:00 happens twice in Europe/Zurich, once per offset.
+    payload = _block(
+        ["2026-10-25T02:00:00+02:00", "2026-10-25T02:00:00+01:00"],
+        [{"curve_type": "consumption", "values": ["1.0", "2.0"]}],
+    )
+    series = parse_hourly_series(payload, "consumption")
+    assert [p.value for p in series] == [1.0, 2.0]
+    assert series[1].start - series[0].start == timedelta(hours=1)
+
+
+def test_quarter_hours_are_folded_into_their_hour():
+    payload = _block(
+        _hours("2026-06-01", "+02:00", 8, step=15),
+        [{"curve_type": "consumption", "values": ["0.25"] * 7 + [None]}],
+    )
+    assert parse_hourly_series(payload, "consumption") == [
+        HourlyPoint(datetime(2026, 5, 31, 22, tzinfo=UTC), 1.0),
+        HourlyPoint(datetime(2026, 5, 31, 23, tzinfo=UTC), 0.75),
+    ]
+
+
+def test_timestamp_without_offset_is_local_time():
+    payload = _block(
+        ["2026-01-15T08:00:00"], [{"curve_type": "consumption", "values": ["1.0"]}]
+    )
+    assert parse_hourly_series(payload, "consumption") == [
+        HourlyPoint(datetime(2026, 1, 15, 7, tzinfo=UTC), 1.0)
+    ]
+
+
+def test_hourly_payload_sums_to_local_days():
+    """The sensors stay daily when the entry fetches hourly curves."""
+    timestamps = _hours("2026-06-01", "+02:00", 24) + _hours("2026-06-02", "+02:00", 2)
+    payload = _block(
+        timestamps, [{"curve_type": "consumption", "values": ["0.5"] * 26}]
+    )
+    assert parse_daily_series(payload, "consumption") == [
+        DailyPoint(date(2026, 6, 1), 12.0),
+        DailyPoint(date(2026, 6, 2), 1.0),
+    ]
+
+
+def test_unparseable_timestamp_dropped(caplog):
+    payload = _block(
+        ["not-a-date", D2], [{"curve_type": "consumption", "values": ["1.0", "2.0"]}]
+    )
+    assert parse_daily_series(payload, "consumption") == [
+        DailyPoint(date(2026, 6, 2), 2.0)
+    ]
+    assert "not-a-date" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# Every curve type in one pass
+# ---------------------------------------------------------------------------
+def test_all_curve_types_from_one_pass(sample_curves):
+    curves = parse_daily_curves(sample_curves)
+    assert set(curves) == {"consumption", "surplus"}
+    for curve_type, series in curves.items():
+        assert series == parse_daily_series(sample_curves, curve_type)
+
+
+def test_format_change_warned_per_curve_type(caplog):
+    payload = _block(
+        [D1, D2],
+        [
+            {"curve_type": "consumption", "values": ["1.0", "2.0"]},
+            {"curve_type": "surplus", "values": ["n/a", "n/a"]},
+        ],
+    )
+    curves = parse_daily_curves(payload)
+    assert curves["consumption"] == [
+        DailyPoint(date(2026, 6, 1), 1.0),
+        DailyPoint(date(2026, 6, 2), 2.0),
+    ]
+    assert curves["surplus"] == []
+    assert "format may have changed" in caplog.text
+    assert "surplus" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# Per installation
+# ---------------------------------------------------------------------------
+def test_breakdown_keeps_each_installation_beside_the_total():
+    payload = _block(
+        [D1, D2],
+        None,
+        installations=[
+            {
+                "installation_id": "HOUSE",
+                "curves": [
+                    {"curve_type": "consumption", "values": ["1.0", "2.0"]},
+                    {"curve_type": "surplus", "values": ["0.5", None]},
+                ],
+            },
+            {
+                "installation_id": "HEAT_PUMP",
+                "curves": [{"curve_type": "consumption", "values": ["3.0", None]}],
+            },
+        ],
+    )
+    breakdown = parse_daily_breakdown(payload)
+    assert breakdown.total == parse_daily_curves(payload)
+    assert breakdown.total["consumption"] == [
+        DailyPoint(date(2026, 6, 1), 4.0),
+        DailyPoint(date(2026, 6, 2), 2.0),
+    ]
+    assert breakdown.installations["HEAT_PUMP"] == {
+        "consumption": [DailyPoint(date(2026, 6, 1), 3.0)]
+    }
+    assert breakdown.installations["HOUSE"]["surplus"] == [
+        DailyPoint(date(2026, 6, 1), 0.5)
+    ]
+
+
+def test_single_installation_has_no_breakdown(sample_curves):
+    breakdown = parse_daily_breakdown(sample_curves)
+    assert breakdown.total == parse_daily_curves(sample_curves)
+    assert breakdown.installations == {}
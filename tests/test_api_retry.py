@@ -0,0 +1,158 @@
+"""Tests for the retries and circuit breakers of the data endpoints in ``api.py``."""
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.romande_energie import api as api_module
+from custom_components.romande_energie.api import (
+    ENDPOINT_CURVES,
+    ApiError,
+    AuthError,
+    CannotConnect,
+    CircuitOpen,
+    RetryPolicy,
+    RomandeEnergieApiClient,
+)
+from custom_components.romande_energie.const import (
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_THRESHOLD,
+    CURVE_ENDPOINT,
+    CURVES_RETRY_ATTEMPTS,
+)
+
+URL = CURVE_ENDPOINT.format(contract_id="CONTRACT_TEST")
+START, END = "2026-06-01", "2026-06-06"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry at once, keeping the production cap on waits."""
+    monkeypatch.setitem(
+        api_module.RETRY_POLICIES,
+        ENDPOINT_CURVES,
+        RetryPolicy(CURVES_RETRY_ATTEMPTS, base_delay=0.0),
+    )
+
+
+def _answers(aioclient_mock: AiohttpClientMocker, *answers: Any) -> None:
+    """Answer the curves URL with ``answers`` in turn, the last one from then on.
+
+    Each is a status, an exception to raise, or a ``(status, headers)`` pair;
+    200 carries an empty curves list.
+    """
+    pending = list(answers)
+
+    async def answer(method: str, url: Any, data: Any) -> Any:
+        current = pending.pop(0) if len(pending) > 1 else pending[0]
+        if isinstance(current, Exception):
+            raise current
+        status, headers = current if isinstance(current, tuple) else (current, None)
+        return AiohttpClientMockResponse(
+            method, url, status=status, text=json.dumps([]), headers=headers
+        )
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(URL, side_effect=answer)
+
+
+async def _get(client: RomandeEnergieApiClient) -> list[dict[str, Any]]:
+    return await client.get_curves("token", "CONTRACT_TEST", START, END)
+
+
+async def test_transient_failures_are_retried(client, aioclient_mock) -> None:
+    _answers(aioclient_mock, HTTPStatus.SERVICE_UNAVAILABLE, TimeoutError(), HTTPStatus.OK)
+
+    assert await _get(client) == []
+    assert aioclient_mock.call_count == 3
+
+
+async def test_a_lasting_failure_surfaces_as_before(client, aioclient_mock) -> None:
+    _answers(aioclient_mock, HTTPStatus.BAD_GATEWAY)
+
+    with pytest.raises(ApiError):
+        await _get(client)
+    assert aioclient_mock.call_count == CURVES_RETRY_ATTEMPTS
+
+
+async def test_a_rejected_token_is_not_retried(client, aioclient_mock) -> None:
+    _answers(aioclient_mock, HTTPStatus.UNAUTHORIZED)
+
+    with pytest.raises(AuthError):
+        await _get(client)
+    assert aioclient_mock.call_count == 1
+
+
+async def test_a_long_retry_after_is_left_to_the_breaker(client, aioclient_mock) -> None:
+    """Waiting out an hour inside the poll would only hold the poll up."""
+    _answers(aioclient_mock, (HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "3600"}))
+
+    with pytest.raises(ApiError):
+        await _get(client)
+
+    assert aioclient_mock.call_count == 1
+    # Honoured from the first answer, not once BREAKER_THRESHOLD calls failed.
+    assert client.retry_in() == pytest.approx(3600, abs=1)
+    with pytest.raises(CircuitOpen):
+        await _get(client)
+    assert aioclient_mock.call_count == 1
+
+
+def test_retry_after_takes_seconds_or_a_date() -> None:
+    assert api_module._retry_after({"Retry-After": "120"}) == 120.0
+    later = datetime.now(tz=UTC) + timedelta(minutes=10)
+    seconds = api_module._retry_after({"Retry-After": format_datetime(later, usegmt=True)})
+    assert 590 <= seconds <= 600
+    assert api_module._retry_after({"Retry-After": "soon"}) is None
+    assert api_module._retry_after({}) is None
+
+
+def test_retry_after_is_bounded_by_the_longest_cooldown() -> None:
+    longest = BREAKER_MAX_COOLDOWN.total_seconds()
+    assert api_module._retry_after({"Retry-After": "1e17"}) == longest
+    assert api_module._retry_after({"Retry-After": "inf"}) is None
+    assert api_module._retry_after({"Retry-After": "nan"}) is None
+
+
+async def test_breaker_fails_fast_then_lets_a_trial_through(
+    client, aioclient_mock, freezer
+) -> None:
+    _answers(aioclient_mock, aiohttp.ClientConnectionError("portal down"))
+    for _ in range(BREAKER_THRESHOLD):
+        with pytest.raises(CannotConnect):
+            await _get(client)
+    requests = aioclient_mock.call_count
+
+    with pytest.raises(CircuitOpen):
+        await _get(client)
+    assert aioclient_mock.call_count == requests  # nothing was sent
+    assert client.retry_in() == pytest.approx(BREAKER_COOLDOWN.total_seconds())
+
+    freezer.tick(BREAKER_COOLDOWN)
+    _answers(aioclient_mock, HTTPStatus.OK)
+    assert await _get(client) == []
+    assert client.retry_in() == 0.0
+
+
+async def test_a_failed_trial_doubles_the_cooldown(client, aioclient_mock, freezer) -> None:
+    _answers(aioclient_mock, HTTPStatus.SERVICE_UNAVAILABLE)
+    for _ in range(BREAKER_THRESHOLD):
+        with pytest.raises(ApiError):
+            await _get(client)
+
+    freezer.tick(BREAKER_COOLDOWN)
+    with pytest.raises(ApiError):
+        await _get(client)
+
+    assert client.retry_in() == pytest.approx(2 * BREAKER_COOLDOWN.total_seconds())
@@ -0,0 +1,73 @@
+"""Tests for the latency-sized timeouts and time budgets in ``api.py``."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.romande_energie.api import (
+    ENDPOINT_CURVES,
+    ENDPOINT_REFRESH,
+    Deadline,
+    DeadlineExceeded,
+    LatencyTracker,
+)
+from custom_components.romande_energie.const import (
+    CURVE_ENDPOINT,
+    HTTP_TIMEOUT,
+    LATENCY_MIN_SAMPLES,
+    MIN_HTTP_TIMEOUT,
+    REFRESH_BUDGET,
+)
+
+URL = CURVE_ENDPOINT.format(contract_id="CONTRACT_TEST")
+
+
+def _tracker(*samples: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for sample in samples:
+        tracker.record(sample)
+    return tracker
+
+
+def test_full_timeout_until_enough_answers_are_in() -> None:
+    assert _tracker(*[0.5] * (LATENCY_MIN_SAMPLES - 1)).timeout() == HTTP_TIMEOUT
+
+
+def test_timeout_follows_the_tail_latency() -> None:
+    assert _tracker(*[0.5] * 20).timeout() == MIN_HTTP_TIMEOUT  # the floor
+    assert _tracker(*[0.5] * 18, 5.0, 5.0).timeout() == 15.0  # 3x the p95
+    assert _tracker(*[20.0] * 20).timeout() == HTTP_TIMEOUT  # the ceiling
+
+
+async def test_a_request_never_outlives_its_deadline(client) -> None:
+    client.latency[ENDPOINT_CURVES] = _tracker(*[20.0] * 20)
+    assert client._timeout(ENDPOINT_CURVES, Deadline(4.0)) == pytest.approx(4.0, abs=0.1)
+    assert client._timeout(ENDPOINT_CURVES, None) == HTTP_TIMEOUT
+
+
+async def test_a_refresh_waits_out_a_slow_portal(client) -> None:
+    # Fast so far: a data request would be given up on after the floor, but the
+    # refresh answering 12 s late has already burnt the token it was sent with.
+    for endpoint in (ENDPOINT_CURVES, ENDPOINT_REFRESH):
+        client.latency[endpoint] = _tracker(*[0.5] * 20)
+    assert client._timeout(ENDPOINT_CURVES, None) == MIN_HTTP_TIMEOUT
+    deadline = Deadline(REFRESH_BUDGET)
+    assert client._timeout(ENDPOINT_REFRESH, deadline) == HTTP_TIMEOUT
+    assert client._timeout(ENDPOINT_REFRESH, Deadline(4.0)) == pytest.approx(
+        4.0, abs=0.1
+    )
+
+
+async def test_spent_budget_sends_nothing(client, aioclient_mock) -> None:
+    aioclient_mock.get(URL, json=[])
+
+    with pytest.raises(DeadlineExceeded):
+        await client.get_curves(
+            "token", "CONTRACT_TEST", "2026-06-01", "2026-06-06", deadline=Deadline(0)
+        )
+    assert aioclient_mock.call_count == 0
+
+
+async def test_answers_feed_the_latency_tracker(client, aioclient_mock) -> None:
+    aioclient_mock.get(URL, json=[])
+    await client.get_curves("token", "CONTRACT_TEST", "2026-06-01", "2026-06-06")
+    assert client.latency[ENDPOINT_CURVES].percentile(0.5) is not None
@@ -0,0 +1,209 @@
+"""Tests for the history backfill in ``backfill.py``."""
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date, timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun import freeze_time
+from homeassistant.core import HomeAssistant
+
+from custom_components.romande_energie import coordinator as coordinator_module
+from custom_components.romande_energie.api import CannotConnect, RomandeEnergieApiClient
+from custom_components.romande_energie.backfill import _month_chunks, async_backfill
+from custom_components.romande_energie.const import DOMAIN, GRANULARITY_HOURLY
+from custom_components.romande_energie.coordinator import RomandeEnergieCoordinator
+
+from .conftest import FAKE_CONTRACT_ID
+
+TODAY = "2026-06-05 12:00:00"
+
+
+class _FakeRecorder:
+    """Stand-in for the recorder instance: runs the job inline."""
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+def _payload(start: str, end: str) -> list[dict[str, Any]]:
+    """1 kWh consumption for every day of [start, end) before "today"."""
+    day, stop = date.fromisoformat(start), date.fromisoformat(end)
+    timestamps, values = [], []
+    while day < stop:
+        timestamps.append(f"{day.isoformat()}T00:00:00+02:00")
+        values.append("1.0" if day < date(2026, 6, 5) else None)
+        day += timedelta(days=1)
+    return [
+        {
+            "timestamps": timestamps,
+            "installations": [{"curves": [{"curve_type": "consumption", "values": values}]}],
+        }
+    ]
+
+
+def _hourly_payload(start: str, end: str) -> list[dict[str, Any]]:
+    """``_payload`` by the hour: 0.5 kWh for every hour before "today"."""
+    day, stop = date.fromisoformat(start), date.fromisoformat(end)
+    timestamps, values = [], []
+    while day < stop:
+        for hour in range(24):
+            timestamps.append(f"{day.isoformat()}T{hour:02d}:00:00+02:00")
+            values.append("0.5" if day < date(2026, 6, 5) else None)
+        day += timedelta(days=1)
+    return [
+        {
+            "timestamps": timestamps,
+            "installations": [{"curves": [{"curve_type": "consumption", "values": values}]}],
+        }
+    ]
+
+
+@pytest.fixture
+def backfill_env(hass: HomeAssistant, config_entry, monkeypatch):
+    """A coordinator with a synthetic portal and the recorder stubbed out.
+
+    Yields ``(coordinator, rows)`` where ``rows`` collects every written
+    statistics row per statistic id, in write order.
+    """
+    config_entry.add_to_hass(hass)
+    client = AsyncMock(spec=RomandeEnergieApiClient)
+    client.get_curves.side_effect = lambda _token, _contract, start, end, **_kw: _payload(
+        start, end
+    )
+    coordinator = RomandeEnergieCoordinator(hass, config_entry, client)
+    coordinator.config_entry = config_entry  # see test_coordinator._make_coordinator
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator._access_token = "still-valid"
+    coordinator._token_exp = int(time.time()) + 10 * 365 * 86400
+    rows: dict[str, list[dict[str, Any]]] = {}
+
+    monkeypatch.setattr(coordinator_module, "get_instance", lambda _hass: _FakeRecorder())
+    monkeypatch.setattr(
+        coordinator_module, "statistics_during_period", lambda *_args, **_kw: {}
+    )
+    monkeypatch.setattr(coordinator_module, "get_last_statistics", lambda *_args: {})
+    monkeypatch.setattr(
+        coordinator_module,
+        "async_add_external_statistics",
+        lambda _hass, metadata, points: rows.setdefault(
+            metadata["statistic_id"], []
+        ).extend(points),
+    )
+    return coordinator, rows
+
+
+def test_month_chunks_split_at_month_starts():
+    assert list(_month_chunks(date(2025, 11, 20), date(2026, 2, 3))) == [
+        (date(2025, 11, 20), date(2025, 12, 1)),
+        (date(2025, 12, 1), date(2026, 1, 1)),
+        (date(2026, 1, 1), date(2026, 2, 1)),
+        (date(2026, 2, 1), date(2026, 2, 3)),
+    ]
+
+
+async def test_sums_run_on_across_chunks(backfill_env) -> None:
+    coordinator, rows = backfill_env
+
+    with freeze_time(TODAY):
+        await async_backfill(coordinator, date(2026, 4, 15), 2)
+
+    written = rows[coordinator.contracts[FAKE_CONTRACT_ID].stat_id_consumption]
+    days = [row["start"].date() for row in written]
+    assert days[0] == date(2026, 4, 15)
+    assert days[-1] == date(2026, 6, 4)  # stops at the newest published day
+    assert days == sorted(set(days))  # contiguous, no day written twice
+    assert len(days) == 51
+    assert [row["sum"] for row in written] == [float(n) for n in range(1, 52)]
+    # No surplus curve on this account, so no surplus statistic either.
+    assert coordinator.contracts[FAKE_CONTRACT_ID].stat_id_surplus not in rows
+    coordinator.async_request_refresh.assert_awaited_once()
+
+
+async def test_an_hourly_entry_is_backfilled_into_its_hourly_statistics(
+    backfill_env,
+) -> None:
+    coordinator, rows = backfill_env
+    coordinator.granularity = GRANULARITY_HOURLY
+    coordinator.client.get_curves.side_effect = (
+        lambda _token, _contract, start, end, **_kw: _hourly_payload(start, end)
+    )
+
+    with freeze_time(TODAY):
+        await async_backfill(coordinator, date(2026, 5, 30), 2)
+
+    assert {
+        call.kwargs["granularity"]
+        for call in coordinator.client.get_curves.await_args_list
+    } == {GRANULARITY_HOURLY}
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    assert contract.stat_id_consumption not in rows  # the daily one stays as it was
+    written = rows[contract.stat_id_consumption_hourly]
+    hours = [row["start"] for row in written]
+    assert len(hours) == 6 * 24  # May 30 .. June 4, one row per hour
+    assert all(b - a == timedelta(hours=1) for a, b in zip(hours, hours[1:]))
+    assert [row["sum"] for row in written] == [n / 2 for n in range(1, 6 * 24 + 1)]
+
+
+async def test_fetches_stay_within_the_concurrency_limit(backfill_env) -> None:
+    coordinator, _rows = backfill_env
+    in_flight = peak = 0
+
+    async def slow_curves(_token, _contract, start, end, **_kw):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return _payload(start, end)
+
+    coordinator.client.get_curves.side_effect = slow_curves
+
+    with freeze_time(TODAY):
+        await async_backfill(coordinator, date(2024, 1, 1), 3)
+
+    assert coordinator.client.get_curves.await_count == 30  # Jan 2024 .. Jun 2026
+    assert peak <= 3
+
+
+async def test_an_interrupted_run_resumes_from_its_checkpoint(
+    backfill_env, hass_storage
+) -> None:
+    coordinator, rows = backfill_env
+    key = f"{DOMAIN}.backfill.{coordinator.config_entry.entry_id}"
+    stat_id = coordinator.contracts[FAKE_CONTRACT_ID].stat_id_consumption
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        "data": {"start": "2026-04-15", "next": "2026-06-01", "sums": {stat_id: 47.0}},
+    }
+
+    with freeze_time(TODAY):
+        await async_backfill(coordinator, date(2026, 4, 15), 2)
+
+    coordinator.client.get_curves.assert_awaited_once()
+    assert [row["sum"] for row in rows[stat_id]] == [48.0, 49.0, 50.0, 51.0]
+    assert key not in hass_storage  # finished: nothing left to resume
+
+
+async def test_a_failed_chunk_keeps_the_checkpoint(backfill_env, hass_storage) -> None:
+    coordinator, rows = backfill_env
+    key = f"{DOMAIN}.backfill.{coordinator.config_entry.entry_id}"
+
+    def flaky(_token, _contract, start, end, **_kw):
+        if start == "2026-06-01":
+            raise CannotConnect("network down")
+        return _payload(start, end)
+
+    coordinator.client.get_curves.side_effect = flaky
+
+    with freeze_time(TODAY):
+        await async_backfill(coordinator, date(2026, 4, 15), 1)
+
+    assert hass_storage[key]["data"]["next"] == "2026-06-01"
+    stat_id = coordinator.contracts[FAKE_CONTRACT_ID].stat_id_consumption
+    assert hass_storage[key]["data"]["sums"] == {stat_id: 47.0}
+    coordinator.async_request_refresh.assert_not_called()
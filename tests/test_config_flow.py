@@ -13,8 +13,11 @@ from custom_components.romande_energie.api import AuthError, OtpError
 from custom_components.romande_energie.const import (
     CONF_ACCOUNT_ID,
     CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
+    CONF_GRANULARITY,
     CONF_REFRESH_TOKEN,
     DOMAIN,
+    GRANULARITY_HOURLY,
 )
 
 from .conftest import (
@@ -117,11 +120,34 @@ async def test_full_flow_creates_entry(hass: HomeAssistant) -> None:
         CONF_PASSWORD: FAKE_PASSWORD,
         CONF_ACCOUNT_ID: "ACCT_TEST",
         CONF_CONTRACT_ID: "CONTRACT_TEST",
+        CONF_CONTRACT_IDS: ["CONTRACT_TEST"],
         CONF_REFRESH_TOKEN: "REFRESH_TEST",
     }
     client.send_otp.assert_awaited_once()
 
 
+async def test_numeric_contract_ids_are_stored_as_strings(hass: HomeAssistant) -> None:
+    client = _client_mock(contracts=[{"id": 1001}, {"id": 1002}])
+
+    with patch(_CLIENT_PATH, return_value=client), _patch_setup():
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_USERNAME: FAKE_USERNAME, CONF_PASSWORD: FAKE_PASSWORD},
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"otp_code": "123456"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    # The entry's own contract must match its entry in the list.
+    assert result["data"][CONF_CONTRACT_ID] == "1001"
+    assert result["data"][CONF_CONTRACT_IDS] == ["1001", "1002"]
+
+
 # ---------------------------------------------------------------------------
 # Error paths
 # ---------------------------------------------------------------------------
@@ -248,3 +274,22 @@ async def test_reauth_unique_id_mismatch_aborts(hass: HomeAssistant) -> None:
 
     assert result["type"] is FlowResultType.ABORT
     assert result["reason"] == "unique_id_mismatch"
+
+
+# ---------------------------------------------------------------------------
+# Options
+# ---------------------------------------------------------------------------
+async def test_options_flow_sets_the_granularity(hass: HomeAssistant) -> None:
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_GRANULARITY: GRANULARITY_HOURLY}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_GRANULARITY: GRANULARITY_HOURLY}
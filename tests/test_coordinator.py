@@ -1,29 +1,44 @@
 """Tests for the coordinator's token handling and poll orchestration."""
 from __future__ import annotations
 
+import asyncio
 import time
-from datetime import date
-from unittest.mock import AsyncMock
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
 from freezegun import freeze_time
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.romande_energie import coordinator as coordinator_module
 from custom_components.romande_energie.api import (
     ApiError,
     AuthError,
     CannotConnect,
+    CircuitOpen,
     DailyPoint,
+    HourlyPoint,
     RefreshError,
     RomandeEnergieApiClient,
 )
 from custom_components.romande_energie.const import (
+    ADAPTIVE_MAX_INTERVAL,
+    CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
+    CONF_GRANULARITY,
     CONF_REFRESH_TOKEN,
+    FULL_FETCH_INTERVAL,
+    GRANULARITY_HOURLY,
+    KEEPALIVE_MARGIN,
+    KEEPALIVE_RETRY_INTERVAL,
     POLL_RETRY_INTERVAL,
     REFRESH_ATTEMPTS,
+    TZ,
     UPDATE_INTERVAL,
 )
 from custom_components.romande_energie.coordinator import (
@@ -31,7 +46,7 @@ from custom_components.romande_energie.coordinator import (
     RomandeEnergieData,
 )
 
-from .conftest import make_jwt
+from .conftest import FAKE_CONTRACT_ID, build_config_entry, make_jwt
 
 
 def _make_coordinator(hass, entry, client) -> RomandeEnergieCoordinator:
@@ -44,10 +59,23 @@ def _make_coordinator(hass, entry, client) -> RomandeEnergieCoordinator:
     return coordinator
 
 
+def _stats_written(calls) -> dict[str, Any]:
+    """The series each mocked ``_insert_statistics_batch`` call got, by statistic id."""
+    return {
+        stat_id: series
+        for call in calls
+        for stat_id, _name, series in call.args[0]
+    }
+
+
 @pytest.fixture
 def client() -> AsyncMock:
     """An async mock standing in for the real API client."""
-    return AsyncMock(spec=RomandeEnergieApiClient)
+    client = AsyncMock(spec=RomandeEnergieApiClient)
+    client.retry_in = MagicMock(return_value=0.0)  # no circuit open
+    client.received_bytes = MagicMock(return_value=0)
+    client.statuses = MagicMock(return_value=Counter())
+    return client
 
 
 @pytest.fixture(autouse=True)
@@ -84,7 +112,7 @@ async def test_ensure_token_refreshes_and_persists_rotated_token(
 
     await coordinator._ensure_token()
 
-    client.refresh.assert_awaited_once_with("REFRESH_TEST")
+    client.refresh.assert_awaited_once_with("REFRESH_TEST", deadline=ANY)
     assert coordinator._access_token == new_access
     assert coordinator._refresh_token == "REFRESH_ROTATED"
     # The rotated refresh token is persisted back onto the config entry.
@@ -136,6 +164,119 @@ async def test_ensure_token_gives_up_after_the_attempt_budget(
     assert client.refresh.await_count == REFRESH_ATTEMPTS
 
 
+async def test_ensure_token_stops_retrying_when_its_budget_is_spent(
+    hass: HomeAssistant, config_entry, client, monkeypatch
+) -> None:
+    """A slow portal must not stretch a rotation past REFRESH_BUDGET."""
+    monkeypatch.setattr(coordinator_module, "REFRESH_BUDGET", 0.0)
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.refresh.side_effect = CannotConnect("timed out")
+
+    with pytest.raises(CannotConnect):
+        await coordinator._ensure_token()
+
+    assert client.refresh.await_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Keepalive
+# ---------------------------------------------------------------------------
+def _rotated(ttl: int = 900) -> dict[str, str]:
+    """A refresh answer whose access token lives ``ttl`` seconds from now."""
+    return {
+        "access_token": make_jwt(exp=int(time.time()) + ttl),
+        "refresh_token": "REFRESH_ROTATED",
+    }
+
+
+async def _advance(hass: HomeAssistant, freezer, seconds: float) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_keepalive_rotates_before_expiry_without_polling(
+    hass: HomeAssistant, config_entry, client, freezer
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    coordinator._keepalive_margin = KEEPALIVE_MARGIN  # no offset for this entry
+    coordinator._access_token = "current"
+    coordinator._token_exp = int(time.time()) + 600
+    client.refresh.side_effect = lambda _token, **_kw: _rotated()
+    stop = coordinator.async_start_keepalive()
+
+    await _advance(hass, freezer, 600 - KEEPALIVE_MARGIN - 30)
+    client.refresh.assert_not_called()
+
+    await _advance(hass, freezer, 31)
+    assert client.refresh.await_count == 1
+    assert config_entry.data[CONF_REFRESH_TOKEN] == "REFRESH_ROTATED"
+
+    # The next deadline follows the rotated token, not the old one.
+    await _advance(hass, freezer, 900 - KEEPALIVE_MARGIN + 1)
+    assert client.refresh.await_count == 2
+    client.get_curves.assert_not_called()
+
+    stop()
+    await _advance(hass, freezer, 3600)
+    assert client.refresh.await_count == 2
+
+
+async def test_the_first_keepalive_is_shifted_by_the_entry_offset(
+    hass: HomeAssistant, config_entry, client, freezer
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    coordinator._keepalive_margin = KEEPALIVE_MARGIN + 180  # a 3-minute offset
+    coordinator._access_token = "current"
+    coordinator._token_exp = int(time.time()) + 900
+    client.refresh.side_effect = lambda _token, **_kw: _rotated()
+    stop = coordinator.async_start_keepalive()
+
+    # Three minutes early, never late: the token must not lapse.
+    await _advance(hass, freezer, 900 - KEEPALIVE_MARGIN - 180 + 1)
+    assert client.refresh.await_count == 1
+    # The rotations after it keep to the token's own deadline.
+    await _advance(hass, freezer, 900 - KEEPALIVE_MARGIN - 1)
+    assert client.refresh.await_count == 1
+    await _advance(hass, freezer, 2)
+    assert client.refresh.await_count == 2
+    stop()
+
+
+async def test_failed_keepalive_is_retried_soon(
+    hass: HomeAssistant, config_entry, client, freezer
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.refresh.side_effect = CannotConnect("network down")
+    stop = coordinator.async_start_keepalive()  # no token yet: due at once
+
+    await _advance(hass, freezer, 1)
+    assert client.refresh.await_count == REFRESH_ATTEMPTS
+
+    client.refresh.side_effect = None
+    client.refresh.return_value = _rotated()
+    await _advance(hass, freezer, KEEPALIVE_RETRY_INTERVAL.total_seconds() + 1)
+    assert client.refresh.await_count == REFRESH_ATTEMPTS + 1
+    assert config_entry.data[CONF_REFRESH_TOKEN] == "REFRESH_ROTATED"
+    stop()
+
+
+async def test_rejected_keepalive_starts_reauth_and_stops(
+    hass: HomeAssistant, config_entry, client, freezer, monkeypatch
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    start_reauth = MagicMock()
+    monkeypatch.setattr(config_entry, "async_start_reauth", start_reauth)
+    client.refresh.side_effect = RefreshError("refresh token dead")
+    coordinator.async_start_keepalive()
+
+    await _advance(hass, freezer, 1)
+    start_reauth.assert_called_once_with(hass)
+
+    await _advance(hass, freezer, 3600)
+    assert client.refresh.await_count == 1
+
+
 # ---------------------------------------------------------------------------
 # _async_update_data
 # ---------------------------------------------------------------------------
@@ -165,9 +306,66 @@ async def test_update_cannot_connect_maps_to_update_failed(
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()
 
-    # A failed poll leaves the refresh token un-rotated, so the next attempt has
-    # to land well inside its ~30 min TTL rather than a whole interval later.
-    assert coordinator.update_interval == POLL_RETRY_INTERVAL
+    # Sooner than a whole interval later, shifted by the entry's offset.
+    assert coordinator.update_interval == POLL_RETRY_INTERVAL + coordinator._poll_offset
+
+
+async def test_an_open_circuit_holds_the_next_poll_back(
+    hass: HomeAssistant, config_entry, client
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    coordinator._access_token = "still-valid"
+    coordinator._token_exp = int(time.time()) + 3600
+    client.get_curves.side_effect = CircuitOpen("curves", 1800.0)
+    client.retry_in.return_value = 1800.0
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert coordinator.update_interval == (
+        timedelta(seconds=1800) + coordinator._poll_offset
+    )
+
+
+async def test_polls_are_timed_stage_by_stage(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    client.received_bytes.side_effect = [1000, 5096]
+    client.statuses.side_effect = [
+        Counter({"curves 200": 4}),
+        Counter({"curves 200": 5}),
+    ]
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+
+    last = coordinator.timings.last
+    assert set(last.stages) == {"token", "curves", "parse", "total"}
+    assert last.payload_bytes == 4096
+    assert last.statuses == {"curves 200": 1}
+    assert last.points_parsed == 8  # four days of each curve type
+    assert last.error is None
+
+
+async def test_a_failed_poll_is_timed_too(
+    hass: HomeAssistant, config_entry, client
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    coordinator._access_token = "still-valid"
+    coordinator._token_exp = int(time.time()) + 3600
+    client.get_curves.side_effect = CannotConnect("network down")
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert set(coordinator.timings.last.stages) == {"token", "curves", "total"}
+    assert coordinator.timings.last.error == "UpdateFailed: network down"
+    assert coordinator.timings.percentile("curves") is not None
 
 
 async def test_successful_update_restores_the_poll_interval(
@@ -176,14 +374,14 @@ async def test_successful_update_restores_the_poll_interval(
     coordinator = _make_coordinator(hass, config_entry, client)
     coordinator.update_interval = POLL_RETRY_INTERVAL  # as a previous failure left it
     client.get_curves.return_value = sample_curves
-    coordinator._insert_statistics = AsyncMock()
+    coordinator._insert_statistics_batch = AsyncMock()
 
     with freeze_time("2026-06-05 12:00:00"):
         coordinator._access_token = "still-valid"
         coordinator._token_exp = int(time.time()) + 3600
         await coordinator._async_update_data()
 
-    assert coordinator.update_interval == UPDATE_INTERVAL
+    assert coordinator.update_interval == UPDATE_INTERVAL + coordinator._poll_offset
 
 
 async def test_update_survives_statistics_failure(
@@ -192,14 +390,14 @@ async def test_update_survives_statistics_failure(
     coordinator = _make_coordinator(hass, config_entry, client)
     client.get_curves.return_value = sample_curves
     # Statistics are best-effort: a raising writer must not fail the update.
-    coordinator._insert_statistics = AsyncMock(side_effect=RuntimeError("boom"))
+    coordinator._insert_statistics_batch = AsyncMock(side_effect=RuntimeError("boom"))
 
     # Freeze "now" the day after the fixture's newest parsed day, so the
     # calendar-month totals are deterministic and that day counts as unsettled.
     with freeze_time("2026-06-05 12:00:00"):
         coordinator._access_token = "still-valid"
         coordinator._token_exp = int(time.time()) + 3600
-        data = await coordinator._async_update_data()
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
 
     assert isinstance(data, RomandeEnergieData)
     assert data.consumption is not None
@@ -219,22 +417,23 @@ async def test_statistics_go_to_their_own_ids(
     """Folding surplus into the consumption meter would double the dashboard."""
     coordinator = _make_coordinator(hass, config_entry, client)
     client.get_curves.return_value = sample_curves
-    coordinator._insert_statistics = AsyncMock()
+    coordinator._insert_statistics_batch = AsyncMock()
 
     with freeze_time("2026-06-05 12:00:00"):
         coordinator._access_token = "still-valid"
         coordinator._token_exp = int(time.time()) + 3600
         await coordinator._async_update_data()
 
-    written = {call.args[0]: call.args[2] for call in coordinator._insert_statistics.await_args_list}
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    written = _stats_written(coordinator._insert_statistics_batch.await_args_list)
     assert set(written) == {
-        coordinator._stat_id_consumption,
-        coordinator._stat_id_surplus,
+        contract.stat_id_consumption,
+        contract.stat_id_surplus,
     }
-    assert written[coordinator._stat_id_consumption][-1] == DailyPoint(
+    assert written[contract.stat_id_consumption].latest() == DailyPoint(
         date(2026, 6, 4), 12.0
     )
-    assert written[coordinator._stat_id_surplus][-1] == DailyPoint(
+    assert written[contract.stat_id_surplus].latest() == DailyPoint(
         date(2026, 6, 4), 3.25
     )
 
@@ -245,14 +444,14 @@ async def test_settled_keeps_the_newest_day_when_the_portal_lags(
     """A day the portal stopped advancing days ago is final, not partial."""
     coordinator = _make_coordinator(hass, config_entry, client)
     client.get_curves.return_value = sample_curves
-    coordinator._insert_statistics = AsyncMock()
+    coordinator._insert_statistics_batch = AsyncMock()
 
     # A week past the newest day in the fixture: later syncs have had every
     # chance to complete Jun 4, so dropping it would just lose a real reading.
     with freeze_time("2026-06-11 12:00:00"):
         coordinator._access_token = "still-valid"
         coordinator._token_exp = int(time.time()) + 3600
-        data = await coordinator._async_update_data()
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
 
     assert data.consumption == DailyPoint(date(2026, 6, 4), 12.0)
 
@@ -273,14 +472,388 @@ async def test_update_reports_surplus_before_any_day_has_settled(
         }
     ]
     client.get_curves.return_value = one_day
-    coordinator._insert_statistics = AsyncMock()
+    coordinator._insert_statistics_batch = AsyncMock()
 
     with freeze_time("2026-06-01 12:00:00"):  # that single day is today's
         coordinator._access_token = "still-valid"
         coordinator._token_exp = int(time.time()) + 3600
-        data = await coordinator._async_update_data()
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
 
     assert data.consumption is None
     assert data.surplus is None
     assert data.consumption_month_total == 10.5
     assert data.has_surplus is True
+
+
+# ---------------------------------------------------------------------------
+# Delta fetching
+# ---------------------------------------------------------------------------
+def _requested_range(client) -> tuple[str, str]:
+    """The (start, end) dates of the most recent curves request."""
+    _token, _contract, start, end = client.get_curves.await_args.args
+    return start, end
+
+
+async def test_first_poll_fetches_the_whole_window(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+
+    assert _requested_range(client) == ("2026-05-06", "2026-06-06")
+
+
+async def test_later_polls_only_fetch_the_open_days(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    """Settled days come from the held window, not from the portal again."""
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+
+        # The portal completes Jun 4 and publishes Jun 5; the delta only
+        # carries the days from Jun 3 on.
+        client.get_curves.return_value = [
+            {
+                "timestamps": [
+                    "2026-06-03T00:00:00+02:00",
+                    "2026-06-04T00:00:00+02:00",
+                    "2026-06-05T00:00:00+02:00",
+                ],
+                "installations": [
+                    {
+                        "curves": [
+                            {"curve_type": "consumption", "values": ["9.25", "14.0", "2.0"]},
+                            {"curve_type": "surplus", "values": ["0.0", "3.25", None]},
+                        ]
+                    }
+                ],
+            }
+        ]
+        frozen.tick(1200)
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
+
+    assert _requested_range(client) == ("2026-06-03", "2026-06-06")
+    # Jun 1-2 were kept from the first fetch; Jun 4 took the corrected value.
+    assert data.consumption_month_total == 10.5 + 11.0 + 9.25 + 14.0 + 2.0
+    assert data.consumption == DailyPoint(date(2026, 6, 4), 14.0)
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    written = _stats_written(coordinator._insert_statistics_batch.await_args_list[-1:])
+    assert [p.day for p in written[contract.stat_id_consumption]] == [
+        date(2026, 6, d) for d in range(1, 6)
+    ]
+
+
+async def test_a_publication_is_learnt_and_polling_backs_off(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    """Once today's values have moved, the next poll waits for tomorrow's window."""
+    coordinator = _make_coordinator(hass, config_entry, client)
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    for day in (2, 3, 4):
+        contract.publish.observe(datetime(2026, 6, day, 8, 0, tzinfo=TZ))
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+        # Nothing seen today yet, and the window is past: keep checking.
+        assert coordinator.update_interval == UPDATE_INTERVAL + coordinator._poll_offset
+
+        frozen.tick(1200)
+        await coordinator._async_update_data()
+        assert len(contract.publish.observed) == 3  # the same answer again
+
+        client.get_curves.return_value = [
+            {
+                "timestamps": ["2026-06-05T00:00:00+02:00"],
+                "installations": [
+                    {"curves": [{"curve_type": "consumption", "values": ["2.0"]}]}
+                ],
+            }
+        ]
+        frozen.tick(1200)
+        await coordinator._async_update_data()
+
+    assert contract.publish.settled(date(2026, 6, 5))
+    # Only the first poll after setup is shifted by the entry's offset.
+    assert coordinator.update_interval == ADAPTIVE_MAX_INTERVAL
+
+
+async def test_delta_reaches_back_to_a_lagging_newest_day(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    """A portal a week behind may still be completing its newest day."""
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-11 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+        frozen.tick(1200)
+        await coordinator._async_update_data()
+
+    assert _requested_range(client) == ("2026-06-04", "2026-06-12")
+
+
+async def test_whole_window_is_refetched_after_the_full_fetch_interval(
+    hass: HomeAssistant, config_entry, client, sample_curves
+) -> None:
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600 * 24
+        await coordinator._async_update_data()
+        frozen.tick(FULL_FETCH_INTERVAL.total_seconds())
+        await coordinator._async_update_data()
+
+    assert _requested_range(client) == ("2026-05-06", "2026-06-06")
+
+
+async def test_unchanged_answer_is_not_parsed_again(
+    hass: HomeAssistant, config_entry, client, sample_curves, monkeypatch
+) -> None:
+    """The client returns the kept list on a 304 / identical body."""
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+    parse = MagicMock(wraps=coordinator_module.api.parse_daily_breakdown)
+    monkeypatch.setattr(coordinator_module.api, "parse_daily_breakdown", parse)
+
+    with freeze_time("2026-06-05 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        first = await coordinator._async_update_data()
+        parsed = parse.call_count
+        frozen.tick(1200)
+        second = await coordinator._async_update_data()
+
+    assert parse.call_count == parsed
+    assert second == first
+
+
+# ---------------------------------------------------------------------------
+# Hourly granularity
+# ---------------------------------------------------------------------------
+async def test_hourly_entry_writes_hourly_statistics_and_daily_sensors(
+    hass: HomeAssistant, client
+) -> None:
+    entry = build_config_entry(options={CONF_GRANULARITY: GRANULARITY_HOURLY})
+    coordinator = _make_coordinator(hass, entry, client)
+    timestamps = [
+        f"2026-06-0{day}T{hour:02d}:00:00+02:00" for day in (3, 4) for hour in range(24)
+    ]
+    client.get_curves.return_value = [
+        {
+            "timestamps": timestamps,
+            "installations": [
+                {"curves": [{"curve_type": "consumption", "values": ["0.5"] * 48}]}
+            ],
+        }
+    ]
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
+
+    assert client.get_curves.await_args.kwargs["granularity"] == GRANULARITY_HOURLY
+    ((stat_id, _name, series),) = coordinator._insert_statistics_batch.await_args.args[0]
+    # Never the daily statistic: a later switch back would leave these hours
+    # behind, with sums below the daily rows'.
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    assert stat_id == contract.stat_id_consumption_hourly
+    assert stat_id != contract.stat_id_consumption
+    assert len(series) == 48
+    assert all(isinstance(point, HourlyPoint) for point in series)
+    assert data.consumption == DailyPoint(date(2026, 6, 3), 12.0)
+
+
+# ---------------------------------------------------------------------------
+# Several contracts
+# ---------------------------------------------------------------------------
+async def test_every_contract_is_polled_on_one_token_rotation(
+    hass: HomeAssistant, client, sample_curves
+) -> None:
+    entry = build_config_entry(data={CONF_CONTRACT_IDS: [FAKE_CONTRACT_ID, "OTHER"]})
+    coordinator = _make_coordinator(hass, entry, client)
+    client.refresh.return_value = {
+        "access_token": make_jwt(exp=int(time.time()) + 3600),
+        "refresh_token": "rotated",
+    }
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00"):
+        data = await coordinator._async_update_data()
+
+    client.refresh.assert_awaited_once()
+    assert {call.args[1] for call in client.get_curves.await_args_list} == {
+        FAKE_CONTRACT_ID,
+        "OTHER",
+    }
+    assert set(data) == {FAKE_CONTRACT_ID, "OTHER"}
+    assert data["OTHER"].consumption == DailyPoint(date(2026, 6, 3), 9.25)
+    # Both contracts' statistics go to the recorder in the one batch.
+    coordinator._insert_statistics_batch.assert_awaited_once()
+    written = _stats_written(coordinator._insert_statistics_batch.await_args_list)
+    assert set(written) == {
+        stat_id
+        for contract in coordinator.contracts.values()
+        for stat_id in (contract.stat_id_consumption, contract.stat_id_surplus)
+    }
+
+
+async def test_contract_fetches_stay_within_the_concurrency_cap(
+    hass: HomeAssistant, client, sample_curves, monkeypatch
+) -> None:
+    monkeypatch.setattr(coordinator_module, "CONTRACT_FETCH_CONCURRENCY", 2)
+    contract_ids = [f"C{n}" for n in range(5)]
+    entry = build_config_entry(
+        data={CONF_CONTRACT_ID: contract_ids[0], CONF_CONTRACT_IDS: contract_ids}
+    )
+    coordinator = _make_coordinator(hass, entry, client)
+    coordinator._insert_statistics_batch = AsyncMock()
+    in_flight = peak = 0
+
+    async def slow_curves(*_args, **_kw):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return sample_curves
+
+    client.get_curves.side_effect = slow_curves
+
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        data = await coordinator._async_update_data()
+
+    assert client.get_curves.await_count == 5
+    assert peak == 2
+    assert list(data) == contract_ids
+
+
+async def test_one_rejected_contract_fetch_asks_for_reauth(
+    hass: HomeAssistant, client
+) -> None:
+    entry = build_config_entry(data={CONF_CONTRACT_IDS: [FAKE_CONTRACT_ID, "OTHER"]})
+    coordinator = _make_coordinator(hass, entry, client)
+
+    async def curves(_token, contract_id, *_args, **_kw):
+        if contract_id == "OTHER":
+            raise AuthError("token rejected")
+        raise CannotConnect("network down")
+
+    client.get_curves.side_effect = curves
+    coordinator._access_token = "still-valid"
+    coordinator._token_exp = int(time.time()) + 3600
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+
+
+async def test_entry_without_a_contract_list_learns_it_once(
+    hass: HomeAssistant, client, sample_curves
+) -> None:
+    """Entries from before multi-contract support only knew their first contract."""
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    legacy = {k: v for k, v in entry.data.items() if k != CONF_CONTRACT_IDS}
+    hass.config_entries.async_update_entry(entry, data=legacy)
+    coordinator = RomandeEnergieCoordinator(hass, entry, client)
+    coordinator.config_entry = entry
+    client.get_contracts.return_value = [{"id": "OTHER"}, {"id": FAKE_CONTRACT_ID}]
+    client.get_curves.return_value = sample_curves
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00") as frozen:
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+        frozen.tick(1200)
+        data = await coordinator._async_update_data()
+
+    client.get_contracts.assert_awaited_once()
+    # The entry's own contract stays first: it names the entry and its device.
+    assert entry.data[CONF_CONTRACT_IDS] == [FAKE_CONTRACT_ID, "OTHER"]
+    assert list(data) == [FAKE_CONTRACT_ID, "OTHER"]
+
+
+async def test_each_installation_gets_its_own_statistics_and_snapshot(
+    hass: HomeAssistant, config_entry, client
+) -> None:
+    """Per-installation figures come from the same answer as the totals."""
+    coordinator = _make_coordinator(hass, config_entry, client)
+    client.get_curves.return_value = [
+        {
+            "timestamps": [
+                "2026-06-02T00:00:00+02:00",
+                "2026-06-03T00:00:00+02:00",
+                "2026-06-04T00:00:00+02:00",
+            ],
+            "installations": [
+                {
+                    "installation_id": "HOUSE",
+                    "curves": [
+                        {"curve_type": "consumption", "values": ["4.0", "5.0", "1.0"]},
+                        {"curve_type": "surplus", "values": ["1.0", "2.0", None]},
+                    ],
+                },
+                {
+                    "installation_id": "HEAT_PUMP",
+                    "curves": [
+                        {"curve_type": "consumption", "values": ["6.0", "7.0", "2.0"]}
+                    ],
+                },
+            ],
+        }
+    ]
+    coordinator._insert_statistics_batch = AsyncMock()
+
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "still-valid"
+        coordinator._token_exp = int(time.time()) + 3600
+        data = (await coordinator._async_update_data())[FAKE_CONTRACT_ID]
+
+    client.get_curves.assert_awaited_once()
+    assert data.consumption == DailyPoint(date(2026, 6, 3), 12.0)
+    assert set(data.installations) == {"HOUSE", "HEAT_PUMP"}
+    assert data.installations["HOUSE"].consumption == DailyPoint(date(2026, 6, 3), 5.0)
+    assert data.installations["HOUSE"].has_surplus is True
+    assert data.installations["HEAT_PUMP"].consumption_month_total == 15.0
+    assert data.installations["HEAT_PUMP"].has_surplus is False
+
+    contract = coordinator.contracts[FAKE_CONTRACT_ID]
+    written = _stats_written(coordinator._insert_statistics_batch.await_args_list)
+    assert set(written) == {
+        contract.stat_id_consumption,
+        contract.stat_id_surplus,
+        contract.installations["HOUSE"].stat_id_consumption,
+        contract.installations["HOUSE"].stat_id_surplus,
+        contract.installations["HEAT_PUMP"].stat_id_consumption,
+    }
+    assert contract.installations["HEAT_PUMP"].stat_id_consumption == (
+        "romande_energie:contract_test_heat_pump_consumption"
+    )
@@ -7,23 +7,33 @@ dashboard would read as a meter reset.
 """
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
 from homeassistant.components.recorder.statistics import valid_statistic_id
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.romande_energie import coordinator as coordinator_module
-from custom_components.romande_energie.api import DailyPoint, RomandeEnergieApiClient
-from custom_components.romande_energie.const import CONF_CONTRACT_ID, TZ
+from custom_components.romande_energie.api import (
+    DailyPoint,
+    HourlyPoint,
+    RomandeEnergieApiClient,
+)
+from custom_components.romande_energie.const import (
+    CONF_CONTRACT_ID,
+    STATS_SAVE_DELAY,
+    TZ,
+)
 from custom_components.romande_energie.coordinator import (
     EPOCH,
     RomandeEnergieCoordinator,
 )
 
-from .conftest import build_config_entry
+from .conftest import FAKE_CONTRACT_ID, build_config_entry
 
 STAT_ID = "romande_energie:contract_test_consumption"
 
@@ -41,15 +51,22 @@ def stats_env(hass: HomeAssistant, config_entry, monkeypatch):
 
     Yields ``(coordinator, captured)``. ``captured["responses"]`` is the queue
     of results the period query returns, one per call, so a test can answer the
-    narrow probe and the wide fallback differently. ``captured["calls"]``
-    collects every ``async_add_external_statistics`` call and
-    ``captured["queries"]`` every period query.
+    narrow probe and the bounded search differently; ``captured["last"]`` is
+    the newest stored row, if any. ``captured["calls"]`` collects every
+    ``async_add_external_statistics`` call, ``captured["queries"]`` every
+    period query and ``captured["last_queries"]`` every newest-row lookup.
     """
     config_entry.add_to_hass(hass)
     coordinator = RomandeEnergieCoordinator(
         hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
     )
-    captured: dict[str, Any] = {"calls": [], "queries": [], "responses": []}
+    captured: dict[str, Any] = {
+        "calls": [],
+        "queries": [],
+        "responses": [],
+        "last": None,
+        "last_queries": [],
+    }
 
     def fake_period(hass_arg, start, end, *, statistic_ids, period, units, types):
         captured["queries"].append(
@@ -65,7 +82,13 @@ def stats_env(hass: HomeAssistant, config_entry, monkeypatch):
             return {}
         return captured["responses"].pop(0)
 
+    def fake_last(hass_arg, number_of_stats, statistic_id, convert_units, types):
+        captured["last_queries"].append(statistic_id)
+        last = captured["last"]
+        return {} if last is None else {statistic_id: [last]}
+
     monkeypatch.setattr(coordinator_module, "get_instance", lambda _hass: _FakeRecorder())
+    monkeypatch.setattr(coordinator_module, "get_last_statistics", fake_last)
     monkeypatch.setattr(coordinator_module, "statistics_during_period", fake_period)
     monkeypatch.setattr(
         coordinator_module,
@@ -79,11 +102,19 @@ def _midnight(day: date) -> datetime:
     return datetime(day.year, day.month, day.day, tzinfo=TZ)
 
 
+def _row(total: float | None, *, hour: int = 0) -> dict[str, Any]:
+    """A stored row on Jul 19, the day before SERIES starts."""
+    start = _midnight(date(2026, 7, 19)) + timedelta(hours=hour)
+    return {"start": start.timestamp(), "sum": total}
+
+
 SERIES = [
     DailyPoint(date(2026, 7, 20), 5.0),
     DailyPoint(date(2026, 7, 21), 6.0),
     DailyPoint(date(2026, 7, 22), 1.5),  # still partial; a later sync completes it
 ]
+# SERIES's last row as written on top of _row(100.0), as the recorder holds it.
+NEWEST = {"start": _midnight(date(2026, 7, 22)).timestamp(), "sum": 112.5}
 
 
 # ---------------------------------------------------------------------------
@@ -107,8 +138,9 @@ async def test_statistic_ids_are_valid_for_any_contract_id(
         hass, entry, AsyncMock(spec=RomandeEnergieApiClient)
     )
 
-    assert valid_statistic_id(coordinator._stat_id_consumption)
-    assert valid_statistic_id(coordinator._stat_id_surplus)
+    contract = coordinator.contracts[contract_id]
+    assert valid_statistic_id(contract.stat_id_consumption)
+    assert valid_statistic_id(contract.stat_id_surplus)
 
 
 # ---------------------------------------------------------------------------
@@ -141,7 +173,7 @@ async def test_fresh_history_starts_the_sum_at_zero(stats_env) -> None:
 
 async def test_sum_continues_from_the_row_before_the_window(stats_env) -> None:
     coordinator, captured = stats_env
-    captured["responses"] = [{STAT_ID: [{"sum": 90.0}, {"sum": 100.0}]}]  # last row wins
+    captured["responses"] = [{STAT_ID: [_row(90.0), _row(100.0, hour=12)]}]  # last row wins
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
 
@@ -158,23 +190,135 @@ async def test_sum_continues_from_the_row_before_the_window(stats_env) -> None:
     assert probe["period"] == "hour"
 
 
-async def test_missing_probe_day_falls_back_to_the_whole_history(stats_env) -> None:
+async def test_missing_probe_day_falls_back_to_the_newest_row(stats_env) -> None:
     """An outage leaves no row immediately before the window; older ones remain."""
     coordinator, captured = stats_env
-    captured["responses"] = [{}, {STAT_ID: [{"sum": 100.0}]}]
+    captured["last"] = {"start": _midnight(date(2026, 7, 10)).timestamp(), "sum": 100.0}
+
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+
+    _metadata, points = captured["calls"][0]
+    assert [p["sum"] for p in points] == [105.0, 111.0, 112.5]
+    # The probe, then one indexed newest-row lookup; never the whole history.
+    assert len(captured["queries"]) == 1
+    assert captured["last_queries"] == [STAT_ID]
+
+
+async def test_hole_before_the_window_is_searched_back_in_bounded_spans(
+    stats_env,
+) -> None:
+    """Rows inside the window but none just before it: search back, not from EPOCH."""
+    coordinator, captured = stats_env
+    captured["last"] = {"start": _midnight(date(2026, 7, 21)).timestamp(), "sum": 250.0}
+    captured["responses"] = [{}, {}, {STAT_ID: [{"sum": 90.0}, {"sum": 100.0}]}]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
 
     _metadata, points = captured["calls"][0]
     assert [p["sum"] for p in points] == [105.0, 111.0, 112.5]
-    assert captured["queries"][1]["start"] == EPOCH
-    assert captured["queries"][1]["end"] == _midnight(date(2026, 7, 20))
+    searched = captured["queries"][1:]
+    assert searched[0]["end"] == _midnight(date(2026, 7, 19))
+    assert searched[1]["end"] == searched[0]["start"]
+    assert searched[1]["end"] - searched[1]["start"] > searched[0]["end"] - searched[0]["start"]
+    assert all(query["start"] > EPOCH for query in searched)
+
+
+async def test_a_window_moving_on_reuses_the_sums_just_written(stats_env) -> None:
+    """The next day's window starts on a row we wrote: no recorder query."""
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+    moved_on = [*SERIES[1:], DailyPoint(date(2026, 7, 23), 2.0)]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", moved_on)
+
+    assert len(captured["queries"]) == 1  # the first write's probe only
+    _metadata, points = captured["calls"][1]
+    assert [p["start"].date() for p in points] == [date(2026, 7, 23)]
+    assert [p["sum"] for p in points] == [114.5]
+
+
+async def test_only_the_rows_from_the_first_change_are_sent(stats_env) -> None:
+    """The rows before a change keep their sums, so re-sending them is wasted wear."""
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+
+    completed = [*SERIES[:2], DailyPoint(date(2026, 7, 22), 7.25)]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", completed)
+    # A late correction further back moves every sum after it.
+    corrected = [DailyPoint(date(2026, 7, 20), 5.5), *completed[1:]]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", corrected)
+
+    assert len(captured["queries"]) == 1
+    _metadata, points = captured["calls"][1]
+    assert [(p["start"].date(), p["sum"]) for p in points] == [
+        (date(2026, 7, 22), 118.25)
+    ]
+    _metadata, points = captured["calls"][2]
+    assert [p["sum"] for p in points] == [105.5, 111.5, 118.75]
+
+
+async def test_a_poll_counts_the_rows_it_sends(stats_env) -> None:
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+    coordinator.timings.begin()
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+    completed = [*SERIES[:2], DailyPoint(date(2026, 7, 22), 7.25)]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", completed)
+    coordinator.timings.end()
+
+    assert coordinator.timings.last.rows_written == 3 + 1
+    assert {"baselines", "statistics"} <= set(coordinator.timings.last.stages)
+
+
+async def test_baselines_survive_a_restart(
+    hass: HomeAssistant, stats_env, config_entry
+) -> None:
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATS_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    restarted = RomandeEnergieCoordinator(
+        hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
+    )
+    captured["last"] = NEWEST
+    await restarted._insert_statistics(STAT_ID, "Consumption", SERIES[1:])
+
+    assert len(captured["queries"]) == 1  # answered from disk
+    assert captured["last_queries"] == [STAT_ID]  # checked once against the recorder
+    assert [p["sum"] for p in captured["calls"][1][1]] == [111.0, 112.5]
+
+
+async def test_baselines_the_recorder_contradicts_are_dropped(
+    hass: HomeAssistant, stats_env, config_entry
+) -> None:
+    """A statistic adjusted (or a database restored) while we were down."""
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATS_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    restarted = RomandeEnergieCoordinator(
+        hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
+    )
+    captured["last"] = {**NEWEST, "sum": 62.5}
+    captured["responses"] = [{STAT_ID: [_row(50.0)]}]
+    await restarted._insert_statistics(STAT_ID, "Consumption", SERIES)
+
+    # Neither the cached baseline nor the written window was trusted.
+    assert len(captured["queries"]) == 2
+    assert [p["sum"] for p in captured["calls"][1][1]] == [55.0, 61.0, 62.5]
 
 
 async def test_unreadable_baseline_sum_writes_nothing(stats_env, caplog) -> None:
     """Better no statistics than a window rewritten below the history it continues."""
     coordinator, captured = stats_env
-    captured["responses"] = [{STAT_ID: [{"sum": None}]}]
+    captured["responses"] = [{STAT_ID: [_row(None)]}]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
 
@@ -188,7 +332,7 @@ async def test_unreadable_baseline_sum_writes_nothing(stats_env, caplog) -> None
 async def test_already_stored_days_are_rewritten_not_skipped(stats_env) -> None:
     """A day whose partial value was stored earlier is re-sent with the fix."""
     coordinator, captured = stats_env
-    captured["responses"] = [{STAT_ID: [{"sum": 100.0}]}]
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
     corrected = [*SERIES[:2], DailyPoint(date(2026, 7, 22), 7.25)]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", corrected)
@@ -208,7 +352,7 @@ async def test_days_missing_from_the_payload_are_written_as_zero(stats_env) -> N
     the Energy dashboard reads as a meter reset.
     """
     coordinator, captured = stats_env
-    captured["responses"] = [{STAT_ID: [{"sum": 100.0}]}]
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
     holed = [DailyPoint(date(2026, 7, 20), 5.0), DailyPoint(date(2026, 7, 23), 4.0)]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", holed)
@@ -229,7 +373,7 @@ async def test_days_missing_from_the_payload_are_written_as_zero(stats_env) -> N
 async def test_unchanged_window_is_not_rewritten(stats_env) -> None:
     """We poll every 20 minutes; the portal publishes once a day."""
     coordinator, captured = stats_env
-    captured["responses"] = [{STAT_ID: [{"sum": 100.0}]}]
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
     await coordinator._insert_statistics(STAT_ID, "Consumption", list(SERIES))
@@ -241,8 +385,8 @@ async def test_unchanged_window_is_not_rewritten(stats_env) -> None:
 async def test_changed_window_is_rewritten(stats_env) -> None:
     coordinator, captured = stats_env
     captured["responses"] = [
-        {STAT_ID: [{"sum": 100.0}]},
-        {STAT_ID: [{"sum": 100.0}]},
+        {STAT_ID: [_row(100.0)]},
+        {STAT_ID: [_row(100.0)]},
     ]
 
     await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
@@ -275,7 +419,7 @@ async def test_rewrite_updates_stored_rows_in_place(
     coordinator = RomandeEnergieCoordinator(
         hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
     )
-    stat_id = coordinator._stat_id_consumption
+    stat_id = coordinator.contracts[FAKE_CONTRACT_ID].stat_id_consumption
 
     await coordinator._insert_statistics(stat_id, "Consumption", SERIES)
     await async_wait_recording_done(hass)
@@ -331,7 +475,7 @@ async def test_baseline_survives_a_gap_longer_than_the_probe(
     coordinator = RomandeEnergieCoordinator(
         hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
     )
-    stat_id = coordinator._stat_id_consumption
+    stat_id = coordinator.contracts[FAKE_CONTRACT_ID].stat_id_consumption
 
     await coordinator._insert_statistics(stat_id, "Consumption", SERIES)
     await async_wait_recording_done(hass)
@@ -345,3 +489,90 @@ async def test_baseline_survives_a_gap_longer_than_the_probe(
         stat_id, _midnight(date(2026, 9, 20)) + timedelta(days=1)
     )
     assert baseline == 15.5  # 5 + 6 + 1.5 + 3, not restarted from zero
+
+
+async def test_hourly_window_spans_the_25_hour_dst_day(stats_env) -> None:
+    """Hour rows are stepped in UTC, so the repeated 02:00 gets its own row."""
+    coordinator, captured = stats_env
+    first = datetime(2026, 10, 24, 22, tzinfo=UTC)  # local midnight, Oct 25
+    hourly = [HourlyPoint(first, 1.0), HourlyPoint(first + timedelta(hours=25), 1.0)]
+
+    await coordinator._insert_statistics(STAT_ID, "Consumption", hourly)
+
+    _metadata, points = captured["calls"][0]
+    assert len(points) == 26  # the 25-hour local day, gap filled, plus next midnight
+    assert points[-1]["start"].astimezone(TZ) == _midnight(date(2026, 10, 26))
+    assert [p["sum"] for p in points][-1] == 2.0
+
+
+async def test_hourly_rewrite_starts_at_the_changed_hour(stats_env) -> None:
+    coordinator, captured = stats_env
+    first = datetime(2026, 7, 19, 22, tzinfo=UTC)
+    hourly = [HourlyPoint(first + timedelta(hours=n), 0.5) for n in range(24)]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", hourly)
+
+    hourly[20] = HourlyPoint(hourly[20].start, 0.75)
+    await coordinator._insert_statistics(STAT_ID, "Consumption", hourly)
+
+    _metadata, points = captured["calls"][1]
+    assert [p["start"] for p in points] == [p.start for p in hourly[20:]]
+    assert [p["sum"] for p in points] == [10.75, 11.25, 11.75, 12.25]
+
+
+async def test_an_unchanged_window_is_not_rewritten_after_a_restart(
+    hass: HomeAssistant, stats_env, config_entry
+) -> None:
+    coordinator, captured = stats_env
+    captured["responses"] = [{STAT_ID: [_row(100.0)]}]
+    await coordinator._insert_statistics(STAT_ID, "Consumption", SERIES)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATS_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    restarted = RomandeEnergieCoordinator(
+        hass, config_entry, AsyncMock(spec=RomandeEnergieApiClient)
+    )
+    captured["last"] = NEWEST
+    await restarted._insert_statistics(STAT_ID, "Consumption", SERIES)
+    assert len(captured["calls"]) == 1
+
+    # The matching window was adopted as written, so a later change is again
+    # sent from the changed row on, on the cached baseline.
+    completed = [*SERIES[:2], DailyPoint(date(2026, 7, 22), 7.25)]
+    await restarted._insert_statistics(STAT_ID, "Consumption", completed)
+    _metadata, points = captured["calls"][1]
+    assert [p["sum"] for p in points] == [118.25]
+    assert len(captured["queries"]) == 1
+
+
+async def test_every_statistic_is_resolved_in_one_recorder_job(
+    stats_env, monkeypatch
+) -> None:
+    """Consumption and surplus share one baseline query and one executor job."""
+    coordinator, captured = stats_env
+    surplus_id = "romande_energie:contract_test_surplus"
+    captured["responses"] = [{STAT_ID: [_row(100.0)], surplus_id: [_row(40.0)]}]
+    jobs = 0
+    recorder = _FakeRecorder()
+
+    async def counting_job(func, *args):
+        nonlocal jobs
+        jobs += 1
+        return func(*args)
+
+    recorder.async_add_executor_job = counting_job
+    monkeypatch.setattr(coordinator_module, "get_instance", lambda _hass: recorder)
+
+    await coordinator._insert_statistics_batch(
+        [
+            (STAT_ID, "Consumption", SERIES),
+            (surplus_id, "Surplus", [DailyPoint(date(2026, 7, 20), 2.0)]),
+        ]
+    )
+
+    assert jobs == 1
+    assert len(captured["queries"]) == 1
+    assert captured["queries"][0]["statistic_ids"] == {STAT_ID, surplus_id}
+    sums = {
+        metadata["statistic_id"]: points[-1]["sum"] for metadata, points in captured["calls"]
+    }
+    assert sums == {STAT_ID: 112.5, surplus_id: 42.0}
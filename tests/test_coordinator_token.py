@@ -0,0 +1,139 @@
+"""Stress tests for the coordinator's single-flight token rotation.
+
+A local fake portal stands behind the real API client: it rotates the refresh
+token on every refresh and burns the one it was sent, answering a second use
+with 401 exactly as the live portal does. Each refresh takes a moment, so
+callers that are not coalesced would overlap and burn the token.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.romande_energie import coordinator as coordinator_module
+from custom_components.romande_energie.api import ApiError, RomandeEnergieApiClient
+from custom_components.romande_energie.const import (
+    CONF_REFRESH_TOKEN,
+    REFRESH_ATTEMPTS,
+    REFRESH_ENDPOINT,
+)
+from custom_components.romande_energie.coordinator import RomandeEnergieCoordinator
+
+from .conftest import FAKE_REFRESH_TOKEN, make_jwt
+
+CALLERS = 200
+
+
+class _FakePortal:
+    """The refresh endpoint of the portal, with token rotation and burning."""
+
+    def __init__(self, latency: float = 0.01) -> None:
+        self.latency = latency
+        self.refresh_token = FAKE_REFRESH_TOKEN
+        self.refreshes = 0
+        self.burned = 0
+        self.fail_with: HTTPStatus | None = None
+
+    async def refresh(self, method: str, url: Any, data: dict[str, Any]) -> Any:
+        self.refreshes += 1
+        await asyncio.sleep(self.latency)
+        if self.fail_with is not None:
+            return AiohttpClientMockResponse(method, url, status=self.fail_with)
+        if data["refresh"] != self.refresh_token:
+            self.burned += 1
+            return AiohttpClientMockResponse(method, url, status=HTTPStatus.UNAUTHORIZED)
+        self.refresh_token = f"REFRESH_{self.refreshes}"
+        return AiohttpClientMockResponse(
+            method,
+            url,
+            json={
+                "access_token": make_jwt(exp=int(time.time()) + 3600),
+                "refresh_token": self.refresh_token,
+            },
+        )
+
+
+@pytest.fixture
+def portal(aioclient_mock: AiohttpClientMocker) -> _FakePortal:
+    fake = _FakePortal()
+    aioclient_mock.post(REFRESH_ENDPOINT, side_effect=fake.refresh)
+    return fake
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, config_entry, portal
+) -> AsyncGenerator[RomandeEnergieCoordinator]:
+    session = aioclient_mock.create_session(hass.loop)
+    config_entry.add_to_hass(hass)
+    coordinator = RomandeEnergieCoordinator(
+        hass, config_entry, RomandeEnergieApiClient(session)
+    )
+    coordinator.config_entry = config_entry
+    yield coordinator
+    await session.close()
+
+
+async def test_concurrent_callers_share_one_rotation(coordinator, portal) -> None:
+    await asyncio.gather(*(coordinator._ensure_token() for _ in range(CALLERS)))
+
+    assert portal.refreshes == 1
+    assert portal.burned == 0
+    assert coordinator._refresh_token == portal.refresh_token
+    assert coordinator.config_entry.data[CONF_REFRESH_TOKEN] == portal.refresh_token
+
+
+async def test_waves_of_callers_rotate_once_per_expiry(coordinator, portal) -> None:
+    """Callers arriving while the token is fresh never refresh at all."""
+    for _wave in range(3):
+        coordinator._token_exp = 0  # expired: the wave has to rotate
+        await asyncio.gather(*(coordinator._ensure_token() for _ in range(CALLERS)))
+        await asyncio.gather(*(coordinator._ensure_token() for _ in range(CALLERS)))
+
+    assert portal.refreshes == 3
+    assert portal.burned == 0
+
+
+async def test_a_failed_rotation_is_shared_not_repeated(
+    coordinator, portal, monkeypatch
+) -> None:
+    monkeypatch.setattr(coordinator_module, "REFRESH_RETRY_DELAY", 0)
+    portal.fail_with = HTTPStatus.BAD_GATEWAY
+
+    results = await asyncio.gather(
+        *(coordinator._ensure_token() for _ in range(CALLERS)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ApiError) for result in results)
+    # One rotation's retry budget, not one per caller.
+    assert portal.refreshes == REFRESH_ATTEMPTS
+
+    # The failure is not kept: the next caller starts a fresh rotation.
+    portal.fail_with = None
+    await coordinator._ensure_token()
+    assert portal.refreshes == REFRESH_ATTEMPTS + 1
+    assert coordinator._refresh_token == portal.refresh_token
+
+
+async def test_a_cancelled_caller_does_not_abandon_the_rotation(
+    coordinator, portal
+) -> None:
+    """A poll timing out mid-refresh must not lose the token the portal issued."""
+    first = asyncio.ensure_future(coordinator._ensure_token())
+    await asyncio.sleep(0)  # the refresh is now in flight
+    first.cancel()
+    await coordinator._ensure_token()
+
+    assert first.cancelled()
+    assert portal.refreshes == 1
+    assert coordinator._refresh_token == portal.refresh_token
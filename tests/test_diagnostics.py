@@ -0,0 +1,106 @@
+"""Tests for the diagnostics download in ``diagnostics.py``."""
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import AsyncGenerator
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun import freeze_time
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.romande_energie.api import RomandeEnergieApiClient
+from custom_components.romande_energie.const import (
+    CURVE_ENDPOINT,
+    DOMAIN,
+    POLL_HISTORY,
+)
+from custom_components.romande_energie.coordinator import RomandeEnergieCoordinator
+from custom_components.romande_energie.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .conftest import (
+    FAKE_ACCOUNT_ID,
+    FAKE_CONTRACT_ID,
+    FAKE_PASSWORD,
+    FAKE_REFRESH_TOKEN,
+    FAKE_USERNAME,
+)
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, config_entry, aioclient_mock: AiohttpClientMocker
+) -> AsyncGenerator[RomandeEnergieCoordinator]:
+    """A coordinator on a real client, registered as its entry's."""
+    session = aioclient_mock.create_session(hass.loop)
+    config_entry.add_to_hass(hass)
+    coordinator = RomandeEnergieCoordinator(
+        hass, config_entry, RomandeEnergieApiClient(session)
+    )
+    coordinator.config_entry = config_entry
+    hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = coordinator
+    yield coordinator
+    await session.close()
+
+
+async def test_a_poll_shows_up_in_the_diagnostics(
+    hass: HomeAssistant,
+    config_entry,
+    coordinator: RomandeEnergieCoordinator,
+    aioclient_mock: AiohttpClientMocker,
+    sample_curves: list[dict[str, Any]],
+) -> None:
+    aioclient_mock.get(
+        CURVE_ENDPOINT.format(contract_id=FAKE_CONTRACT_ID), json=sample_curves
+    )
+    coordinator._insert_statistics_batch = AsyncMock()
+    with freeze_time("2026-06-05 12:00:00"):
+        coordinator._access_token = "ACCESS_TEST"
+        coordinator._token_exp = int(time.time()) + 3600
+        await coordinator._async_update_data()
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    (poll,) = diagnostics["polls"]["history"]
+    assert {"token", "curves", "parse", "total"} <= set(poll["stages_ms"])
+    assert poll["statuses"] == {"curves 200": 1}
+    assert poll["payload_bytes"] > 0
+    assert poll["points_parsed"] > 0
+    assert poll["token_expires_in"] is None  # the token was still good
+    assert poll["error"] is None
+    assert diagnostics["polls"]["stages"]["total"]["last_ms"] is not None
+    assert diagnostics["requests"]["breakers"]["curves"]["failures"] == 0
+    assert diagnostics["session"]["access_token_expires_in"] == 3600
+    assert FAKE_CONTRACT_ID in diagnostics["publish"]
+    json.dumps(diagnostics)  # what HA serialises for the download
+
+
+async def test_credentials_and_tokens_are_redacted(
+    hass: HomeAssistant, config_entry, coordinator: RomandeEnergieCoordinator
+) -> None:
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    dumped = json.dumps(diagnostics)
+    for secret in (FAKE_USERNAME, FAKE_PASSWORD, FAKE_REFRESH_TOKEN, FAKE_ACCOUNT_ID):
+        assert secret not in dumped
+    assert diagnostics["entry"]["data"]["contract_id"] == FAKE_CONTRACT_ID
+
+
+async def test_the_poll_history_stays_bounded(
+    hass: HomeAssistant, config_entry, coordinator: RomandeEnergieCoordinator
+) -> None:
+    for _ in range(POLL_HISTORY + 25):
+        with coordinator.timings.poll():
+            coordinator.timings.note_rotation(120)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert len(diagnostics["polls"]["history"]) == POLL_HISTORY
+    assert len(diagnostics["session"]["rotations"]) == POLL_HISTORY
@@ -0,0 +1,342 @@
+"""Fault injection: how an entry rides out a portal outage, on a warped clock.
+
+The retry rules in ``const.py`` — the keepalive's retries against the
+refresh-token TTL, POLL_RETRY_INTERVAL, the refresh attempts, the breakers —
+are argued in comments; these runs measure them. One entry signs in to the
+fake portal and runs as in Home Assistant (polls on its own schedule, the
+keepalive rotating the session), while the portal misbehaves for a while: it
+times out, answers 503s, answers late, or handles a refresh whose answer is
+then lost, burning the token. Each profile reports how long after the outage
+the entry held a live session again and polled successfully again, how many
+requests it spent on the portal meanwhile and whether it took a reauth — a
+fresh SMS code — to recover::
+
+    python -m pytest tests/test_faults.py -s
+
+The clock is frozen and only jumps from one scheduled timer to the next, and
+the portal is served in-process, so a day of outages runs in a second and
+every run is the same.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed_exact,
+)
+
+from custom_components.romande_energie.api import RomandeEnergieApiClient
+from custom_components.romande_energie.const import (
+    CONF_ACCOUNT_ID,
+    CONF_CONTRACT_ID,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+    BREAKER_MAX_COOLDOWN,
+    KEEPALIVE_RETRY_INTERVAL,
+    POLL_JITTER,
+    POLL_RETRY_INTERVAL,
+    TZ,
+)
+from custom_components.romande_energie.coordinator import RomandeEnergieCoordinator
+
+from .benchmarks.portal import ERROR, LOST, SLOW, TIMEOUT, Fault, FakePortal
+from .conftest import build_config_entry
+
+# The keepalive rotates the session 13 minutes into each 15-minute access token,
+# so after sign-in it rotates at 13, 26 and 39 minutes. An outage starting at
+# OUTAGE_START hits the refresh token when it is 9 minutes old, one starting at
+# ROTATED just after it was issued.
+OUTAGE_START = timedelta(minutes=35)
+ROTATED = timedelta(minutes=27)
+# By then the refreshes have answered LATENCY_MIN_SAMPLES times and more, so the
+# client sizes timeouts from the portal's latency rather than HTTP_TIMEOUT.
+SETTLED = timedelta(hours=2)
+# How long after the outage the run goes on, waiting for the entry to recover.
+HORIZON = timedelta(hours=4)
+
+
+@dataclass
+class Profile:
+    """An outage: the portal misbehaving one way, for ``duration``.
+
+    ``reauth`` is what the retry rules promise: whether the entry needs a
+    fresh SMS code afterwards. None where the outcome is only measured.
+    """
+
+    name: str
+    kind: str
+    duration: timedelta
+    reauth: bool | None
+    routes: frozenset[str] | None = None
+    delay: float = 0.0
+    start: timedelta = OUTAGE_START
+
+
+@dataclass
+class Outcome:
+    """How an entry came through an outage."""
+
+    # From the outage's end until the session held a live access token again
+    # (zero if it never lost it); None if it never did, a reauth having
+    # stopped the entry.
+    session_after: timedelta | None
+    # From the outage's end to the next successful poll, if polls failed.
+    data_after: timedelta | None
+    failed_polls: int
+    # Portal requests from the outage's start until the entry recovered, or
+    # the run ended.
+    requests: int
+    reauth: bool
+
+
+class Simulation:
+    """One entry on the fake portal, on a clock that jumps from timer to timer.
+
+    Between jumps the loop runs until only timers are left, so nothing can
+    happen until the clock moves; it then moves straight to the soonest timer
+    and fires it. The event loop's clock is frozen along with the wall clock
+    in these tests, so ``asyncio.sleep`` and the client's timeouts are such
+    timers too. Work handed to the executor is not waited for, which is why the
+    runs keep the stores in memory (``hass_storage``).
+    """
+
+    def __init__(self, hass: HomeAssistant, freezer: Any) -> None:
+        self.hass = hass
+        self._freezer = freezer
+        self._loop = asyncio.get_running_loop()
+
+    async def _settle(self) -> None:
+        await asyncio.sleep(0)
+        # What is runnable now; the rest waits for the clock.
+        while self._loop._ready:  # noqa: SLF001
+            await asyncio.sleep(0)
+
+    async def _jump(self, until: float) -> bool:
+        """Move to the soonest timer and fire it; False if none is due by ``until``."""
+        await self._settle()
+        due = min(
+            (
+                timer.when()
+                for timer in self._loop._scheduled  # noqa: SLF001
+                if not timer.cancelled()
+            ),
+            default=until,
+        )
+        now = self._loop.time()
+        if due > until:
+            self._freezer.tick(timedelta(seconds=until - now))
+            return False
+        # A millisecond past it: the clock only ticks in whole microseconds.
+        self._freezer.tick(timedelta(seconds=max(0.0, due - now) + 0.001))
+        async_fire_time_changed_exact(self.hass)
+        return True
+
+    async def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Await ``coro``, moving the clock for as long as it waits on it."""
+        task = asyncio.ensure_future(coro)
+        await self._settle()
+        while not task.done():
+            await self._jump(float("inf"))
+            await self._settle()
+        return task.result()
+
+    async def run_for(self, span: timedelta) -> None:
+        until = self._loop.time() + span.total_seconds()
+        while await self._jump(until):
+            pass
+
+
+PROFILES = [
+    Profile("503s for 5 min", ERROR, timedelta(minutes=5), reauth=False),
+    Profile(
+        "503s for 20 min, fresh token",
+        ERROR,
+        timedelta(minutes=20),
+        reauth=False,
+        start=ROTATED,
+    ),
+    Profile("503s for 20 min", ERROR, timedelta(minutes=20), reauth=None),
+    # Longer than the refresh token lives, whatever its age.
+    Profile("503s for 45 min", ERROR, timedelta(minutes=45), reauth=True),
+    Profile("timeouts for 20 min", TIMEOUT, timedelta(minutes=20), reauth=None),
+    Profile(
+        "answers 8 s late for 1 h", SLOW, timedelta(hours=1), reauth=False, delay=8
+    ),
+    Profile(
+        "answers 30 s late for 1 h", SLOW, timedelta(hours=1), reauth=None, delay=30
+    ),
+    # Later than any latency-sized timeout would wait, after healthy answers:
+    # a refresh given up on early has still burnt its token on the portal.
+    Profile(
+        "answers 12 s late after 2 h",
+        SLOW,
+        timedelta(hours=1),
+        reauth=False,
+        delay=12,
+        start=SETTLED,
+    ),
+    Profile(
+        "answers 15 s late after 2 h",
+        SLOW,
+        timedelta(hours=1),
+        reauth=False,
+        delay=15,
+        start=SETTLED,
+    ),
+    # The session is never at stake: the breaker and the poll retries are.
+    Profile(
+        "curves 503s for 2 h",
+        ERROR,
+        timedelta(hours=2),
+        reauth=False,
+        routes=frozenset({"curves"}),
+    ),
+    # The rotation the portal made is in the answer that never came.
+    Profile(
+        "refresh answers lost for 10 min",
+        LOST,
+        timedelta(minutes=10),
+        reauth=True,
+        routes=frozenset({"refresh"}),
+    ),
+]
+
+
+async def _outage(
+    hass: HomeAssistant, freezer: Any, portal: FakePortal, profile: Profile
+) -> Outcome:
+    """Sign in, run until the outage, then until the entry recovers or the run ends."""
+    sim = Simulation(hass, freezer)
+    account = portal.add_account(installations=2)
+    session = portal.session()
+    client = RomandeEnergieApiClient(session)
+
+    async def sign_in() -> dict[str, Any]:
+        login = await client.login(account.username, account.password)
+        pending = login["access_token"]
+        otp_id = (await client.send_otp(pending))["otp_id"]
+        return await client.validate_otp(pending, otp_id, portal.otp_code)
+
+    tokens = await sim.run(sign_in())
+    entry = build_config_entry(
+        entry_id="fault-injection",
+        data={
+            CONF_USERNAME: account.username,
+            CONF_PASSWORD: account.password,
+            CONF_ACCOUNT_ID: account.account_id,
+            CONF_CONTRACT_ID: account.contracts[0],
+            CONF_REFRESH_TOKEN: tokens["refresh_token"],
+        },
+    )
+    entry.add_to_hass(hass)
+    entry.async_start_reauth = MagicMock()
+    coordinator = RomandeEnergieCoordinator(hass, entry, client)
+    coordinator.config_entry = entry
+    coordinator._insert_statistics_batch = AsyncMock()  # the recorder is not on trial
+
+    await sim.run(coordinator.async_refresh())
+    unsub = coordinator.async_add_listener(lambda: None)  # keeps it polling
+    stop_keepalive = coordinator.async_start_keepalive()
+    await sim.run_for(profile.start)
+
+    start = datetime.now(tz=TZ)
+    end = start + profile.duration
+    portal.inject(
+        Fault(
+            profile.kind,
+            start.timestamp(),
+            end.timestamp(),
+            routes=profile.routes,
+            delay=profile.delay,
+        )
+    )
+    before = sum(portal.requests.values())
+    failed = 0
+    data_back: datetime | None = None
+    last_poll = coordinator.timings.last.started
+
+    async def run_for(span: timedelta) -> None:
+        nonlocal failed, data_back, last_poll
+        await sim.run_for(span)
+        for poll in coordinator.timings.history:
+            if poll.started <= last_poll:
+                continue
+            last_poll = poll.started
+            finished = poll.started + timedelta(seconds=poll.stages["total"])
+            if poll.error is not None:
+                failed += 1
+            elif finished >= end and data_back is None:
+                data_back = finished
+
+    await run_for(profile.duration)
+    # A session still live once the outage is over has nothing to recover.
+    session_back = end if coordinator._token_exp > end.timestamp() else None
+    stop = end + HORIZON
+    while datetime.now(tz=TZ) < stop and not entry.async_start_reauth.called:
+        if session_back is not None and (data_back is not None or not failed):
+            break
+        await run_for(timedelta(minutes=1))
+        if session_back is None:
+            session_back = next(
+                (
+                    at
+                    for rotation in coordinator.timings.rotations
+                    if (at := datetime.fromisoformat(rotation["at"])) >= end
+                ),
+                None,
+            )
+    requests = sum(portal.requests.values()) - before
+
+    stop_keepalive()
+    unsub()
+    await coordinator.async_shutdown()
+    await session.close()
+    return Outcome(
+        session_after=None if session_back is None else session_back - end,
+        data_after=None if data_back is None or not failed else data_back - end,
+        failed_polls=failed,
+        requests=requests,
+        reauth=entry.async_start_reauth.called,
+    )
+
+
+def _minutes(span: timedelta | None) -> str:
+    return "   -   " if span is None else f"{span.total_seconds() / 60:5.1f} min"
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=[p.name for p in PROFILES])
+async def test_outage_recovery(
+    hass: HomeAssistant, hass_storage: dict[str, Any], freezer: Any, profile: Profile
+) -> None:
+    freezer.move_to("2026-06-05 08:00:00")
+    portal = FakePortal(latency=0.3, jitter=0.1)  # on the frozen clock
+    try:
+        outcome = await _outage(hass, freezer, portal, profile)
+    finally:
+        await portal.close()
+
+    print(
+        f"\n{profile.name:<32} session back after {_minutes(outcome.session_after)}, "
+        f"data after {_minutes(outcome.data_after)} "
+        f"({outcome.failed_polls} polls failed), "
+        f"{outcome.requests} requests, reauth: {'yes' if outcome.reauth else 'no'}"
+    )
+
+    if profile.reauth is not None:
+        assert outcome.reauth is profile.reauth
+    if not outcome.reauth:
+        assert outcome.session_after is not None
+        # The keepalive's next retry brings the session back.
+        assert outcome.session_after <= KEEPALIVE_RETRY_INTERVAL
+    if outcome.data_after is not None:
+        # The failed polls are retried no later than the curves breaker allows.
+        retry = max(POLL_RETRY_INTERVAL, BREAKER_MAX_COOLDOWN)
+        assert outcome.data_after <= retry + POLL_JITTER
@@ -7,10 +7,12 @@ import pytest
 from homeassistant.core import HomeAssistant
 
 from custom_components.romande_energie import (
+    SERVICE_BACKFILL,
     SERVICE_UPDATE_NOW,
     async_unload_entry,
 )
 from custom_components.romande_energie.const import CONF_CONTRACT_ID, DOMAIN
+from custom_components.romande_energie.scheduler import DATA_SCHEDULER
 
 from .conftest import build_config_entry
 
@@ -27,12 +29,16 @@ async def test_last_entry_removes_the_service(hass: HomeAssistant, unload_ok) ->
     entry = build_config_entry()
     entry.add_to_hass(hass)
     hass.data[DOMAIN] = {entry.entry_id: object()}
+    hass.data[DATA_SCHEDULER] = object()
     hass.services.async_register(DOMAIN, SERVICE_UPDATE_NOW, AsyncMock())
+    hass.services.async_register(DOMAIN, SERVICE_BACKFILL, AsyncMock())
 
     assert await async_unload_entry(hass, entry) is True
 
     assert DOMAIN not in hass.data
+    assert DATA_SCHEDULER not in hass.data
     assert not hass.services.has_service(DOMAIN, SERVICE_UPDATE_NOW)
+    assert not hass.services.has_service(DOMAIN, SERVICE_BACKFILL)
 
 
 async def test_other_entries_keep_their_coordinator_and_the_service(
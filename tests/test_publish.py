@@ -0,0 +1,93 @@
+"""Tests for the publish-time model in ``publish.py``."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from custom_components.romande_energie.const import (
+    ADAPTIVE_MAX_INTERVAL,
+    PUBLISH_HISTORY_DAYS,
+    PUBLISH_POLL_INTERVAL,
+    TZ,
+    UPDATE_INTERVAL,
+)
+from custom_components.romande_energie.publish import PublishModel
+
+
+def _at(day: int, hour: int, minute: int = 0, month: int = 6) -> datetime:
+    return datetime(2026, month, day, hour, minute, tzinfo=TZ)
+
+
+def _learnt() -> PublishModel:
+    """A model that saw the portal publish between 08:10 and 08:50."""
+    model = PublishModel()
+    for day, minute in ((1, 10), (2, 50), (3, 30)):
+        model.observe(_at(day, 8, minute))
+    return model
+
+
+def test_only_the_first_change_of_a_day_counts():
+    model = PublishModel()
+    assert model.observe(_at(1, 8))
+    assert not model.observe(_at(1, 9))
+    assert model.observed == [_at(1, 8)]
+
+
+def test_old_observations_roll_out():
+    model = PublishModel()
+    for day in range(1, 21):
+        model.observe(_at(day, 8))
+    assert len(model.observed) == PUBLISH_HISTORY_DAYS
+    assert model.observed[0].date() == date(2026, 6, 21 - PUBLISH_HISTORY_DAYS)
+
+
+def test_too_few_observations_keep_the_fixed_interval():
+    model = PublishModel()
+    model.observe(_at(1, 8))
+    assert model.window(date(2026, 6, 2)) is None
+    assert model.next_poll(_at(2, 3)) == UPDATE_INTERVAL
+
+
+def test_window_spans_the_times_seen_plus_the_lead():
+    assert _learnt().window(date(2026, 6, 4)) == (_at(4, 7, 40), _at(4, 9, 20))
+
+
+def test_polls_wait_for_the_window_then_cluster_in_it():
+    model = _learnt()
+    assert model.next_poll(_at(4, 5)) == timedelta(hours=2, minutes=40)
+    assert model.next_poll(_at(4, 8)) == PUBLISH_POLL_INTERVAL
+    # Late: keep checking on the ordinary interval.
+    assert model.next_poll(_at(4, 11)) == UPDATE_INTERVAL
+
+
+def test_a_settled_day_backs_off_until_the_next_window():
+    model = _learnt()
+    model.observe(_at(4, 8, 20))
+    # Tomorrow's window opens at 07:40, but no wait exceeds the cap.
+    assert model.next_poll(_at(4, 8, 20)) == ADAPTIVE_MAX_INTERVAL
+    assert model.next_poll(_at(4, 22)) == timedelta(hours=9, minutes=40)
+
+
+def test_a_window_opening_before_midnight_is_polled_on_its_interval():
+    """Publishing at 00:15 opens the next window at 23:45 the evening before."""
+    model = PublishModel()
+    for day in (1, 2, 3, 4):
+        model.observe(_at(day, 0, 15))
+    assert model.next_poll(_at(4, 23, 30)) == timedelta(minutes=15)
+    assert model.next_poll(_at(4, 23, 50)) == PUBLISH_POLL_INTERVAL
+    assert model.next_poll(_at(5, 0)) == PUBLISH_POLL_INTERVAL
+
+
+def test_window_keeps_its_wall_clock_time_across_dst():
+    model = PublishModel()
+    for day in (26, 27, 28):
+        model.observe(_at(day, 8, month=3))
+    start, _end = model.window(date(2026, 3, 29))  # spring forward
+    assert (start.hour, start.minute) == (7, 30)
+
+
+def test_round_trips_through_storage_without_losing_new_days():
+    model = _learnt()
+    restored = PublishModel()
+    restored.observe(_at(4, 8))
+    restored.load(model.as_list())
+    assert restored.observed == [*model.observed, _at(4, 8)]
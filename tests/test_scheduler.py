@@ -0,0 +1,77 @@
+"""Tests for the fleet-wide request scheduler in ``scheduler.py``."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.romande_energie.const import POLL_JITTER
+from custom_components.romande_energie.scheduler import (
+    RequestScheduler,
+    get_scheduler,
+)
+
+
+async def test_requests_never_exceed_the_limit() -> None:
+    scheduler = RequestScheduler(limit=2)
+    running = peak = 0
+
+    async def request() -> None:
+        nonlocal running, peak
+        async with scheduler.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(10)))
+
+    assert peak == 2
+    stats = scheduler.stats()
+    assert stats.requests == 10
+    assert stats.queue_depth == stats.in_flight == 0
+    # Four waves of two behind the first: the last ones queued a while.
+    assert stats.max_wait >= 0.04
+    assert 0 < stats.mean_wait < stats.max_wait
+
+
+async def test_queue_depth_counts_the_waiting_requests() -> None:
+    scheduler = RequestScheduler(limit=1)
+    release = asyncio.Event()
+
+    async def request() -> None:
+        async with scheduler.slot():
+            await release.wait()
+
+    tasks = [asyncio.ensure_future(request()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert scheduler.stats().in_flight == 1
+    assert scheduler.stats().queue_depth == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats().queue_depth == 0
+
+
+async def test_a_cancelled_wait_leaves_the_queue() -> None:
+    scheduler = RequestScheduler(limit=1)
+    async with scheduler.slot():
+        waiting = asyncio.ensure_future(scheduler.slot().__aenter__())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.sleep(0)
+    assert scheduler.stats().queue_depth == 0
+    async with scheduler.slot():  # the slot was given back
+        pass
+
+
+def test_jitter_is_fixed_per_entry_and_spreads_entries() -> None:
+    offsets = {RequestScheduler.jitter(f"entry_{n}") for n in range(50)}
+    assert RequestScheduler.jitter("entry_1") == RequestScheduler.jitter("entry_1")
+    assert all(timedelta(0) <= offset < POLL_JITTER for offset in offsets)
+    assert len(offsets) > 40
+
+
+async def test_one_scheduler_serves_every_entry(hass: HomeAssistant) -> None:
+    assert get_scheduler(hass) is get_scheduler(hass)
@@ -0,0 +1,99 @@
+"""Tests for the columnar ``DailySeries`` in ``series.py``."""
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from custom_components.romande_energie import series as series_module
+from custom_components.romande_energie.api import DailyPoint
+from custom_components.romande_energie.series import DailySeries
+
+POINTS = [
+    DailyPoint(date(2026, 5, 30), 1.0),
+    DailyPoint(date(2026, 6, 1), 2.0),  # May 31 is a gap
+    DailyPoint(date(2026, 6, 2), 0.0),  # a real zero, not a gap
+    DailyPoint(date(2026, 6, 4), 4.0),  # Jun 3 is a gap
+]
+
+
+def test_round_trips_daily_points():
+    series = DailySeries.from_points(reversed(POINTS))
+    assert series.points() == POINTS
+    assert series.first_day == date(2026, 5, 30)
+    assert series.last_day == date(2026, 6, 4)
+    assert len(series) == 6  # gaps included
+
+
+def test_get_tells_gaps_from_zeros():
+    series = DailySeries.from_points(POINTS)
+    assert series.get(date(2026, 6, 2)) == 0.0
+    assert series.get(date(2026, 6, 3)) is None
+    assert series.get(date(2026, 7, 1)) is None
+
+
+def test_filled_zeroes_gaps_and_widens_the_span():
+    filled = DailySeries.from_points(POINTS).filled(date(2026, 5, 29), date(2026, 6, 5))
+    assert list(filled.days()) == [
+        date(2026, 5, 29),
+        date(2026, 5, 30),
+        date(2026, 5, 31),
+        date(2026, 6, 1),
+        date(2026, 6, 2),
+        date(2026, 6, 3),
+        date(2026, 6, 4),
+        date(2026, 6, 5),
+    ]
+    assert list(filled.values) == [0.0, 1.0, 0.0, 2.0, 0.0, 0.0, 4.0, 0.0]
+
+
+def test_slice_is_trimmed_to_days_carrying_a_value():
+    series = DailySeries.from_points(POINTS)
+    assert series.slice(date(2026, 5, 31), date(2026, 6, 3)).points() == POINTS[1:3]
+    assert series.slice(last=date(2026, 6, 3)).latest() == POINTS[2]
+    assert not series.slice(date(2026, 6, 3), date(2026, 6, 3))
+    assert not series.slice(date(2027, 1, 1))
+
+
+def test_month_total_reads_only_that_month():
+    series = DailySeries.from_points(POINTS)
+    assert series.month_total(date(2026, 6, 15)) == 6.0
+    assert series.month_total(date(2026, 5, 1)) == 1.0
+    assert series.month_total(date(2026, 4, 1)) is None
+    assert DailySeries().month_total(date(2026, 6, 1)) is None
+
+
+def test_cumsum_continues_from_the_initial_total():
+    filled = DailySeries.from_points(POINTS).filled()
+    assert list(filled.cumsum(10.0)) == [11.0, 11.0, 13.0, 13.0, 13.0, 17.0]
+
+
+def test_equality_compares_days_and_values():
+    series = DailySeries.from_points(POINTS)
+    assert series == DailySeries.from_points(POINTS)
+    assert series != DailySeries.from_points(POINTS[:-1])
+    assert series.filled() != series.filled(date(2026, 5, 29))
+    assert DailySeries() == DailySeries.from_points([])
+
+
+def test_pure_python_path_gives_the_same_floats(monkeypatch):
+    pytest.importorskip("numpy")
+    values = [0.1 * n for n in range(1, 400)]
+    series = DailySeries.from_points(
+        (date.fromordinal(date(2026, 1, 1).toordinal() + 2 * n), value)
+        for n, value in enumerate(values)
+    )
+    with_numpy = series.filled(), series.filled().cumsum(1234.5)
+
+    monkeypatch.setattr(series_module, "np", None)
+    without = series.filled(), series.filled().cumsum(1234.5)
+
+    assert with_numpy[0] == without[0]
+    assert with_numpy[1].tobytes() == without[1].tobytes()
+
+
+def test_positional_slices_keep_their_days():
+    series = DailySeries.from_points(POINTS).filled()
+    assert series[3:].first_day == date(2026, 6, 2)
+    assert list(series[3:].values) == [0.0, 0.0, 4.0]
+    assert not series[6:]
@@ -0,0 +1,154 @@
+"""Soak run: hundreds of coordinators against the fake portal, on one loop.
+
+Every entry logs in the way the config flow does (login, SMS, validate),
+then the coordinators poll side by side through the real client, scheduler,
+parser and recorder, while a probe measures how late the event loop runs its
+callbacks. It takes a while, so it only runs when asked for, sized by the
+environment::
+
+    python -m pytest -m soak -s
+    SOAK_ENTRIES=1000 SOAK_POLLS=5 python -m pytest -m soak -s
+
+and prints the loop lag and what the portal served.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import AsyncGenerator
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.romande_energie.api import RomandeEnergieApiClient
+from custom_components.romande_energie.const import (
+    CONF_ACCOUNT_ID,
+    CONF_CONTRACT_ID,
+    CONF_CONTRACT_IDS,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+)
+from custom_components.romande_energie.coordinator import RomandeEnergieCoordinator
+from custom_components.romande_energie.scheduler import RequestScheduler
+from custom_components.romande_energie.tracing import request_trace_config
+
+from .benchmarks.portal import Account, FakePortal
+from .conftest import build_config_entry
+
+pytestmark = [pytest.mark.soak, pytest.mark.recorder]
+
+ENTRIES = int(os.environ.get("SOAK_ENTRIES", "300"))
+POLLS = int(os.environ.get("SOAK_POLLS", "2"))
+# How often the probe asks the loop to wake it (seconds).
+PROBE_INTERVAL = 0.01
+
+
+class LoopLagProbe:
+    """How late the loop wakes a task that sleeps PROBE_INTERVAL at a time."""
+
+    def __init__(self) -> None:
+        self.lags: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def percentile(self, fraction: float) -> float:
+        ranked = sorted(self.lags)
+        return ranked[min(len(ranked) - 1, int(fraction * len(ranked)))]
+
+
+@pytest.fixture
+async def portal(socket_enabled: None) -> AsyncGenerator[FakePortal]:
+    portal = FakePortal(latency=0.02, jitter=0.01)
+    yield portal
+    await portal.close()
+
+
+async def _sign_in(
+    hass: HomeAssistant,
+    client: RomandeEnergieApiClient,
+    portal: FakePortal,
+    account: Account,
+) -> RomandeEnergieCoordinator:
+    """The config flow's login, SMS and contract steps, then the coordinator."""
+    pending = (await client.login(account.username, account.password))["access_token"]
+    otp_id = (await client.send_otp(pending))["otp_id"]
+    tokens = await client.validate_otp(pending, otp_id, portal.otp_code)
+    contracts = await client.get_contracts(tokens["access_token"], account.account_id)
+    entry = build_config_entry(
+        data={
+            CONF_USERNAME: account.username,
+            CONF_PASSWORD: account.password,
+            CONF_ACCOUNT_ID: account.account_id,
+            CONF_CONTRACT_ID: contracts[0]["id"],
+            CONF_CONTRACT_IDS: [contract["id"] for contract in contracts],
+            CONF_REFRESH_TOKEN: tokens["refresh_token"],
+        }
+    )
+    entry.add_to_hass(hass)
+    coordinator = RomandeEnergieCoordinator(hass, entry, client)
+    coordinator.config_entry = entry
+    return coordinator
+
+
+async def test_soak_many_coordinators_on_one_loop(
+    hass: HomeAssistant, portal: FakePortal, caplog: pytest.LogCaptureFixture
+) -> None:
+    accounts = [
+        portal.add_account(contracts=1 + index % 2, installations=1 + index % 3)
+        for index in range(ENTRIES)
+    ]
+    base_url = await portal.start()
+    scheduler = RequestScheduler()
+    async with aiohttp.ClientSession(trace_configs=[request_trace_config()]) as session:
+        coordinators = [
+            await _sign_in(
+                hass,
+                RomandeEnergieApiClient(session, scheduler, base_url=base_url),
+                portal,
+                account,
+            )
+            for account in accounts
+        ]
+
+        probe = LoopLagProbe()
+        probe.start()
+        started = time.perf_counter()
+        for _ in range(POLLS):
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+        await probe.stop()
+
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    # The statistics kept up too: a failed write is only ever logged.
+    assert "Failed to write long-term statistics" not in caplog.text
+    # One refresh per entry: the first poll's rotation serves every later one.
+    assert portal.requests["refresh"] == ENTRIES
+    contracts = sum(len(account.contracts) for account in accounts)
+    assert portal.requests["curves"] == contracts * POLLS
+    stats = scheduler.stats()
+    print(
+        f"\n{ENTRIES} entries ({contracts} contracts), {POLLS} polls "
+        f"in {elapsed:.1f} s\n"
+        f"loop lag: p50 {probe.percentile(0.5) * 1e3:.1f} ms, "
+        f"p99 {probe.percentile(0.99) * 1e3:.1f} ms, "
+        f"max {max(probe.lags) * 1e3:.1f} ms\n"
+        f"scheduler wait: max {stats.max_wait:.2f} s, mean {stats.mean_wait:.3f} s\n"
+        f"portal served: {dict(portal.requests)}"
+    )
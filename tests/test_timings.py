@@ -0,0 +1,68 @@
+"""Tests for the per-stage poll timings in ``timings.py``."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.romande_energie.const import STAGE_SAMPLES
+from custom_components.romande_energie.timings import PollTimings
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """A monotonic clock the test moves by hand: ``clock[0]`` is now."""
+    now = [0.0]
+    monkeypatch.setattr(
+        "custom_components.romande_energie.timings.time.monotonic", lambda: now[0]
+    )
+    return now
+
+
+def test_a_poll_files_its_stages(clock: list[float]) -> None:
+    timings = PollTimings()
+    timings.begin()
+    with timings.stage("curves"):
+        clock[0] += 0.4
+    for _ in range(2):  # one parse per contract: the stage adds up
+        with timings.stage("parse"):
+            clock[0] += 0.05
+    timings.count_bytes(2048)
+    timings.count_rows(3)
+    timings.end()
+
+    assert timings.last is not None
+    assert timings.last.stages == pytest.approx(
+        {"curves": 0.4, "parse": 0.1, "total": 0.5}
+    )
+    assert timings.last.payload_bytes == 2048
+    assert timings.last.rows_written == 3
+    assert timings.last_duration("token") is None  # never ran
+
+
+def test_a_failing_stage_is_still_timed(clock: list[float]) -> None:
+    timings = PollTimings()
+    timings.begin()
+    with pytest.raises(RuntimeError), timings.stage("curves"):
+        clock[0] += 2.0
+        raise RuntimeError("portal down")
+    timings.end()
+    assert timings.last_duration("curves") == 2.0
+
+
+def test_nothing_is_timed_outside_a_poll(clock: list[float]) -> None:
+    timings = PollTimings()
+    with timings.stage("statistics"):
+        clock[0] += 1.0
+    timings.count_rows(10)
+    timings.end()
+    assert timings.last is None
+    assert timings.percentile("statistics") is None
+
+
+def test_p95_covers_the_last_polls_only(clock: list[float]) -> None:
+    timings = PollTimings()
+    for seconds in [30.0] * 10 + [1.0] * STAGE_SAMPLES:
+        timings.begin()
+        clock[0] += seconds
+        timings.end()
+    # The slow polls have rolled out of the window.
+    assert timings.percentile("total") == 1.0
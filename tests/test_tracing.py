@@ -0,0 +1,119 @@
+"""Tests for the request phase tracing in ``tracing.py``."""
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.romande_energie.api import (
+    ENDPOINT_CONTRACTS,
+    ENDPOINT_CURVES,
+    CannotConnect,
+    RomandeEnergieApiClient,
+)
+from custom_components.romande_energie.const import TRACE_SAMPLES
+from custom_components.romande_energie.tracing import (
+    EndpointTrace,
+    PhaseHistogram,
+    _on_request_end,
+    request_trace_config,
+)
+
+
+@pytest.fixture
+async def server(socket_enabled: None) -> AsyncGenerator[TestServer]:
+    """A local portal stand-in: the phases need a real connection to time."""
+    async def curves(_request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    app = web.Application()
+    app.router.add_get("/curves", curves)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[RomandeEnergieApiClient]:
+    session = aiohttp.ClientSession(trace_configs=[request_trace_config()])
+    yield RomandeEnergieApiClient(session)
+    await session.close()
+
+
+def test_histogram_summary() -> None:
+    histogram = PhaseHistogram()
+    assert histogram.summary() == {"count": 0}
+    for ms in (5, 20, 20, 80, 3000):
+        histogram.record(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 5
+    assert summary["p50_ms"] == 20.0
+    assert summary["p95_ms"] == summary["max_ms"] == 3000.0
+    assert summary["buckets"]["le_10ms"] == 1
+    assert summary["buckets"]["le_25ms"] == 2
+    assert summary["buckets"]["le_100ms"] == 1
+    assert summary["buckets"]["le_5000ms"] == 1
+    assert summary["buckets"]["gt_10000ms"] == 0
+
+
+def test_histogram_keeps_the_latest_samples() -> None:
+    histogram = PhaseHistogram()
+    for _ in range(TRACE_SAMPLES + 10):
+        histogram.record(0.001)
+    assert len(histogram) == TRACE_SAMPLES
+
+
+async def test_name_resolution_is_taken_out_of_the_connect_phase() -> None:
+    trace = EndpointTrace()
+    ctx = SimpleNamespace(
+        trace_request_ctx=trace,
+        request_start=0.0,
+        connect_start=0.0,
+        dns_start=0.0,
+        dns_end=0.05,
+        connect_end=0.25,
+        headers_sent=0.25,
+    )
+    await _on_request_end(None, ctx, None)
+    assert trace.phases["dns"].summary()["max_ms"] == 50.0
+    assert trace.phases["connect"].summary()["max_ms"] == 200.0
+    assert trace.new_connections == 1
+    assert trace.reused_connections == 0
+
+
+async def test_untagged_requests_are_not_recorded() -> None:
+    await _on_request_end(None, SimpleNamespace(trace_request_ctx=None), None)
+
+
+async def test_requests_are_traced_per_endpoint(client, server) -> None:
+    url = str(server.make_url("/curves"))
+    for _ in range(2):
+        status, _body, _headers = await client._get(
+            url, token="ACCESS_TEST", endpoint=ENDPOINT_CURVES
+        )
+        assert status == 200
+
+    timings = client.request_timings()
+    curves = timings[ENDPOINT_CURVES]
+    # The first request opened the connection, the second reused it.
+    assert curves["new_connections"] == 1
+    assert curves["reused_connections"] == 1
+    assert curves["failures"] == 0
+    assert curves["phases"]["total"]["count"] == 2
+    assert curves["phases"]["ttfb"]["count"] == 2
+    assert curves["phases"]["connect"]["count"] == 1
+    assert timings[ENDPOINT_CONTRACTS]["phases"] == {}
+
+
+async def test_failed_requests_are_counted(client, server) -> None:
+    url = str(server.make_url("/curves"))
+    await server.close()
+    with pytest.raises(CannotConnect):
+        await client._get(url, token="ACCESS_TEST", endpoint=ENDPOINT_CURVES)
+    assert client.traces[ENDPOINT_CURVES].failures == 1
+    assert client.traces[ENDPOINT_CURVES].phases["total"].summary() == {"count": 0}